@@ -1,11 +1,13 @@
 import os
 import json
 import time
-import requests
 import re
 import sys
 from datetime import datetime, timezone
 from dotenv import load_dotenv
+from utils.http_client import get_client
+from utils.endpoints import GEMINI_BASE_URL
+from utils.ai_governor import PRIORITY_BULK, estimate_tokens, get_governor, usage_tokens
 
 load_dotenv()
 
@@ -23,9 +25,11 @@ MODEL_NAME = "gemini-2.5-flash"
 API_KEY = os.getenv("GEMINI_API_KEY")
 
 # --- CRITICAL: RATE LIMIT SETTINGS ---
-REQUEST_INTERVAL = 5   # Increased to 5s for Safety (Max 12 RPM)
+# Pacing comes from the shared AI governor (bulk priority: at most half of AI_RPM_LIMIT,
+# and always behind the engine / news jobs), replacing the fixed 5s REQUEST_INTERVAL
 MAX_RETRIES = 2        # Reduced from 5 (Fail Fast)
-BASE_BACKOFF = 30      # Reduced from 60s
+BASE_BACKOFF = 30      # Bulk-priority cooldown after a 429 (doubles per retry)
+OUTPUT_TOKEN_ESTIMATE = 4000
 
 PERSONA_LABELS = {
     "EN": { "geopolitics": "Geopolitical Strategist", "macro": "Macroeconomic Analyst", "quant": "Quant & Data Scientist", "technical": "Technical Analyst", "policy": "Policy & Regulatory Advisor", "tech": "AI & Future Tech Researcher" },
@@ -281,20 +285,25 @@ OUTPUT FORMAT: Return ONLY a valid JSON object.
 """
 
     def _call_ai(self, prompt):
-        url = f"https://generativelanguage.googleapis.com/v1/models/{MODEL_NAME}:generateContent?key={API_KEY}"
+        url = f"{GEMINI_BASE_URL}/v1/models/{MODEL_NAME}:generateContent?key={API_KEY}"
         payload = {"contents": [{"parts": [{"text": prompt}]}]}
         
         current_backoff = BASE_BACKOFF
         
         for attempt in range(MAX_RETRIES):
             try:
-                resp = requests.post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=60)
+                # Waits for a bulk-priority slot (a 429 cooldown below delays bulk callers on this model only, never the engine)
+                lease = get_governor().acquire("wiki", PRIORITY_BULK, tokens=estimate_tokens(prompt) + OUTPUT_TOKEN_ESTIMATE,
+                                               scope=f"direct:{MODEL_NAME}")
+                resp = get_client().post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=60)
                 
                 if resp.status_code == 200:
-                    return resp.json()['candidates'][0]['content']['parts'][0]['text']
+                    result = resp.json()
+                    lease.settle(usage_tokens(result.get('usageMetadata')))
+                    return result['candidates'][0]['content']['parts'][0]['text']
                 elif resp.status_code == 429:
                     print(f"    [429] Rate limit hit. Backoff {current_backoff}s... (Attempt {attempt+1}/{MAX_RETRIES})")
-                    time.sleep(current_backoff)
+                    get_governor().penalize(current_backoff, "wiki", PRIORITY_BULK, scope=f"direct:{MODEL_NAME}")
                     current_backoff *= 2 # Exponential Backoff
                 elif resp.status_code in [403, 401]:
                     print(f"    [CRITICAL] API Permission Denied ({resp.status_code}). Key may be invalid or leaked.")
@@ -387,9 +396,7 @@ if __name__ == "__main__":
             for item in batch_items:
                 print(f"Processing Item: {item['slug']}...")
                 for lang in LANGS:
-                    generated = enhancer.generate_report(item, lang)
-                    if generated:
-                        time.sleep(REQUEST_INTERVAL)
+                    enhancer.generate_report(item, lang)
             
             # 4. Check Time Limit
             elapsed = time.time() - start_time
@@ -3,7 +3,6 @@ import requests
 import xml.etree.ElementTree as ET
 import json
 import time
-import subprocess
 import re
 from datetime import datetime, timezone
 from dateutil import parser
@@ -24,6 +23,11 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Centralized logging
 from utils.log_utils import create_logger
+from utils.http_client import get_client
+from utils.endpoints import CNBC_RSS_BASE_URL
+from utils.node_bridge import BridgeError, get_bridge
+from utils.ai_governor import PRIORITY_NEWS, BudgetExceeded, estimate_tokens, get_governor
+from utils.cassette import get_cassette
 
 # Initialize centralized logger
 logger = create_logger(
@@ -31,7 +35,12 @@ logger = create_logger(
     sensitive_keys=[],  # News engine doesn't use API keys
     json_format=False
 )
-LOG_FILE = os.path.join(SCRIPT_DIR, "news_debug.log")
+# Outputs are redirected into the cassette sandbox during record/replay
+OUTPUT_DIR = get_cassette().sandboxed(SCRIPT_DIR)
+LOG_FILE = os.path.join(OUTPUT_DIR, "news_debug.log")
+
+# Headlines arrive in English and are translated into every other site language
+TRANSLATION_LANGUAGES = ["JP", "CN", "ES", "HI", "ID", "AR", "DE", "FR"]
 
 def log_diag(msg):
     """Wrapper for centralized logger (backward compatibility)."""
@@ -48,8 +57,9 @@ def log_diag(msg):
 
 def create_failure_flag(reason="Unknown"):
     """Creates a flag file to alert GitHub Actions but allow workflow to continue."""
-    flag_path = os.path.join(os.path.dirname(__file__), "news_failed.flag") # Changed SCRIPT_DIR to os.path.dirname(__file__) and filename
+    flag_path = os.path.join(OUTPUT_DIR, "news_failed.flag")
     try:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
         with open(flag_path, "w") as f:
             f.write(f"FAILURE REASON: {reason}\nTimestamp: {datetime.now(timezone.utc)}")
     except (IOError, OSError) as e: # Specific exception types
@@ -57,10 +67,10 @@ def create_failure_flag(reason="Unknown"):
 
 def fetch_raw_news():
     """Fetches top 6 headlines from CNBC RSS."""
-    FEED_URL = f'https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=100003114&t={int(time.time())}'
+    FEED_URL = f'{CNBC_RSS_BASE_URL}/rs/search/combinedcms/view.xml?partnerId=wrss01&id=100003114&t={int(time.time())}'
     try:
         log_diag(f"Fetching RSS from {FEED_URL}...")
-        res = requests.get(FEED_URL, timeout=15)
+        res = get_client().get(FEED_URL, timeout=15)
         res.raise_for_status()  # Raise HTTPError for bad status codes
         
         root = ET.fromstring(res.text)
@@ -123,70 +133,40 @@ def translate_news_batch(items):
 
     titles = [item['title'] for item in items]
     prompt = f"""You are a professional financial translator.
-Translate these {len(titles)} headlines into JP, CN, ES, HI, ID, AR, DE, FR.
+Translate these {len(titles)} headlines into {', '.join(TRANSLATION_LANGUAGES)}.
 Input: {json.dumps(titles)}
 Output JSON format: {{ "JP": [...], "CN": [...], ... }} only."""
 
     try:
         log_diag("Preparing Node.js Bridge...")
-        
-        # 1. ABSOLUTE PATH CALCULATION
-        # backend/fetch_news.py -> backend/ -> root/ -> frontend/
-        backend_dir = os.path.dirname(os.path.abspath(__file__))
-        root_dir = os.path.dirname(backend_dir)
-        frontend_dir = os.path.join(root_dir, "frontend")
-        script_path = os.path.join(frontend_dir, "scripts", "generate_insight.ts")
-        
-        log_diag(f"Resolving paths:")
-        log_diag(f"  Root: {root_dir}")
-        log_diag(f"  Frontend: {frontend_dir}")
-        log_diag(f"  Script: {script_path}")
-        
-        if not os.path.exists(script_path):
-            log_diag(f"[FATAL] Translation Script NOT FOUND at {script_path}")
-            create_failure_flag("Translation Script Missing")
-            return {} 
 
-        # 2. COMMAND CONSTRUCTION
-        # Linux/Actions: ["npx", "tsx", path] with shell=False
-        # Windows: shell=True required for npx
-        cmd = ["npx", "tsx", script_path]
-        use_shell = (sys.platform == 'win32')
-        
-        log_diag(f"Executing: {cmd} (shell={use_shell}, cwd={frontend_dir})")
-
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            shell=use_shell,
-            cwd=frontend_dir 
-        )
-        
-        stdout, stderr = process.communicate(input=prompt, timeout=120)
-        
-        if process.returncode != 0:
-            log_diag(f"[FATAL] Node process exited with code {process.returncode}")
-            log_diag(f"[STDERR] {stderr[:500]}")
-            log_diag(f"[STDOUT] {stdout[:500]}")
-            create_failure_flag(f"Node Process Failed (Code {process.returncode})")
+        # Shared persistent worker (reused across runs of the same process, e.g. the scheduler)
+        bridge = get_bridge(log_callback=log_diag)
+        if bridge is None:
+            log_diag("[FATAL] npx not found in PATH. Translation bridge unavailable.")
+            create_failure_flag("Translation Bridge Missing")
             return {}
 
-        # 3. RESPONSE PARSING
-        log_diag(f"Node finished. Stdout length: {len(stdout)} chars")
-        
-        # Regex to find JSON envelope from generate_insight.ts
-        match = re.search(r'\{"text":.*\}', stdout, re.DOTALL)
-        if not match:
-            log_diag(f"[FATAL] Invalid Bridge Output (No JSON wrapper). Raw: {stdout[:500]}")
-            create_failure_flag("Invalid Bridge Output")
+        try:
+            # Shared Gemini budget: yields to the engine's report call, ahead of bulk wiki jobs
+            # Reservation: the prompt plus one translated copy of the headlines per target language
+            output_estimate = len(TRANSLATION_LANGUAGES) * estimate_tokens(json.dumps(titles, ensure_ascii=False))
+            lease = get_governor(log_callback=log_diag).acquire(
+                "news:translate", PRIORITY_NEWS, tokens=estimate_tokens(prompt) + output_estimate, timeout=300)
+            # The worker may try several models for one prompt; charge every call it sent
+            bridge_usage = {}
+            try:
+                text = bridge.request(prompt, timeout=120, usage=bridge_usage)
+            finally:
+                lease.settle(bridge_usage.get("tokens"), requests=bridge_usage.get("calls", 1))
+        except (BridgeError, BudgetExceeded) as e:
+            log_diag(f"[FATAL] Bridge worker request failed: {e}")
+            create_failure_flag(f"Node Worker Failed ({e})")
             return {}
 
-        wrapper = json.loads(match.group(0))
-        inner_text = wrapper.get("text", "")
+        # RESPONSE PARSING
+        log_diag(f"Worker finished. Response length: {len(text)} chars")
+        inner_text = text
         
         # Extract inner JSON if wrapped in markdown
         json_match = re.search(r'(\{.*\})', inner_text, re.DOTALL)
@@ -202,7 +182,7 @@ Output JSON format: {{ "JP": [...], "CN": [...], ... }} only."""
         final_json_str = json_match.group(1)
         data = json.loads(final_json_str)
         
-        required = ["JP", "CN", "ES", "HI", "ID", "AR", "DE", "FR"]
+        required = TRANSLATION_LANGUAGES
         if not all(k in data for k in required):
             log_diag(f"[FATAL] Missing languages in translation. Got: {list(data.keys())}")
             create_failure_flag("Missing Languages")
@@ -252,7 +232,8 @@ def main():
         "last_updated": datetime.now(timezone.utc).isoformat()
     }
     
-    signal_path = os.path.join(SCRIPT_DIR, "current_signal.json")
+    signal_path = os.path.join(OUTPUT_DIR, "current_signal.json")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     try:
         # Read existing to preserve other keys
@@ -1,4 +1,3 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import json
@@ -15,11 +14,33 @@ import re
 
 import xml.etree.ElementTree as ET
 import sys
+import threading
 from seo_monitor import SEOMonitor
 from sns_publisher import SNSPublisher
 import fetch_news
 import tech_analysis
 from utils.file_ops import safe_json_merge
+from utils.fetch_orchestrator import FetchOrchestrator, FetchSource, fan_out_partial, hedged_first, race_first
+from utils.fred_cache import FredSeriesCache
+from utils.price_store import PriceStore
+from utils.batch_retry import CircuitBreaker, retry_batched
+from utils.http_client import get_client
+from utils.sector_scoring import SectorScorer
+from utils.percentile_index import PercentileIndex
+from utils.score_series import ScoreSeriesStore
+from utils.anomaly_detector import EwmaAnomalyDetector
+from utils.market_validator import MarketDataValidator
+from utils.cassette import get_cassette
+from utils.node_bridge import BridgeError, get_bridge
+from utils.ai_governor import PRIORITY_ENGINE, BudgetExceeded, estimate_tokens, get_governor, usage_tokens
+from utils.report_cache import LastValidReport, ReportCache, canonical_key, round_sig
+from utils.latency_metrics import LatencyHistogram, RollingMetrics, describe as describe_latency
+from utils.prompt_encoder import encode_market_lines, encode_market_table
+from utils.report_stream import IncrementalReportParser, ReportStreamRejected, iter_sse_text
+from utils.endpoints import (
+    FRED_BASE_URL, FNG_BASE_URL, ALPHA_VANTAGE_BASE_URL, FINNHUB_BASE_URL, FMP_BASE_URL,
+    CNBC_RSS_BASE_URL, GEMINI_BASE_URL, AI_GATEWAY_BASE_URL, worker_env
+)
 
 # Economic Calendar Mapping (New v5.3)
 priority_currencies = ["USD", "EUR", "JPY", "GBP", "AUD", "CAD", "CHF"]
@@ -55,6 +76,16 @@ logger = create_logger(
     json_format=False
 )
 
+# Provider record/replay (GMS_CASSETTE=record|replay) for offline, reproducible runs
+cassette = get_cassette()
+cassette.log_callback = lambda msg: log_diag(msg)
+
+# Shared keep-alive HTTP client (all provider calls reuse its connection pools)
+http_client = get_client()
+http_client.add_timing_hook(
+    lambda info: logger.debug(f"[HTTP] {info['method']} {info['host']}{info['path']} -> {info['status'] or info['error']} in {info['duration_ms']}ms ({info['bytes']}B)")
+)
+
 # CONFIGURATION
 # Institutional-grade constants
 SECTORS = {
@@ -124,6 +155,34 @@ SECTORS = {
     }
 }
 
+# Composite GMS weights (Total: 100%) - Phase 2 Final
+# LEGACY is the VIX / HY spread block; the rest are sector scores (missing sectors count as 50)
+GMS_WEIGHTS = {
+    "LEGACY": 0.25,
+    "STOCKS": 0.25,
+    "CRYPTO": 0.10,
+    "FOREX": 0.10,
+    "GLOBAL_INDICES": 0.15,
+    "COMMODITIES": 0.10,
+    "CREDIT": 0.03,
+    "REAL_ESTATE": 0.02
+}
+
+# Sector weights / invert flags compiled once for vectorized scoring
+sector_scorer = SectorScorer(SECTORS)
+
+# Provider Fetch Orchestration (seconds, measured from start of the fetch stage)
+FETCH_DEADLINE_SEC = float(os.getenv("FETCH_DEADLINE_SEC", "90"))
+FETCH_TIMEOUTS = {
+    "crypto_sentiment": 10,
+    "economic_calendar": 15,
+    "fred": 60,
+    "yf_batch": 75
+}
+
+# Batched retry of tickers missing from the Yahoo batch (exponential backoff: 2s, 4s)
+TICKER_RETRY = {"attempts": 3, "base_delay": 2.0, "backoff": 2.0}
+
 # Legacy Risk Factors for Total Score (Maintained for consistency)
 RISK_FACTORS = {
     "VIX": {"weight": 0.2, "invert": True},
@@ -134,6 +193,33 @@ RISK_FACTORS = {
     "MOMENTUM": {"weight": 0.1, "invert": False}
 }
 
+# Derived Indicators (computed from the already-fetched batch close matrix, no extra network calls)
+# kind: level | ratio | spread | change_spread | relative_strength (see DERIVED_KINDS)
+# trend: ordered (op, threshold, label) rules on the price; first match wins
+DERIVED_INDICATORS = {
+    "MOVE": {
+        "kind": "level", "inputs": ["^MOVE"], "daily_change": True,
+        "trend": [("gt", 140, "STRESS"), ("gt", 120, "ELEVATED")], "default_trend": "NORMAL",
+        "fallback": {"price": 105.2, "change_percent": 1.2, "trend": "MOCK", "sparkline": [100 + x for x in range(30)]}
+    },
+    "BREADTH": {
+        # Sparkline: RSP vs SPY relative strength; Price: 5-day change spread
+        "kind": "relative_strength", "price_kind": "change_spread", "inputs": ["RSP", "SPY"],
+        "trend": [("lt", -1.0, "NARROW"), ("gt", 0.5, "BROAD")], "default_trend": "HEALTHY",
+        "fallback": {"price": 0.5, "change_percent": 0.0, "trend": "HEALTHY", "sparkline": [0] * 30}
+    },
+    "SPY_MOMENTUM": {
+        "kind": "change_spread", "inputs": ["SPY", "RSP"],
+        "trend": [("abs_gt", 1, "SKEWED")], "default_trend": "BALANCED",
+        "fallback": None
+    },
+    "COPPER_GOLD": {
+        "kind": "ratio", "inputs": ["HG=F", "GC=F"], "scale": 1000,  # Scale for visibility
+        "trend": [("gt", 2.0, "RISK-ON")], "default_trend": "RISK-OFF",
+        "fallback": None
+    }
+}
+
 # Fallback to Positive Status messages (Professional Prefix for Frontend Bypass)
 FALLBACK_STATUS = {
     "EN": "【GMS: Analysis Sync】 Current macro indicators suggest the market is approaching a critical inflection point, with volatility compression and expansion alternating ahead of key economic data releases. Fluctuations in currency pairs and US Treasury yields are counteracting liquidity support, potentially creating distortions through capital concentration in specific assets. Investors should monitor key volatility levels and real interest rate trends to prepare for sudden sentiment shifts.",
@@ -149,17 +235,91 @@ FALLBACK_STATUS = {
 
 # Determine script directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_FILE = os.path.join(SCRIPT_DIR, "current_signal.json")
+# Output and cache paths go through cassette.sandboxed(): unchanged normally, redirected into a
+# per-run sandbox under GMS_CASSETTE so record/replay never touches production state
+DATA_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "current_signal.json"))
 ARCHIVE_DIR = os.path.join(SCRIPT_DIR, "archive")
 # Synced Frontend Path for ISR/Static Serving
-FRONTEND_DATA_DIR = os.path.join(SCRIPT_DIR, "../frontend/public/data")
+FRONTEND_DATA_DIR = cassette.sandboxed(os.path.join(SCRIPT_DIR, "../frontend/public/data"))
 FRONTEND_DATA_FILE = os.path.join(FRONTEND_DATA_DIR, "current_signal.json")
 FRONTEND_MARKET_DATA_FILE = os.path.join(FRONTEND_DATA_DIR, "market_data.json")
 FRONTEND_ARCHIVE_DIR = os.path.join(FRONTEND_DATA_DIR, "archive")
 if not os.path.exists(FRONTEND_ARCHIVE_DIR):
     os.makedirs(FRONTEND_ARCHIVE_DIR, exist_ok=True)
-
-LOG_FILE = os.path.join(SCRIPT_DIR, "engine_log.txt")
+if cassette.mode:
+    for sandbox_subdir in ("cache", "logs"):
+        os.makedirs(cassette.sandboxed(os.path.join(SCRIPT_DIR, sandbox_subdir)), exist_ok=True)
+
+LOG_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "engine_log.txt"))
+
+# Incremental FRED series cache (one file per series id)
+FRED_CACHE_DIR = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "fred"))
+FRED_CACHE_TTL_SEC = int(os.getenv("FRED_CACHE_TTL_SEC", "3600"))
+# Weekly series only move once a week; re-query them less often
+FRED_SERIES_TTL = {"WALCL": 6 * 3600, "WTREGEN": 6 * 3600, "NFCI": 6 * 3600}
+
+# Economic calendar cache (changes a few times a day)
+CALENDAR_CACHE_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "economic_calendar.json"))
+CALENDAR_TTL_SEC = int(os.getenv("CALENDAR_TTL_SEC", str(4 * 3600)))
+CALENDAR_MAX_STALE_SEC = int(os.getenv("CALENDAR_MAX_STALE_SEC", str(24 * 3600)))
+CALENDAR_RACE_TIMEOUT_SEC = 12
+
+# Net Liquidity order statistics (seeded from archive/summary.json when missing)
+LIQUIDITY_INDEX_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "net_liquidity_index.json"))
+LIQUIDITY_MIN_SAMPLES = 30
+# Percentile-based Net Liquidity adjustment of the GMS (off: published scores keep the pre-index formula;
+# gms_replay.py mirrors it with --liquidity-adjustment)
+LIQUIDITY_ADJUSTMENT = os.getenv("LIQUIDITY_ADJUSTMENT", "0") == "1"
+
+# Multi-resolution GMS series (raw / hourly / daily / weekly) for trend context
+SCORE_SERIES_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "gms_series.json"))
+
+# Per-indicator EWMA anomaly screening of provider prints
+ANOMALY_STATE_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "indicator_ewma.json"))
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "6"))
+
+# Schema validation report (fetch + publish stages of the latest run)
+DATA_QUALITY_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "logs", "data_quality.json"))
+
+# AI stage budget: one end-to-end deadline, hedged gateway routes inside it
+AI_STAGE_DEADLINE_SEC = int(os.getenv("AI_STAGE_DEADLINE_SEC", "180"))
+AI_HEDGE_AFTER_SEC = float(os.getenv("AI_HEDGE_AFTER_SEC", "15"))
+AI_REQUEST_TIMEOUT_SEC = 30
+# Gateway generation mode: one 9-language batch, or concurrent language groups / single
+# languages where only the languages that failed validation are re-requested
+AI_GENERATION_MODE = os.getenv("AI_GENERATION_MODE", "batch")  # batch | groups | per_language
+AI_LANGUAGE_GROUPS = [["EN", "JP", "CN"], ["ES", "DE", "FR"], ["HI", "ID", "AR"]]
+AI_GROUP_RETRIES = 1
+# Stream gateway responses (streamGenerateContent) and validate each language as it arrives
+AI_STREAMING = os.getenv("AI_STREAMING", "1") != "0"
+AI_MIN_REPORT_CHARS = 100
+# Shared cross-process Gemini budget (see utils/ai_governor.py): expected output size and 429 cooldown
+AI_OUTPUT_TOKEN_ESTIMATE = 6000
+AI_RATE_LIMIT_COOLDOWN_SEC = int(os.getenv("AI_RATE_LIMIT_COOLDOWN_SEC", "30"))
+REPORT_LANGUAGES = ["JP", "EN", "CN", "ES", "HI", "ID", "AR", "DE", "FR"]
+
+# Input-addressed AI report cache (reused while score, trend and key indicators are unchanged)
+REPORT_CACHE_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "report_cache.json"))
+REPORT_CACHE_TTL_SEC = int(os.getenv("REPORT_CACHE_TTL_SEC", "3600"))
+# Bump when the report prompt changes so cached wording is not reused across protocols
+REPORT_PROMPT_VERSION = "v6.2"
+# Market matrix encoding in the report prompt: "compact" table or the "legacy" labelled lines (A/B via metrics)
+AI_PROMPT_FORMAT = os.getenv("AI_PROMPT_FORMAT", "compact")
+REPORT_CACHE_INDICATORS = [
+    "VIX", "HY_SPREAD", "US_10Y_YIELD", "REAL_INTEREST_RATE", "NET_LIQUIDITY", "NFCI", "YIELD_SPREAD",
+    "SPY", "QQQ", "BTC", "GOLD", "OIL", "DXY", "USDJPY", "COPPER_GOLD"
+]
+# Sidecar pointing at the most recent validated report set (replaces the archive scan on fallback)
+LAST_VALID_REPORT_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "last_valid_report.json"))
+
+# AI latency / success metrics persisted across runs (hourly slots) and exported for dashboards
+AI_METRICS_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "ai_metrics.json"))
+AI_METRICS_JSON_EXPORT = cassette.sandboxed(os.getenv("AI_METRICS_JSON_EXPORT", os.path.join(SCRIPT_DIR, "logs", "ai_metrics.json")))
+AI_METRICS_PROM_EXPORT = cassette.sandboxed(os.getenv("AI_METRICS_PROM_EXPORT", os.path.join(SCRIPT_DIR, "logs", "ai_metrics.prom")))
+AI_METRICS_WINDOWS = {"1h": 3600, "24h": 86400, "7d": 7 * 86400}
+
+# Flaky ticker memory for the batched retry stage
+TICKER_BREAKER_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "cache", "ticker_breaker.json"))
 
 def update_archive_index():
     try:
@@ -252,6 +412,69 @@ def detect_anomaly(current_value, previous_value, metric_name, threshold_percent
     
     return False
 
+# Indicator-specific rules; every SECTORS ticker additionally gets a positive-price rule
+MARKET_DATA_SCHEMA = {
+    "US_10Y_YIELD": DATA_RANGES["US_10Y_YIELD"],
+    "REAL_INTEREST_RATE": DATA_RANGES["REAL_RATE"],
+    "BREAKEVEN_INFLATION": DATA_RANGES["BREAKEVEN_INFLATION"],
+    "NFCI": DATA_RANGES["NFCI"],
+    "NET_LIQUIDITY": DATA_RANGES["NET_LIQUIDITY"],
+    "YIELD_SPREAD": {"min": -5, "max": 5, "typical": (-1.5, 3)},
+    "YIELD_SPREAD_10Y2Y": {"min": -5, "max": 5, "typical": (-1.5, 3)},
+    "HY_SPREAD": {"min": 0, "max": 30, "typical": (2, 10)},
+    "CRYPTO_SENTIMENT": {"min": 0, "max": 100},
+    "VIX": {"min": 5, "max": 150, "typical": (9, 60)},
+    "TNX": {"min": 0, "max": 20, "typical": (2, 6)},
+    "MOVE": {"min": 20, "max": 300, "typical": (50, 200)},
+    "BREADTH": {"min": -50, "max": 50},
+    "SPY_MOMENTUM": {"min": -50, "max": 50},
+    "COPPER_GOLD": {"min": 0.01, "max": 20},
+}
+CRYPTO_KEYS = {"BTC", "ETH", "SOL"}
+
+def build_market_schema(sectors=None):
+    """Merges the explicit indicator rules with a generic rule for every sector ticker.
+
+    Ticker prices must be positive and their last valid bar recent; the age limit
+    leaves room for long exchange holidays (e.g. Golden Week), crypto trades daily.
+    """
+    schema = {}
+    for config in (sectors or SECTORS).values():
+        for key in config["tickers"]:
+            schema[key] = {"min": 1e-9, "max_age_days": 3 if key in CRYPTO_KEYS else 10}
+    for key, rule in MARKET_DATA_SCHEMA.items():
+        schema[key] = dict(schema.get(key, {}), **rule)
+    return schema
+
+market_validator = MarketDataValidator(build_market_schema(), log_callback=log_diag)
+
+def validate_market_data(market_data, previous_market_data=None, stage="fetch"):
+    """Runs the compiled schema over market_data, substituting invalid keys from the last publish."""
+    return market_validator.validate(market_data, previous_market_data, stage=stage)
+
+def save_data_quality_report(reports):
+    try:
+        os.makedirs(os.path.dirname(DATA_QUALITY_FILE), exist_ok=True)
+        with open(DATA_QUALITY_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"timestamp": datetime.now(timezone.utc).isoformat(), "stages": reports}, f, indent=2)
+    except (IOError, OSError) as e:
+        log_diag(f"[VALIDATE] [WARN] Failed to save data quality report: {e}")
+
+def screen_market_data(market_data, previous_market_data=None):
+    """Flags EWMA z-score outliers across every indicator and holds them at the last published value."""
+    detector = EwmaAnomalyDetector(ANOMALY_STATE_FILE, z_threshold=ANOMALY_Z_THRESHOLD, log_callback=log_diag)
+    flagged = detector.observe({k: v.get("price") for k, v in market_data.items() if isinstance(v, dict)})
+    detector.save()
+
+    for key, info in flagged.items():
+        prev = (previous_market_data or {}).get(key)
+        held = isinstance(prev, dict) and "price" in prev
+        log_diag(f"[DATA_ANOMALY] [WARN] {key}: {info['value']:g} is {info['z']:+.1f} sigma from EWMA {info['mean']:g}"
+                 f" -> {'holding last published value' if held else 'no previous value, keeping print'}")
+        if held:
+            market_data[key] = prev
+    return flagged
+
 # ============================================
 # AI METRICS COLLECTION
 # ============================================
@@ -259,45 +482,60 @@ def detect_anomaly(current_value, previous_value, metric_name, threshold_percent
 class AIMetrics:
     """Track AI generation success rates and performance across fallback layers."""
     def __init__(self):
-        self.attempts = {}
-        self.successes = {}
-        self.latencies = {}
+        self.methods = {}
+        self.lock = threading.Lock()
     
-    def record(self, method, success, latency_ms):
-        """Record an attempt with its outcome and latency."""
-        if method not in self.attempts:
-            self.attempts[method] = 0
-            self.successes[method] = 0
-            self.latencies[method] = []
-        
-        self.attempts[method] += 1
-        if success:
-            self.successes[method] += 1
-        self.latencies[method].append(latency_ms)
+    def record(self, method, success, latency_ms, prompt_chars=None, prompt_tokens=None):
+        """Record an attempt with its outcome and latency (fixed-size histogram per method) and optional prompt size."""
+        with self.lock:
+            stats = self.methods.setdefault(method, {"attempts": 0, "successes": 0, "latency": LatencyHistogram(),
+                                                     "prompt_samples": 0, "prompt_chars": 0, "prompt_tokens": 0})
+            stats["attempts"] += 1
+            if success:
+                stats["successes"] += 1
+            stats["latency"].observe(latency_ms)
+            if prompt_chars:
+                stats["prompt_samples"] += 1
+                stats["prompt_chars"] += prompt_chars
+                stats["prompt_tokens"] += prompt_tokens or 0
     
     def get_summary(self):
         """Get formatted summary of all metrics."""
         summary = {}
-        for method in self.attempts.keys():
-            total = self.attempts[method]
-            success = self.successes[method]
-            latencies = self.latencies[method]
-            
-            summary[method] = {
-                "attempts": total,
-                "success_rate": f"{(success / total * 100):.1f}%" if total > 0 else "0%",
-                "avg_latency_ms": f"{(sum(latencies) / len(latencies)):.0f}" if latencies else "0"
-            }
+        with self.lock:
+            for method, stats in self.methods.items():
+                described = describe_latency(stats)
+                summary[method] = {
+                    "attempts": described["attempts"],
+                    "success_rate": f"{described['success_rate'] * 100:.1f}%",
+                    "avg_latency_ms": f"{described['avg_ms'] or 0:.0f}",
+                    "p95_latency_ms": f"{described['p95_ms'] or 0:.0f}"
+                }
+                if described["avg_prompt_tokens"] is not None:
+                    summary[method]["avg_prompt_tokens"] = f"{described['avg_prompt_tokens']:.0f}"
         return summary
 
+    def save(self):
+        """Merges the samples recorded since the last save into the persisted rolling metrics and refreshes
+        the JSON / Prometheus exports. The counters are reset, so long-lived processes never merge a sample twice."""
+        with self.lock:
+            if not self.methods:
+                return
+            store = RollingMetrics(AI_METRICS_FILE, retention_seconds=max(AI_METRICS_WINDOWS.values()), log_callback=log_diag)
+            store.merge_run(self.methods)
+            self.methods = {}
+        store.save()
+        store.export_json(AI_METRICS_JSON_EXPORT, AI_METRICS_WINDOWS)
+        store.export_prometheus(AI_METRICS_PROM_EXPORT, AI_METRICS_WINDOWS)
+
 # Global metrics instance
 ai_metrics = AIMetrics()
 
 # ============================================
 # API KEY VALIDATION
 # ============================================
-DATA_FILE = os.path.join(SCRIPT_DIR, "current_signal.json")
-HISTORY_FILE = os.path.join(SCRIPT_DIR, "history.json")
+DATA_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "current_signal.json"))
+HISTORY_FILE = cassette.sandboxed(os.path.join(SCRIPT_DIR, "history.json"))
 ARCHIVE_DIR = os.path.join(SCRIPT_DIR, "archive")
 
 # ... (Existing Directory Checks)
@@ -360,15 +598,20 @@ def fetch_net_liquidity(fred):
         print(f"Net Liquidity Error: {e}")
         return {"price": 0, "change_percent": 0, "trend": "ERROR", "sparkline": []}
 
-def fetch_fred_data():
-    """Fetches official economic data."""
-    # ... (Existing FRED logic preserved)
+def fred_fallback_data():
+    """Baseline FRED values used when the provider is unavailable."""
     data = {}
     data['YIELD_SPREAD'] = 0.05
     data['HY_SPREAD'] = 3.5
     data['NFCI'] = -0.5
     data['NET_LIQUIDITY'] = {"price": 6200, "change_percent": 0, "trend": "NEUTRAL", "sparkline": [6200] * 30}
     data['BREAKEVEN_INFLATION'] = {"price": 2.30, "change_percent": 0, "trend": "STABLE", "sparkline": [2.30] * 30}
+    return data
+
+def fetch_fred_data():
+    """Fetches official economic data."""
+    # ... (Existing FRED logic preserved)
+    data = fred_fallback_data()
     
     # Try to load previous data for fallbacks
     previous_data = {}
@@ -396,9 +639,18 @@ def fetch_fred_data():
     # Fetch Historical Data (Last 90 days to ensure clean data for weekly series)
     start_date = (datetime.now(timezone.utc) - timedelta(days=90)).strftime('%Y-%m-%d')
     
-    if not FRED_KEY: return data
-
-    fred = Fred(api_key=FRED_KEY)
+    if not FRED_KEY and not cassette.replaying: return data
+
+    fred_client = Fred(api_key=FRED_KEY or "replay")
+    fred_client.root_url = FRED_BASE_URL
+    fred_client.get_series = cassette.wrap_call("fred", fred_client.get_series)
+    fred = FredSeriesCache(
+        fred_client,
+        FRED_CACHE_DIR,
+        refresh_seconds=FRED_CACHE_TTL_SEC,
+        series_refresh=FRED_SERIES_TTL,
+        log_callback=log_diag
+    )
     try:
         # 1-A. VIX Index (VIXCLS)
         try:
@@ -626,18 +878,19 @@ def fetch_fred_data():
                  log_diag("[FRED] Critical failure: No previous data found for Net Liquidity. Using 6200B baseline.")
                  data['NET_LIQUIDITY'] = {"price": 6200, "change_percent": 0, "trend": "NEUTRAL", "sparkline": [6200] * 30}
         
+        log_diag(f"[FRED_CACHE] Run stats: {json.dumps(fred.stats)}")
         return data
     except Exception: return data
 
 def fetch_crypto_sentiment():
     """FETCH CRYPTO FEAR & GREED INDEX (Free API)"""
     try:
-        url = "https://api.alternative.me/fng/?limit=30"
+        url = f"{FNG_BASE_URL}/fng/?limit=30"
         
         log_diag("[IN] API_CALL: { provider: 'Fear&Greed', endpoint: '/fng', timeout: 5s }")
         
         start_time = time.time()
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url, timeout=5)
         duration_ms = int((time.time() - start_time) * 1000)
         
         log_diag(f"[OUT] API_RESPONSE: {{ provider: 'Fear&Greed', status: {response.status_code}, duration: {duration_ms}ms }}")
@@ -693,110 +946,331 @@ def fetch_crypto_sentiment():
 
 
 
-def fetch_economic_calendar():
-    """Fetches calendar from multiple providers with fallback."""
+def _calendar_alpha_vantage():
+    """Alpha Vantage (Direct CSV) - Highest Reliability for 2026."""
     events = []
-    
-    # 1. Try Alpha Vantage (Direct CSV) - Highest Reliability for 2026
-    if ALPHA_VANTAGE_KEY:
-        try:
-            log_diag("[ALPHA_VANTAGE] Fetching calendar...")
-            url = f"https://www.alphavantage.co/query?function=ECONOMIC_CALENDAR&apikey={ALPHA_VANTAGE_KEY}"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                import csv
-                from io import StringIO
-                f = StringIO(response.text)
-                reader = csv.DictReader(f)
-                for row in reader:
-                    currency = row.get("currency", "")
-                    event_name = row.get("event", "")
-                    name_lower = event_name.lower()
+    if not ALPHA_VANTAGE_KEY: return events
+    try:
+        log_diag("[ALPHA_VANTAGE] Fetching calendar...")
+        url = f"{ALPHA_VANTAGE_BASE_URL}/query?function=ECONOMIC_CALENDAR&apikey={ALPHA_VANTAGE_KEY}"
+        response = http_client.get(url, timeout=10)
+        if response.status_code == 200:
+            import csv
+            from io import StringIO
+            f = StringIO(response.text)
+            reader = csv.DictReader(f)
+            for row in reader:
+                currency = row.get("currency", "")
+                event_name = row.get("event", "")
+                name_lower = event_name.lower()
+                
+                if currency in priority_currencies:
+                    code = "generic"
+                    for cat, keywords in keyword_map.items():
+                        if any(kw in name_lower for kw in keywords):
+                            code = cat
+                            break
                     
-                    if currency in priority_currencies:
-                        code = "generic"
-                        for cat, keywords in keyword_map.items():
-                            if any(kw in name_lower for kw in keywords):
-                                code = cat
-                                break
-                        
-                        try:
-                            date_str = row.get("date", "")[:10]
-                            events.append({
-                                "code": code,
-                                "name": f"{currency} {event_name}",
-                                "date": date_str,
-                                "day": "",
-                                "time": row.get("date", "")[11:16],
-                                "impact": "high" if code != "generic" else "medium"
-                            })
-                        except: continue
-                if events: 
-                    log_diag(f"[AI SUCCESS] Fetched {len(events)} events via Alpha Vantage.")
-                    return events
-        except Exception as e:
-            log_diag(f"[ALPHA_VANTAGE] Error: {e}")
+                    try:
+                        date_str = row.get("date", "")[:10]
+                        events.append({
+                            "code": code,
+                            "name": f"{currency} {event_name}",
+                            "date": date_str,
+                            "day": "",
+                            "time": row.get("date", "")[11:16],
+                            "impact": "high" if code != "generic" else "medium"
+                        })
+                    except: continue
+            if events: 
+                log_diag(f"[AI SUCCESS] Fetched {len(events)} events via Alpha Vantage.")
+    except Exception as e:
+        log_diag(f"[ALPHA_VANTAGE] Error: {e}")
+    return events
 
-    # 2. Try Finnhub
-    if FINNHUB_KEY:
-        try:
-            log_diag("[FINNHUB] Fetching calendar...")
-            now = datetime.now().strftime("%Y-%m-%d")
-            future = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-            url = f"https://finnhub.io/api/v1/calendar/economic?from={now}&to={future}&token={FINNHUB_KEY}"
-            r = requests.get(url, timeout=10)
-            if r.status_code == 200:
-                data = r.json().get("economicCalendar", [])
-                if data:
-                    events = []
-                    for item in data[:10]:
+def _calendar_finnhub():
+    """Finnhub economic calendar (next 30 days)."""
+    events = []
+    if not FINNHUB_KEY: return events
+    try:
+        log_diag("[FINNHUB] Fetching calendar...")
+        now = datetime.now().strftime("%Y-%m-%d")
+        future = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+        url = f"{FINNHUB_BASE_URL}/api/v1/calendar/economic?from={now}&to={future}&token={FINNHUB_KEY}"
+        r = http_client.get(url, timeout=10)
+        if r.status_code == 200:
+            data = r.json().get("economicCalendar", [])
+            for item in data[:10]:
+                events.append({
+                    "code": "generic",
+                    "name": f"{item.get('country')} {item.get('event')}",
+                    "date": item.get("time")[:10],
+                    "day": "",
+                    "time": item.get("time")[11:16],
+                    "impact": item.get("impact", "medium")
+                })
+    except Exception as e:
+        log_diag(f"[FINNHUB] Error: {e}")
+    return events
+
+def _calendar_fmp():
+    """FMP (Legacy) economic calendar (next 14 days)."""
+    events = []
+    if not FMP_KEY: return events
+    try:
+        log_diag("[FMP] Fetching calendar via legacy...")
+        start = datetime.now().strftime("%Y-%m-%d")
+        end = (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d")
+        url = f"{FMP_BASE_URL}/api/v3/economic_calendar?from={start}&to={end}&apikey={FMP_KEY}"
+        
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept": "application/json"
+        }
+        r = http_client.get(url, headers=headers, timeout=10)
+        if r.status_code == 200:
+            data = r.json()
+            if isinstance(data, list):
+                for item in data[:10]:
+                    cur = item.get("currency", "USD")
+                    if cur in priority_currencies:
                         events.append({
                             "code": "generic",
-                            "name": f"{item.get('country')} {item.get('event')}",
-                            "date": item.get("time")[:10],
+                            "name": f"{cur} {item.get('event')}",
+                            "date": item.get("date")[:10],
                             "day": "",
-                            "time": item.get("time")[11:16],
-                            "impact": item.get("impact", "medium")
+                            "time": item.get("date")[11:16],
+                            "impact": item.get("impact", "medium").lower()
                         })
-                    return events
-        except Exception as e:
-            log_diag(f"[FINNHUB] Error: {e}")
+    except Exception as e:
+        log_diag(f"[FMP] Error: {e}")
+    return events
+
+CALENDAR_PROVIDERS = {
+    "alpha_vantage": _calendar_alpha_vantage,
+    "finnhub": _calendar_finnhub,
+    "fmp": _calendar_fmp
+}
+
+_calendar_refresh_lock = threading.Lock()
 
-    # 3. Try FMP (Legacy)
-    if FMP_KEY:
+def _load_calendar_cache():
+    try:
+        if os.path.exists(CALENDAR_CACHE_FILE):
+            with open(CALENDAR_CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except (json.JSONDecodeError, IOError, OSError) as e:
+        log_diag(f"[CALENDAR_CACHE] [WARN] Ignoring unreadable cache: {e}")
+    return None
+
+def refresh_economic_calendar():
+    """Races all calendar providers; the first valid non-empty answer is cached and returned."""
+    provider, events = race_first(
+        {name: func for name, func in CALENDAR_PROVIDERS.items()},
+        timeout=CALENDAR_RACE_TIMEOUT_SEC,
+        accept=lambda ev: isinstance(ev, list) and len(ev) > 0,
+        log_callback=log_diag
+    )
+    if not events:
+        return []
+    try:
+        os.makedirs(os.path.dirname(CALENDAR_CACHE_FILE), exist_ok=True)
+        temp_path = CALENDAR_CACHE_FILE + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fetched_at": time.time(), "provider": provider, "events": events}, f, ensure_ascii=False)
+        os.replace(temp_path, CALENDAR_CACHE_FILE)
+    except (IOError, OSError) as e:
+        log_diag(f"[CALENDAR_CACHE] [WARN] Failed to save cache: {e}")
+    return events
+
+def _background_calendar_refresh():
+    if not _calendar_refresh_lock.acquire(blocking=False):
+        return  # A refresh is already in flight
+    def run():
         try:
-            log_diag("[FMP] Fetching calendar via legacy...")
-            start = datetime.now().strftime("%Y-%m-%d")
-            end = (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d")
-            url = f"https://financialmodelingprep.com/api/v3/economic_calendar?from={start}&to={end}&apikey={FMP_KEY}"
-            
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Accept": "application/json"
-            }
-            r = requests.get(url, headers=headers, timeout=10)
-            if r.status_code == 200:
-                data = r.json()
-                if isinstance(data, list):
-                    events = []
-                    for item in data[:10]:
-                        cur = item.get("currency", "USD")
-                        if cur in priority_currencies:
-                            events.append({
-                                "code": "generic",
-                                "name": f"{cur} {item.get('event')}",
-                                "date": item.get("date")[:10],
-                                "day": "",
-                                "time": item.get("date")[11:16],
-                                "impact": item.get("impact", "medium").lower()
-                            })
-                    if events: return events
-        except Exception as e:
-            log_diag(f"[FMP] Error: {e}")
+            refresh_economic_calendar()
+        finally:
+            _calendar_refresh_lock.release()
+    threading.Thread(target=run, name="calendar-refresh").start()
+
+def fetch_economic_calendar():
+    """Fetches calendar from multiple providers with fallback.
 
-    return []
+    Served from a persisted TTL cache. Past the TTL the stale events are returned
+    immediately while a background refresh races the providers; past the max
+    staleness (or with no cache) the race runs inline.
+    """
+    cache = _load_calendar_cache()
+    if cache and cache.get("events"):
+        age = time.time() - cache.get("fetched_at", 0)
+        if age < CALENDAR_TTL_SEC:
+            log_diag(f"[CALENDAR_CACHE] HIT ({cache.get('provider')}, age {int(age)}s)")
+            return cache["events"]
+        if age < CALENDAR_MAX_STALE_SEC:
+            log_diag(f"[CALENDAR_CACHE] STALE (age {int(age)}s). Serving cache, refreshing in background.")
+            _background_calendar_refresh()
+            return cache["events"]
+
+    return refresh_economic_calendar()
+
+def build_close_matrix(batch_hist):
+    """Extracts a wide close-price matrix (one column per symbol) from a batch frame."""
+    if batch_hist is None or not isinstance(batch_hist.columns, pd.MultiIndex):
+        return pd.DataFrame()
+    closes = batch_hist.xs('Close', axis=1, level=1)
+    return closes.loc[:, ~closes.columns.duplicated()]
+
+def fetch_closes_batch(symbols):
+    """Single batched close fetch used by the retry stage. Returns {symbol: Series}."""
+    frame = PriceStore(log_callback=log_diag).closes(symbols, period="3mo")
+    recovered = {}
+    for sym in frame.columns:
+        series = frame[sym].dropna()
+        if not series.empty:
+            recovered[sym] = series
+    return recovered
+
+def recover_missing_closes(closes, symbols, budget=None, batch_timed_out=False):
+    """Re-requests every symbol missing from the batch in one batched call (with backoff).
+
+    A persistent circuit breaker skips symbols that keep failing across runs. The retry
+    only uses what is left of the fetch stage budget (seconds), and is skipped when the
+    budget is spent or the original batch download timed out (its thread still runs).
+    """
+    missing = [sym for sym in symbols if sym not in closes.columns or closes[sym].dropna().empty]
+    breaker = CircuitBreaker(TICKER_BREAKER_FILE, log_callback=log_diag)
+    for sym in symbols:
+        if sym not in missing:
+            breaker.record_success(sym)
+
+    if missing and batch_timed_out:
+        log_diag(f"[WARN] {len(missing)} tickers missing after the batch timed out. Skipping retry (download still in flight).")
+    elif missing and budget is not None and budget <= 0:
+        log_diag(f"[WARN] {len(missing)} tickers missing and the fetch budget is spent. Skipping retry.")
+    elif missing:
+        log_diag(f"[WARN] {len(missing)} tickers missing from batch: {', '.join(missing)}. Retrying as one batch...")
+        recovered = retry_batched(
+            fetch_closes_batch, missing,
+            attempts=TICKER_RETRY["attempts"],
+            base_delay=TICKER_RETRY["base_delay"],
+            backoff=TICKER_RETRY["backoff"],
+            breaker=breaker,
+            log_callback=log_diag,
+            deadline=budget
+        )
+        if recovered:
+            closes = pd.concat([closes.drop(columns=list(recovered), errors='ignore'), pd.DataFrame(recovered)], axis=1)
+
+    breaker.save()
+    return closes
+
+def compute_ticker_metrics(closes, spark_len=22):
+    """Vectorized price/change/trend/sparkline pass over every column of a close matrix.
+
+    NaNs are pushed to the top of each column (stable sort on the validity mask) so
+    the last k rows hold each symbol's last k valid closes, regardless of calendar gaps.
+    Returns a DataFrame indexed by symbol; symbols without any close are omitted.
+    """
+    if closes is None or closes.empty:
+        return pd.DataFrame(columns=["price", "prev_price", "daily_chg", "change_percent", "trend", "sparkline", "as_of"])
+
+    arr = closes.to_numpy(dtype="float64")
+    valid = ~np.isnan(arr)
+    counts = valid.sum(axis=0)
+    packed = np.take_along_axis(arr, np.argsort(valid, axis=0, kind="stable"), axis=0)
+    n_rows = packed.shape[0]
+    cols = np.arange(packed.shape[1])
+
+    current = packed[-1]
+    prev_1 = np.where(counts >= 2, packed[max(n_rows - 2, 0)], current)
+    # First valid close when fewer than 5 observations exist
+    first_idx = np.clip(n_rows - counts, 0, n_rows - 1)
+    prev_5 = np.where(counts >= 5, packed[max(n_rows - 5, 0)], packed[first_idx, cols])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily_chg = np.where(prev_1 != 0, (current - prev_1) / prev_1 * 100, 0.0)
+        change_5d = np.where(prev_5 != 0, (current - prev_5) / prev_5 * 100, 0.0)
+
+    tail = np.round(packed[-spark_len:], 2).T
+    # Date of each symbol's last valid close (staleness input for schema validation)
+    last_pos = n_rows - 1 - np.argmax(valid[::-1], axis=0)
+    as_of = pd.DatetimeIndex(closes.index[last_pos]).strftime("%Y-%m-%d")
+    metrics = pd.DataFrame({
+        "price": np.round(current, 2),
+        "prev_price": np.round(prev_1, 2),
+        "daily_chg": np.round(daily_chg, 2),
+        "change_percent": np.round(change_5d, 2),
+        "trend": np.where(daily_chg > 0, "UP", "DOWN"),
+        "sparkline": [row[~np.isnan(row)].tolist() for row in tail],
+        "as_of": as_of
+    }, index=closes.columns)
+    return metrics[counts > 0]
+
+DERIVED_KINDS = {
+    "level": lambda a, b, spec: a,
+    "ratio": lambda a, b, spec: (a / b) * spec.get("scale", 1),
+    "spread": lambda a, b, spec: a - b,
+    # 5-session % change spread (matches change_percent of the inputs)
+    "change_spread": lambda a, b, spec: (a.pct_change(4) - b.pct_change(4)) * 100,
+    # Normalized performance gap over the window
+    "relative_strength": lambda a, b, spec: ((a / a.iloc[0]) - (b / b.iloc[0])) * 100
+}
 
+def _derived_trend(value, spec):
+    for op, threshold, label in spec.get("trend", []):
+        if (op == "gt" and value > threshold) or (op == "lt" and value < threshold) or (op == "abs_gt" and abs(value) > threshold):
+            return label
+    return spec.get("default_trend", "NEUTRAL")
 
+def compute_derived_indicators(closes, specs=None, spark_len=22):
+    """Computes ratio/spread/relative-strength indicators as vectorized series.
+
+    Every input is taken from the batch close matrix; indicators whose inputs are
+    missing degrade to their declared fallback (or are omitted if it is None).
+    """
+    specs = specs or DERIVED_INDICATORS
+    results = {}
+    for key, spec in specs.items():
+        inputs = spec["inputs"]
+        try:
+            if closes is None or any(sym not in closes.columns for sym in inputs):
+                raise KeyError(f"missing inputs {inputs}")
+            aligned = closes[inputs].dropna()
+            if aligned.empty:
+                raise ValueError("no overlapping closes")
+            a = aligned[inputs[0]]
+            b = aligned[inputs[1]] if len(inputs) > 1 else None
+
+            window = aligned.tail(spark_len)
+            wa = window[inputs[0]]
+            wb = window[inputs[1]] if len(inputs) > 1 else None
+            if spec["kind"] == "relative_strength":
+                series = DERIVED_KINDS[spec["kind"]](wa, wb, spec)
+            else:
+                series = DERIVED_KINDS[spec["kind"]](a, b, spec).tail(spark_len)
+            series = series.replace([np.inf, -np.inf], np.nan).dropna()
+
+            price_kind = spec.get("price_kind")
+            price_series = DERIVED_KINDS[price_kind](a, b, spec).dropna() if price_kind else series
+            if series.empty or price_series.empty:
+                raise ValueError("derived series empty")
+            price = float(price_series.iloc[-1])
+
+            change = 0.0
+            if spec.get("daily_change") and len(series) >= 2 and series.iloc[-2] != 0:
+                change = (series.iloc[-1] - series.iloc[-2]) / series.iloc[-2] * 100
+
+            results[key] = {
+                "price": round(price, 2),
+                "change_percent": round(float(change), 2),
+                "trend": _derived_trend(price, spec),
+                "sparkline": [round(x, 2) for x in series.tolist()]
+            }
+        except Exception as e:
+            log_diag(f"[DERIVED] {key} unavailable ({e}). Using fallback.")
+            if spec.get("fallback") is not None:
+                results[key] = dict(spec["fallback"])
+    return results
 
 def fetch_market_data():
     """Fetches multi-asset data from Yahoo Finance."""
@@ -804,9 +1278,29 @@ def fetch_market_data():
     failed_indicators = []
     
     all_data = {}
+
+    # Ticker universe for the Yahoo batch (fetched concurrently with the other providers)
+    all_tickers = []
+    for sector_name, config in SECTORS.items():
+        all_tickers.extend(config["tickers"].values())
+    
+    # Also include MOVE and any other YF tickers
+    all_tickers.extend(["^MOVE", "SPY", "RSP"]) # Ensure these are included
+    all_tickers = list(set(all_tickers))
+    log_diag(f"[IN] YF_QUERY: {{ count: {len(all_tickers)}, tickers: {all_tickers[:5]}... }}")
+
+    # Run independent providers concurrently; slow ones degrade to their fallbacks
+    orchestrator = FetchOrchestrator(deadline=FETCH_DEADLINE_SEC, log_callback=log_diag)
+    fetch_started = time.time()
+    fetched = orchestrator.run([
+        FetchSource("crypto_sentiment", fetch_crypto_sentiment, FETCH_TIMEOUTS["crypto_sentiment"], fallback=None),
+        FetchSource("economic_calendar", fetch_economic_calendar, FETCH_TIMEOUTS["economic_calendar"], fallback=[]),
+        FetchSource("fred", fetch_fred_data, FETCH_TIMEOUTS["fred"], fallback=fred_fallback_data),
+        FetchSource("yf_batch", lambda: PriceStore(log_callback=log_diag).download(all_tickers, period="3mo"), FETCH_TIMEOUTS["yf_batch"], fallback=None),
+    ])
     
     # 0. CRYPTO SENTIMENT (New)
-    crypto_fg = fetch_crypto_sentiment()
+    crypto_fg = fetched["crypto_sentiment"]
     if crypto_fg:
         all_data["CRYPTO_SENTIMENT"] = crypto_fg
     else:
@@ -815,11 +1309,9 @@ def fetch_market_data():
         all_data["CRYPTO_SENTIMENT"] = {"price": 50, "change_percent": 0.0, "trend": "NEUTRAL", "sparkline": [50]*30}
     
     # 0.5 ECONOMIC CALENDAR (Real)
-    real_events = fetch_economic_calendar()
+    real_events = fetched["economic_calendar"] or []
 
-    # Flatten all tickers for batch fetching (optional, but keeping loop for simplicity)
-    # all_data = {} # Removed duplicate
-    fred_data = fetch_fred_data()
+    fred_data = fetched["fred"]
     status = "OPERATIONAL"
     
     # ... (Rest of fetch logic) ...
@@ -856,53 +1348,34 @@ def fetch_market_data():
         if 'BREAKEVEN_INFLATION' in fred_data:
              all_data['BREAKEVEN_INFLATION'] = fred_data['BREAKEVEN_INFLATION']
 
-    # 2. Fetch All Sectors using Batch for Speed
-    all_tickers = []
-    for sector_name, config in SECTORS.items():
-        all_tickers.extend(config["tickers"].values())
-    
-    # Also include MOVE and any other YF tickers
-    all_tickers.extend(["^MOVE", "SPY", "RSP"]) # Ensure these are included
-    all_tickers = list(set(all_tickers))
-    log_diag(f"[IN] YF_QUERY: {{ count: {len(all_tickers)}, tickers: {all_tickers[:5]}... }}")
+    # 2. All Sectors from the concurrent Batch download
+    batch_hist = fetched["yf_batch"]
 
-    try:
-        batch_hist = yf.download(all_tickers, period="3mo", group_by='ticker', silent=True)
-    except:
-        batch_hist = None
+    # One vectorized pass over every unique symbol (HYG / ^NSEI appear in two sectors)
+    sector_symbols = list(dict.fromkeys(sym for config in SECTORS.values() for sym in config["tickers"].values()))
+    closes = recover_missing_closes(
+        build_close_matrix(batch_hist), all_tickers,
+        budget=FETCH_DEADLINE_SEC - (time.time() - fetch_started),
+        batch_timed_out=orchestrator.report.get("yf_batch", {}).get("status") == "timeout"
+    )
+    ticker_metrics = compute_ticker_metrics(closes.reindex(columns=[c for c in sector_symbols if c in closes.columns]))
 
     for sector_name, config in SECTORS.items():
         for key, symbol in config["tickers"].items():
             try:
-                hist = batch_hist[symbol] if batch_hist is not None else yf.Ticker(symbol).history(period="3mo")
-                if not hist.empty:
-                    # Clear out potential MultiIndex issues
-                    if isinstance(hist.columns, pd.MultiIndex):
-                        hist = hist.droplevel(0, axis=1) if 'Close' in hist.columns.levels[0] else hist # redundant check
-                    
-                    hist_close = hist['Close'].dropna()
-                    if not hist_close.empty:
-                        hist_1mo = hist_close.tail(22)
-                        current = hist_close.iloc[-1]
-                        
-                        # Calculate changes for AI v5.2
-                        prev_1_day = hist_close.iloc[-2] if len(hist_close) >= 2 else current
-                        daily_chg = ((current - prev_1_day) / prev_1_day) * 100 if prev_1_day != 0 else 0
-                        
-                        prev_5_day = hist_close.iloc[-5] if len(hist_close) >= 5 else hist_close.iloc[0]
-                        change_5d = ((current - prev_5_day) / prev_5_day) * 100 if prev_5_day != 0 else 0
-                        
-                        all_data[key] = {
-                            "price": round(current, 2),
-                            "prev_price": round(prev_1_day, 2),
-                            "daily_chg": round(daily_chg, 2),
-                            "change_percent": round(change_5d, 2),
-                            "trend": "UP" if daily_chg > 0 else "DOWN",
-                            "sparkline": [round(x, 2) for x in hist_1mo.tolist()]
-                        }
-                        log_diag(f"[IN] YF_RAW: {{ ticker: {key}, price: {round(current, 2)}, chg: {round(daily_chg, 2)}% }}")
-                    else: raise Exception("No close data")
-                else: raise Exception("Empty Data")
+                if symbol not in ticker_metrics.index:
+                    raise Exception("No close data")
+                row = ticker_metrics.loc[symbol]
+                all_data[key] = {
+                    "price": float(row["price"]),
+                    "prev_price": float(row["prev_price"]),
+                    "daily_chg": float(row["daily_chg"]),
+                    "change_percent": float(row["change_percent"]),
+                    "trend": str(row["trend"]),
+                    "sparkline": list(row["sparkline"]),
+                    "as_of": str(row["as_of"])
+                }
+                log_diag(f"[IN] YF_RAW: {{ ticker: {key}, price: {all_data[key]['price']}, chg: {all_data[key]['daily_chg']}% }}")
             except Exception as e:
                 log_diag(f"[IN ERROR] YFinance Fetch Failed for {key}: {e}")
                 failed_indicators.append(key)
@@ -918,92 +1391,8 @@ def fetch_market_data():
                 }
                 status = "SIMULATED"
 
-    # 3. Add Computed/Legacy Indicators
-    
-    # LIVE MOVE INDEX (Try ^MOVE or ^TYVIX)
-    try:
-        move = yf.Ticker("^MOVE") 
-        hist = move.history(period="1mo")
-        if hist.empty:
-            move = yf.Ticker("^TYVIX") # CBOE 10Y Treasury Note Volatility (MOVE Proxy)
-            hist = move.history(period="1mo")
-            
-        if not hist.empty:
-            current = hist['Close'].iloc[-1]
-            prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
-            change = ((current - prev) / prev) * 100
-            sparkline = hist['Close'].tolist()
-            trend = "ELEVATED" if current > 120 else ("STRESS" if current > 140 else "NORMAL")
-            
-            all_data["MOVE"] = {
-                "price": round(current, 2), 
-                "change_percent": round(change, 2), 
-                "trend": trend, 
-                "sparkline": [round(x, 2) for x in sparkline]
-            }
-        else:
-             all_data["MOVE"] = {"price": 105.2, "change_percent": 1.2, "trend": "MOCK", "sparkline": [100+x for x in range(30)]}
-    except:
-         all_data["MOVE"] = {"price": 105.2, "change_percent": 1.2, "trend": "MOCK", "sparkline": [100+x for x in range(30)]}
-
-    # MARKET BREADTH (RSP vs SPY Relative Strength)
-    try:
-        if "RSP" in all_data and "SPY" in all_data:
-            rsp_change = all_data["RSP"]["change_percent"]
-            spy_change = all_data["SPY"]["change_percent"]
-            breadth_diff = rsp_change - spy_change
-            
-            # Logic: If RSP outperforms SPY, breadth is healthy.
-            # If SPY massively outperforms RSP (negative diff), breadth is narrow (Tech concentration).
-            
-            trend = "HEALTHY"
-            if breadth_diff < -1.0: trend = "NARROW" # SPY leads RSP by > 1%
-            elif breadth_diff > 0.5: trend = "BROAD" # RSP leads
-            
-            # Calculate Breadth History for Sparkline
-            try:
-                rsp_h = batch_hist["RSP"] if batch_hist is not None else yf.Ticker("RSP").history(period="1mo")
-                spy_h = batch_hist["SPY"] if batch_hist is not None else yf.Ticker("SPY").history(period="1mo")
-                
-                # Take Close prices and normalize
-                rsp_c = rsp_h['Close'].tail(22)
-                spy_c = spy_h['Close'].tail(22)
-                
-                # Percentage change relative to start of period to normalize
-                rsp_norm = (rsp_c / rsp_c.iloc[0]) * 100
-                spy_norm = (spy_c / spy_c.iloc[0]) * 100
-                breadth_spark = (rsp_norm - spy_norm).tolist()
-            except:
-                breadth_spark = [0]*30
-
-            all_data["BREADTH"] = {
-                "price": round(breadth_diff, 2), # The spread value
-                "change_percent": 0.0,
-                "trend": trend,
-                "sparkline": [round(x, 2) for x in breadth_spark]
-            }
-        else:
-            all_data["BREADTH"] = {"price": 0.5, "change_percent": 0.0, "trend": "HEALTHY", "sparkline": [0]*30}
-    except:
-        all_data["BREADTH"] = {"price": 0.5, "change_percent": 0.0, "trend": "HEALTHY", "sparkline": [0]*30}
-
-    # SPY vs RSP Momentum (Redundant with breadth, but kept for specific widget if needed)
-    if "SPY" in all_data and "RSP" in all_data:
-        spy_mom = all_data["SPY"]["change_percent"]
-        rsp_mom = all_data["RSP"]["change_percent"]
-        all_data["SPY_MOMENTUM"] = {
-             "price": round(spy_mom - rsp_mom, 2), "change_percent": 0, "trend": "SKEWED" if abs(spy_mom-rsp_mom) > 1 else "BALANCED", 
-             "sparkline": [0]*30
-        }
-        
-    # Copper/Gold
-    if "COPPER" in all_data and "GOLD" in all_data and all_data["GOLD"]["price"] > 0:
-        ratio = all_data["COPPER"]["price"] / all_data["GOLD"]["price"]
-        all_data["COPPER_GOLD"] = {
-             "price": round(ratio * 1000, 2), # Scale for visibility
-             "change_percent": 0, "trend": "RISK-ON" if ratio > 0.002 else "RISK-OFF",
-             "sparkline": [round(ratio*1000, 2)]*30
-        }
+    # 3. Add Computed/Legacy Indicators (MOVE, BREADTH, SPY_MOMENTUM, COPPER_GOLD)
+    all_data.update(compute_derived_indicators(closes))
 
     if failed_indicators:
         log_diag(f"[GUARD] Data Integrity Audit: {len(failed_indicators)} indicators failed/mocked: {', '.join(failed_indicators)}")
@@ -1014,76 +1403,44 @@ def fetch_market_data():
 
 def calculate_sector_score(sector_name, data):
     """Calculates 0-100 score for a specific sector with trend consideration."""
-    config = SECTORS.get(sector_name)
-    if not config: return 50
-    
-    score = 50.0
-    total_weight = 0
-    
-    for key, weight in config["weights"].items():
-        if key not in data: continue
-        item = data[key]
-        price = item["price"]
-        change = item["change_percent"]
-        sparkline = item.get("sparkline", [])
-        
-        # Daily impact (60% weight)
-        daily_impact = 0
-        if key in config["invert"]:
-             if change > 0: daily_impact = -5  # Rising fear
-             else: daily_impact = 5
-        else:
-             if change > 0: daily_impact = 5  # Rising asset
-             else: daily_impact = -5
-        
-        # Trend impact (40% weight) - 30-day moving average
-        trend_impact = 0
-        if len(sparkline) >= 30:
-            ma_30 = sum(sparkline[-30:]) / 30
-            current = sparkline[-1]
-            trend_pct = ((current - ma_30) / ma_30) * 100 if ma_30 != 0 else 0
-            
-            if key in config["invert"]:
-                trend_impact = -trend_pct * 0.5  # Invert for fear indices
-            else:
-                trend_impact = trend_pct * 0.5
-        
-        # Combined impact: 60% daily + 40% trend
-        combined_impact = (daily_impact * 0.6) + (trend_impact * 0.4)
-        score += combined_impact * (weight * 5)
-        total_weight += weight
-
-    return int(max(0, min(100, score)))
-
-def calculate_liquidity_thresholds(history_data):
-    """Calculate dynamic Net Liquidity thresholds from historical data."""
-    if not history_data or len(history_data) < 30:
+    if sector_name not in SECTORS: return 50
+    return sector_scorer.score(data)[sector_name]
+
+def load_liquidity_index():
+    """Opens the persistent Net Liquidity percentile index, seeding it from the archive summary on first use."""
+    index = PercentileIndex(LIQUIDITY_INDEX_FILE, log_callback=log_diag)
+    if len(index) == 0:
+        summary_file = os.path.join(SCRIPT_DIR, "archive", "summary.json")
+        try:
+            if os.path.exists(summary_file):
+                with open(summary_file, 'r', encoding='utf-8') as f:
+                    seed = [(item["date"], item["net_liquidity"]) for item in json.load(f)
+                            if isinstance(item.get("net_liquidity"), (int, float))]
+                if index.extend(seed):
+                    index.save()
+                    log_diag(f"[LIQ_INDEX] Seeded {len(index)} observations from archive summary")
+        except (json.JSONDecodeError, IOError, OSError, KeyError) as e:
+            log_diag(f"[LIQ_INDEX] [WARN] Could not seed from summary: {e}")
+    return index
+
+def record_liquidity_observation(index, data):
+    """Adds today's computed Net Liquidity reading (baseline/mock values are skipped)."""
+    item = data.get("NET_LIQUIDITY", {})
+    if item.get("trend") not in ("EXPANSION", "CONTRACTION") or not isinstance(item.get("price"), (int, float)):
+        return
+    if index.add(datetime.now(timezone.utc).strftime("%Y-%m-%d"), item["price"]):
+        index.save()
+
+def calculate_liquidity_thresholds(index=None):
+    """Calculate dynamic Net Liquidity thresholds (75th / 25th percentile) from the liquidity index."""
+    index = index if index is not None else load_liquidity_index()
+    if len(index) < LIQUIDITY_MIN_SAMPLES:
         # Fallback to fixed values
         return 6400, 6000
-    
-    # Extract Net Liquidity values from history
-    values = []
-    for entry in history_data:
-        market_data = entry.get("market_data", {})
-        net_liq = market_data.get("NET_LIQUIDITY", {}).get("price")
-        if net_liq is not None:
-            values.append(net_liq)
-    
-    if len(values) < 30:
-        return 6400, 6000
-    
-    # Use 75th and 25th percentiles
-    values_sorted = sorted(values)
-    high_idx = int(len(values_sorted) * 0.75)
-    low_idx = int(len(values_sorted) * 0.25)
-    
-    high_threshold = values_sorted[high_idx]
-    low_threshold = values_sorted[low_idx]
-    
-    return high_threshold, low_threshold
+    return index.quantile(0.75), index.quantile(0.25)
 
 
-def calculate_total_gms(data, sector_scores, history_data=None):
+def calculate_total_gms(data, sector_scores, liquidity_index=None):
     """Calculates Final Global Macro Signal (0-100) with improved weighting."""
     log_diag(f"[OUT] SECTOR_SCORES: {json.dumps(sector_scores)}")
     
@@ -1097,23 +1454,19 @@ def calculate_total_gms(data, sector_scores, history_data=None):
     
     legacy_score = max(0, min(100, legacy_score))
     
-    # Rebalanced Sector Weights (Total: 100%) - Phase 2 Final
-    # GLOBAL_INDICES: 15%, CREDIT: 3%, REAL_ESTATE: 2%, COMMODITIES: 10%
-    final = (legacy_score * 0.25) + \
-            (sector_scores.get("STOCKS", 50) * 0.25) + \
-            (sector_scores.get("CRYPTO", 50) * 0.10) + \
-            (sector_scores.get("FOREX", 50) * 0.10) + \
-            (sector_scores.get("GLOBAL_INDICES", 50) * 0.15) + \
-            (sector_scores.get("COMMODITIES", 50) * 0.10) + \
-            (sector_scores.get("CREDIT", 50) * 0.03) + \
-            (sector_scores.get("REAL_ESTATE", 50) * 0.02)
+    # Rebalanced Sector Weights (Total: 100%) - see GMS_WEIGHTS
+    final = legacy_score * GMS_WEIGHTS["LEGACY"]
+    for sector, weight in GMS_WEIGHTS.items():
+        if sector != "LEGACY":
+            final += sector_scores.get(sector, 50) * weight
     
     # Dynamic Net Liquidity Adjustment (Phase 2: Mathematical Refinement)
     # Formula: Adjustment = (Percentile - 50) / 10 * Volatility_Factor
-    all_liq = [d.get("price", 6200) for d in (history_data or []) if "price" in d]
-    if all_liq:
-        p_count = sum(1 for x in all_liq if x < net_liq)
-        percentile = (p_count / len(all_liq)) * 100
+    net_liq = data.get("NET_LIQUIDITY", {}).get("price")
+    if not LIQUIDITY_ADJUSTMENT:
+        log_diag("[GMS] Dynamic Liq Adj disabled (LIQUIDITY_ADJUSTMENT=0).")
+    elif liquidity_index is not None and net_liq is not None and len(liquidity_index) >= LIQUIDITY_MIN_SAMPLES:
+        percentile = liquidity_index.percentile(net_liq)
         
         # Volatility Factor (VIX baseline 20, increases impact as VIX rises)
         vix = data.get("VIX", {}).get("price", 20)
@@ -1130,11 +1483,11 @@ def calculate_total_gms(data, sector_scores, history_data=None):
 def fetch_breaking_news():
     """Fetches top headline from CNBC for AI context."""
     try:
-        FEED_URL = 'https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=100003114'
+        FEED_URL = f'{CNBC_RSS_BASE_URL}/rs/search/combinedcms/view.xml?partnerId=wrss01&id=100003114'
         log_diag("[IN] API_CALL: { provider: 'CNBC_RSS', endpoint: '/rss', timeout: 10s }")
         
         start_time = time.time()
-        res = requests.get(FEED_URL, timeout=10)
+        res = http_client.get(FEED_URL, timeout=10)
         duration_ms = int((time.time() - start_time) * 1000)
         
         log_diag(f"[OUT] API_RESPONSE: {{ provider: 'CNBC_RSS', status: {res.status_code}, size: {len(res.content)}B, duration: {duration_ms}ms }}")
@@ -1160,11 +1513,27 @@ def fetch_breaking_news():
         log_diag(f"[RSS_UNEXPECTED] {type(e).__name__}: {e}")
     return "Market data synchronization active."
 
+def is_valid_analysis(reports):
+    """Valid = Does not contain 'Analysis Sync' or 'Market data sync' phrases."""
+    if not isinstance(reports, dict) or not reports:
+        return False
+    # Check EN text for known fallback strings
+    en_text = reports.get("EN", "")
+    if "Analysis Sync" in en_text or "Market data synchronization" in en_text:
+        return False
+    # Also check JP just in case
+    return "分析同期中" not in reports.get("JP", "")
+
 def get_last_valid_analysis():
     """
-    scans backend/archive/ for the most recent valid report.
-    Valid = Does not contain 'Analysis Sync' or 'Market data sync' phrases.
+    Returns the most recent valid report via the last-valid index (one small read).
+    Scans backend/archive/ only when the index is missing or unreadable, and seeds it from the result.
     """
+    entry = last_valid_report.load()
+    if entry and is_valid_analysis(entry["reports"]):
+        log_diag(f"[SMART CACHE] Found valid report from {entry['source']} ({entry['hash'][:12]})")
+        return entry["reports"]
+
     try:
         if not os.path.exists(ARCHIVE_DIR): return None
         
@@ -1176,19 +1545,11 @@ def get_last_valid_analysis():
                 with open(path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     reports = data.get("analysis", {}).get("reports")
-                    if not reports: continue
-                    
-                    # Check Validity (Check EN text for known fallback strings)
-                    en_text = reports.get("EN", "")
-                    if "Analysis Sync" in en_text or "Market data synchronization" in en_text:
+                    if not is_valid_analysis(reports):
                         continue # Invalid/Fallback content
                         
-                    # Also check JP just in case
-                    jp_text = reports.get("JP", "")
-                    if "分析同期中" in jp_text:
-                        continue
-                        
-                    log_diag(f"[SMART CACHE] Found valid report from {fname}")
+                    log_diag(f"[SMART CACHE] Found valid report from {fname} (archive scan; seeding index)")
+                    last_valid_report.record(reports, f"archive/{fname}")
                     return reports
             except (FileNotFoundError, PermissionError, json.JSONDecodeError, IOError):
                 # Skip invalid/inaccessible files
@@ -1201,13 +1562,42 @@ def get_last_valid_analysis():
     return None
 
 
-def calculate_trend_context(history, current_score):
+def load_score_series(history=None):
+    """Opens the multi-resolution GMS store, seeding it from history.json and the archive summary on first use."""
+    series = ScoreSeriesStore(SCORE_SERIES_FILE, log_callback=log_diag)
+    if len(series) == 0:
+        for h in history or []:
+            try:
+                series.append(h["timestamp"], h["score"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        summary_file = os.path.join(SCRIPT_DIR, "archive", "summary.json")
+        try:
+            if os.path.exists(summary_file):
+                with open(summary_file, 'r', encoding='utf-8') as f:
+                    seeded = series.seed_daily((item["date"], item.get("gms_score")) for item in json.load(f))
+                log_diag(f"[SERIES] Seeded {len(series)} raw points and {seeded} archived days")
+        except (json.JSONDecodeError, IOError, OSError, KeyError) as e:
+            log_diag(f"[SERIES] [WARN] Could not seed from summary: {e}")
+    return series
+
+def format_trend_horizons(horizons):
+    """Compact prompt string, e.g. '1D 52->55 (+3, range 50-57) | 1W ...'."""
+    parts = []
+    for label, t in horizons.items():
+        parts.append(f"{label} {t['from']:g}->{t['to']:g} ({t['delta']:+g}, range {t['min']:g}-{t['max']:g}, avg {t['mean']:g})")
+    return " | ".join(parts) if parts else "N/A"
+
+def calculate_trend_context(history, current_score, score_series=None):
     """
     Analyzes the last 10 data points to determine trend vector and narrative.
-    Returns a dict with 'vector', 'narrative', 'stat_str'.
+    Returns a dict with 'vector', 'narrative', 'stat_str', plus 'horizons' / 'horizon_str'
+    (1D / 1W / 1M / 1Y summaries) when a score series store is given.
     """
+    horizons = score_series.horizons() if score_series is not None else {}
     if not history or len(history) < 3:
-        return {"vector": "FLAT", "narrative": "Insufficient history to determine trend.", "stat_str": "N/A"}
+        return {"vector": "FLAT", "narrative": "Insufficient history to determine trend.", "stat_str": "N/A",
+                "horizons": horizons, "horizon_str": format_trend_horizons(horizons)}
 
     # Use last 10 points
     recent_window = history[-10:]
@@ -1238,9 +1628,34 @@ def calculate_trend_context(history, current_score):
     return {
         "vector": vector,
         "narrative": narrative,
-        "stat_str": stat_str
+        "stat_str": stat_str,
+        "horizons": horizons,
+        "horizon_str": format_trend_horizons(horizons)
     }
 
+report_cache = ReportCache(REPORT_CACHE_FILE, ttl_seconds=REPORT_CACHE_TTL_SEC, log_callback=log_diag)
+last_valid_report = LastValidReport(LAST_VALID_REPORT_FILE, log_callback=log_diag)
+
+def remember_valid_reports(cache_key, reports, source):
+    """Stores freshly validated reports in the input cache and points the last-valid index at them."""
+    report_cache.put(cache_key, reports)
+    last_valid_report.record(reports, source)
+
+def report_cache_key(data, score, trend_context):
+    """Canonical hash of the material prompt inputs (indicators rounded to 3 significant digits)."""
+    indicators = {}
+    for key in REPORT_CACHE_INDICATORS:
+        price = data.get(key, {}).get("price") if isinstance(data.get(key), dict) else None
+        if isinstance(price, (int, float)) and np.isfinite(price):
+            indicators[key] = round_sig(price)
+    return canonical_key({
+        "prompt": REPORT_PROMPT_VERSION,
+        "format": AI_PROMPT_FORMAT,
+        "score": score,
+        "vector": trend_context.get("vector", "FLAT"),
+        "indicators": indicators
+    })
+
 def generate_multilingual_report(data, score, trend_context={}):
     """Generates AI analysis in 7 languages using a SINGLE batch API call for efficiency."""
     # Prepare high-density data summary for AI v5.2
@@ -1275,20 +1690,33 @@ def generate_multilingual_report(data, score, trend_context={}):
 
     log_diag(f"[AI BRIDGE] GEMINI_API_KEY detected (Length: {len(GEMINI_KEY)})")
 
+    # One end-to-end budget for the whole AI stage (bridge + hedged gateway routes)
+    ai_deadline = time.time() + AI_STAGE_DEADLINE_SEC
+
+    # Quiet market: identical inputs within the TTL reuse the last validated reports
+    cache_key = report_cache_key(data, score, trend_context)
+    cache_lookup_start = time.time()
+    cached_reports = report_cache.get(cache_key)
+    if cached_reports:
+        log_diag(f"[REPORT CACHE] HIT {cache_key[:12]} (score {score}, TTL {REPORT_CACHE_TTL_SEC}s). Skipping AI generation.")
+        ai_metrics.record("report_cache", True, int((time.time() - cache_lookup_start) * 1000))
+        return cached_reports
+    log_diag(f"[REPORT CACHE] MISS {cache_key[:12]}")
+
     # Calculate Trend Context
     trend_narrative = trend_context.get("narrative", "Market is analyzing new data patterns.")
     trend_vector = trend_context.get("vector", "FLAT")
     history_stat = trend_context.get("stat_str", "")
+    trend_horizons = trend_context.get("horizon_str", "N/A")
 
     # Prepare high-density data summary for AI v5.2
-    # Include current, previous, and daily change for context
-    market_summary = ""
-    for k, v in data.items():
-        if isinstance(v, dict) and "price" in v:
-            p = v['price']
-            prev = v.get('prev_price', p)
-            d_chg = v.get('daily_chg', 0.0)
-            market_summary += f"- {k}: {p} (Prev: {prev}, DailyChg: {d_chg}%)\n"
+    # Compact table (level, daily change, trend) unless the legacy labelled lines are requested
+    if AI_PROMPT_FORMAT == "legacy":
+        matrix_label = "Market Matrix Summary:"
+        market_summary = encode_market_lines(data)
+    else:
+        matrix_label = "Market Matrix (daily change in %):"
+        market_summary = encode_market_table(data)
 
     breaking_news = fetch_breaking_news()
 
@@ -1312,7 +1740,8 @@ You are the centralized brain of the OmniMetric Terminal. Synthesize complex qua
 Market Context:
 - GMS Score: {score}/100 (Leading Indicator Phase 2 weights)
 - Leading OGV Vector: {trend_vector} (Copper/Gold & Inflation Proxies)
-- Market Matrix Summary:
+- GMS Trend Horizons: {trend_horizons}
+- {matrix_label}
 {market_summary}
 - Global News Pulse: {breaking_news}
 
@@ -1327,7 +1756,10 @@ Output JSON format (Keep consistent across languages):
   "HI": "...", "ID": "...", "AR": "...", "DE": "...", "FR": "..."
 }}
 """
-    prompt_log_path = os.path.join(SCRIPT_DIR, "logs", "latest_prompt.txt")
+    prompt_tokens_est = estimate_tokens(prompt)
+    log_diag(f"[AI PROMPT] format={AI_PROMPT_FORMAT}, {len(prompt)} chars (~{prompt_tokens_est} tokens), "
+             f"market matrix {len(market_summary)} chars")
+    prompt_log_path = cassette.sandboxed(os.path.join(SCRIPT_DIR, "logs", "latest_prompt.txt"))
     try:
         with open(prompt_log_path, "w", encoding="utf-8") as f:
             f.write(prompt)
@@ -1344,8 +1776,28 @@ Output JSON format (Keep consistent across languages):
         text = re.sub(r'\(\d+ characters?\)$', '', text.strip(), flags=re.IGNORECASE)
         return text.strip()
 
+    def validate_reports(reports, languages=REPORT_LANGUAGES, valid=None):
+        """Sanitizes reports in place; returns a rejection reason, or None when every language passes.
+
+        Languages that pass on their own are added to valid (when given), even if others fail.
+        """
+        if not isinstance(reports, dict):
+            return "response is not a JSON object"
+        missing = [lang for lang in languages if not isinstance(reports.get(lang), str)]
+        problems = [f"missing languages {missing}"] if missing else []
+        for lang in languages:
+            if lang in missing:
+                continue
+            reports[lang] = sanitize_insight_text(reports[lang])
+            if len(reports[lang]) < AI_MIN_REPORT_CHARS:
+                problems.append(f"{lang} report too short ({len(reports[lang])} chars)")
+            elif valid is not None:
+                valid[lang] = reports[lang]
+        return "; ".join(problems) or None
+
     # ATTEMPT 1: NODE.JS BRIDGE (SSL Isolation + Environment Stability)
-    if not IS_MOCK_MODE:
+    # Skipped under a cassette: the subprocess cannot be recorded, the HTTP gateway below can
+    if not IS_MOCK_MODE and not cassette.mode:
         try:
             log_diag("[AI BRIDGE] Attempting Node.js Bridge for SSL isolation...")
             
@@ -1353,37 +1805,29 @@ Output JSON format (Keep consistent across languages):
             bridge_success = False
             
             frontend_dir = os.path.join(os.path.dirname(SCRIPT_DIR), "frontend")
-            script_path = os.path.join(frontend_dir, "scripts", "generate_insight.ts")
-            
-            import shutil
-            if not shutil.which("npx"):
+            stdout_content = ""
+            current_returncode = 1
+
+            # Persistent worker: npx/tsx/Node startup is paid once per process, not per report
+            bridge = get_bridge(log_callback=log_diag)
+            if bridge is None:
                 log_diag("[AI BRIDGE WARN] npx not found in PATH. Skipping Bridge.")
             else:
-                cmd = ["npx", "tsx", script_path] 
-                log_diag(f"[AI BRIDGE] Executing: {' '.join(cmd)} (using stdin)")
-                
-                process_obj = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    encoding='utf-8',
-                    shell=(os.name == 'nt'),
-                    cwd=frontend_dir,
-                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                )
-                
-                stdout_str, stderr_str = process_obj.communicate(input=prompt, timeout=120)
-                bridge_success = (process_obj.returncode == 0)
-                
-                if not bridge_success:
-                    log_diag(f"[AI BRIDGE WARN] Bridge execution failed (Code {process_obj.returncode}).")
-                    if stderr_str: log_diag(f"[STDERR] {stderr_str[:500]}")
-                
-                # Assign to compatible identifiers for the rest of the function
-                stdout_content = stdout_str if bridge_success else ""
-                current_returncode = process_obj.returncode
+                try:
+                    lease = get_governor(log_callback=log_diag).acquire(
+                        "engine:bridge", PRIORITY_ENGINE, tokens=estimate_tokens(prompt) + AI_OUTPUT_TOKEN_ESTIMATE,
+                        timeout=max(1.0, ai_deadline - time.time() - 1))
+                    # The worker may try several models for one prompt; charge every call it sent
+                    bridge_usage = {}
+                    try:
+                        text = bridge.request(prompt, timeout=max(1.0, min(120, ai_deadline - time.time())), usage=bridge_usage)
+                    finally:
+                        lease.settle(bridge_usage.get("tokens"), requests=bridge_usage.get("calls", 1))
+                    # Same {"text": ...} envelope the one-shot script prints (audit log + parser below)
+                    stdout_content = json.dumps({"text": text}, ensure_ascii=False)
+                    current_returncode = 0
+                except (BridgeError, BudgetExceeded) as e:
+                    log_diag(f"[AI BRIDGE WARN] Worker request failed: {e}")
 
             if current_returncode != 0:
                 log_diag(f"[AI BRIDGE WARN] Bridge execution failed (Code {current_returncode}). Trying direct node fallback...")
@@ -1392,7 +1836,7 @@ Output JSON format (Keep consistent across languages):
                 if os.path.exists(js_script):
                     cmd = ["node", js_script] # Use stdin
                     log_diag(f"[AI BRIDGE FALLBACK] Executing: {' '.join(cmd)} (using stdin)")
-                    p = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', cwd=frontend_dir, shell=(os.name == 'nt'))
+                    p = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', cwd=frontend_dir, env=worker_env(), shell=(os.name == 'nt'))
                     stdout_str, stderr_str = p.communicate(input=prompt, timeout=60)
                     if p.returncode == 0:
                         stdout_content = stdout_str
@@ -1403,7 +1847,7 @@ Output JSON format (Keep consistent across languages):
                     
                     # LOGGING: Output Audit (Bridge)
                     try:
-                        with open(os.path.join(SCRIPT_DIR, "logs", "latest_raw_response.json"), "w", encoding="utf-8") as f:
+                        with open(cassette.sandboxed(os.path.join(SCRIPT_DIR, "logs", "latest_raw_response.json")), "w", encoding="utf-8") as f:
                             f.write(stdout_content)
                     except (IOError, OSError) as e:
                         log_diag(f"[WARN] Failed to write audit log: {e}")
@@ -1460,7 +1904,9 @@ Output JSON format (Keep consistent across languages):
                                     if valid:
                                         log_diag("[AI SUCCESS] Reports parsed and validated via Bridge.")
                                         bridge_success = True
-                                        ai_metrics.record("node_bridge", True, int((time.time() - bridge_start) * 1000))
+                                        ai_metrics.record("node_bridge", True, int((time.time() - bridge_start) * 1000),
+                                                          len(prompt), prompt_tokens_est)
+                                        remember_valid_reports(cache_key, reports, "node_bridge")
                                         return reports
                                     else:
                                         log_diag("[AI FAIL] Validation failed (Quality Guard). Using Fallback.")
@@ -1486,6 +1932,9 @@ Output JSON format (Keep consistent across languages):
 
     # VERCEL AI GATEWAY - RESILIENCE PROTOCOL (PRIMARY)
     # Strategy: Env Var Target > Flash-Targeted Speed > High-Tier Reasoning > Efficient Fallbacks
+    # Each model has two routes (Vercel Gateway, then Direct Google API). Routes are hedged:
+    # the next one starts when the running ones exceed AI_HEDGE_AFTER_SEC or fail, and the
+    # first validated answer wins, all within the remaining AI stage deadline.
     
     # Updated Priority per User Request (Tier 1 > Tier 2 > Tier 3)
     target_model = os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
@@ -1500,116 +1949,193 @@ Output JSON format (Keep consistent across languages):
     models = list(dict.fromkeys(models))
 
     gateway_slug = os.getenv("VERCEL_AI_GATEWAY_SLUG", "xljunk") # Target: xljunk
-    
-    for model_name in models:
-        log_diag(f"[AI GATEWAY] Attempting Model: {model_name}...")
-        
-        model_success = False
-        model_start = time.time()
-        
-        # Retries for robustness (Max 3 Attempts)
-        for attempt in range(3):
-            try:
-                # Calculate Backoff: (Attempt * 5)s -> 0s, 5s...
-                if attempt > 0:
-                    wait_time = attempt * 5
-                    log_diag(f"[AI GATEWAY] Rate Limit Guard: Backing off for {wait_time}s...")
-                    time.sleep(wait_time)
-
-
-                # Unified Key/URL Logic with Fail-Safe
-                headers = {
-                    "Content-Type": "application/json",
-                    "x-vercel-ai-gateway-cache": "disable",
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-                
-                if attempt == 0:
-                    # Attempt 1: Vercel AI Gateway (Universal V1 REST)
-                    url = f"https://ai-gateway.vercel.sh/v1/google/v1beta/models/{model_name}:generateContent"
-                    headers["x-vercel-ai-gateway-provider"] = "google"
-                    if AI_GATEWAY_KEY: headers["Authorization"] = f"Bearer {AI_GATEWAY_KEY}"
-                else:
-                    # Attempt 2+: Direct API Fallback
-                    log_diag(f"[AI GATEWAY] Failing Over to Direct Google API for {model_name}...")
-                    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
 
-                target_url = f"{url}?key={GEMINI_KEY}"
-                
-                payload = {"contents": [{"parts": [{"text": prompt}]}]}
-                
-                # Timeout Increased to 30s
-                log_diag(f"[IN] API_CALL: {{ provider: 'AI_Gateway', model: {model_name}, endpoint: '/generateContent', timeout: 30s }}")
-                
-                try:
-                    start_time = time.time()
-                    response = requests.post(target_url, json=payload, headers=headers, timeout=30)
-                    duration_ms = int((time.time() - start_time) * 1000)
-                    
-                    log_diag(f"[OUT] API_RESPONSE: {{ provider: 'AI_Gateway', model: {model_name}, status: {response.status_code}, duration: {duration_ms}ms }}")
-                except requests.exceptions.Timeout:
-                    log_diag(f"[AI_TIMEOUT] Gemini API timed out after 30s. Model={model_name}")
-                    continue
-                except requests.exceptions.ConnectionError as e:
-                    log_diag(f"[AI_CONNECTION] Network error: {e}")
-                    continue
-                except requests.exceptions.RequestException as e:
-                    log_diag(f"[AI_REQUEST] Request exception: {type(e).__name__}: {e}")
-                    continue
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    # LOGGING: Output Audit
-                    try:
-                        with open(os.path.join(SCRIPT_DIR, "logs", "latest_raw_response.json"), "w", encoding="utf-8") as f:
-                            json.dump(result, f, indent=2, ensure_ascii=False)
-                    except (IOError, OSError, TypeError) as e:
-                        log_diag(f"[WARN] Failed to write audit log: {e}")
-                    
-                    if 'candidates' in result and result['candidates']:
-                        text = result['candidates'][0]['content']['parts'][0]['text']
-                        log_diag(f"[AI SUCCESS] Generated via {model_name} (Attempt {attempt+1}).")
-                        text = text.replace("```json", "").replace("```", "").strip()
-                        reports = json.loads(text)
-                        
-                        # Validate Keys
-                        if all(lang in reports for lang in required):
-                            for lang in required:
-                                reports[lang] = sanitize_insight_text(reports[lang])
-                            
-                            model_success = True
-                            ai_metrics.record(f"gateway_{model_name}", True, int((time.time() - model_start) * 1000))
-                            return reports
-                        else:
-                             log_diag(f"[AI INVALID] {model_name} returned incomplete JSON.")
-                             break
-                    else:
-                        log_diag(f"[AI ERROR] No candidates in response. Model={model_name}") 
-                
-                elif response.status_code == 429:
-                    log_diag(f"[AI RATE LIMIT] URL=[MASKED], Model={model_name}, Status=429. Triggering fallback...")
-                    # User Request: If 429, immediately try Direct API
-                    if attempt == 0:
-                        continue
-                    break # Break if Direct API also rate limits
-                
-                else:
-                    error_msg = response.text.strip()
-                    log_diag(f"[AI ERROR] URL=[MASKED], Model={model_name}, Status={response.status_code}, Body={error_msg[:300]}")
-                    # Non-429 error (e.g. 500 or 404). Try Direct API if this was Gateway attempt.
-                    if attempt == 0:
-                         log_diag(f"[AI FALLBACK] Gateway failed. Switching to Direct API for {model_name}...")
-                         continue
-                    break # Move to next model if Direct API also fails
+    def language_prompt(languages):
+        """The report prompt with its output spec narrowed to a language subset."""
+        if list(languages) == REPORT_LANGUAGES:
+            return prompt
+        spec = ", ".join(f'"{lang}": "..."' for lang in languages)
+        return prompt.split("Output JSON format")[0] + f"Output JSON format (only these languages):\n{{ {spec} }}\n"
+
+    def read_report_stream(response, label, route_start, cancel, languages, usage, timing, salvage):
+        """Parses an SSE stream incrementally, aborting on the first invalid language entry.
+
+        Languages validated before an abort are kept in salvage.
+        """
+        parser = IncrementalReportParser(languages, min_chars=AI_MIN_REPORT_CHARS, sanitize=sanitize_insight_text)
+        chunks = []
+        response.encoding = response.encoding or "utf-8"
+        try:
+            for delta in iter_sse_text(response.iter_lines(decode_unicode=True), usage):
+                if cancel.is_set():
+                    raise RuntimeError("superseded by a faster route")
+                if time.time() > ai_deadline:
+                    raise RuntimeError("AI stage deadline reached mid-stream")
+                if not chunks:
+                    timing["first_token_ms"] = int((time.time() - route_start) * 1000)
+                chunks.append(delta)
+                for lang in parser.feed(delta):
+                    log_diag(f"[AI STREAM] {label}: {lang} validated at {int((time.time() - route_start) * 1000)}ms")
+            return parser.close(), "".join(chunks)
+        except ReportStreamRejected as e:
+            raise RuntimeError(f"[AI INVALID] {e} (stream aborted after {sum(len(c) for c in chunks)} chars)")
+        finally:
+            salvage.update({lang: text for lang, text in parser.reports.items() if lang in languages})
+            response.close()
+
+    def call_route(model_name, route, cancel, languages=REPORT_LANGUAGES, salvage=None):
+        """One generate call (streamed when AI_STREAMING); returns validated reports or raises with the reason.
+
+        When the answer is rejected, its individually valid languages are added to salvage.
+        """
+        salvage = {} if salvage is None else salvage
+        route_start = time.time()
+        headers = {
+            "Content-Type": "application/json",
+            "x-vercel-ai-gateway-cache": "disable",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+        endpoint = "streamGenerateContent" if AI_STREAMING else "generateContent"
+        if route == "gateway":
+            # Vercel AI Gateway (Universal V1 REST)
+            url = f"{AI_GATEWAY_BASE_URL}/v1/google/v1beta/models/{model_name}:{endpoint}"
+            headers["x-vercel-ai-gateway-provider"] = "google"
+            if AI_GATEWAY_KEY: headers["Authorization"] = f"Bearer {AI_GATEWAY_KEY}"
+        else:
+            # Direct Google API
+            url = f"{GEMINI_BASE_URL}/v1beta/models/{model_name}:{endpoint}"
+        target_url = f"{url}?alt=sse&key={GEMINI_KEY}" if AI_STREAMING else f"{url}?key={GEMINI_KEY}"
+        route_prompt = language_prompt(languages)
+        payload = {"contents": [{"parts": [{"text": route_prompt}]}]}
+        # Prompt size next to latency / time-to-first-token (tokens: provider count when reported, else estimate)
+        prompt_size = {"chars": len(route_prompt), "tokens": estimate_tokens(route_prompt)}
+        timing = {}
+
+        def record_route(success):
+            method = f"{route}_{model_name}"
+            ai_metrics.record(method, success, int((time.time() - route_start) * 1000), prompt_size["chars"], prompt_size["tokens"])
+            if "first_token_ms" in timing:
+                ai_metrics.record(f"{method}_ttft", True, timing["first_token_ms"], prompt_size["chars"], prompt_size["tokens"])
 
-            except Exception as e:
-                log_diag(f"[AI GATEWAY EXCEPTION] {e}")
-                break # Move to next model
-        
-        # Record failure if model didn't succeed
-        if not model_success:
-            ai_metrics.record(f"gateway_{model_name}", False, int((time.time() - model_start) * 1000))
+        try:
+            # Shared quota with news / wiki jobs: the engine's priority preempts them, the deadline bounds the wait
+            try:
+                lease = get_governor(log_callback=log_diag).acquire(
+                    f"engine:{route}:{model_name}", PRIORITY_ENGINE,
+                    tokens=estimate_tokens(route_prompt) + AI_OUTPUT_TOKEN_ESTIMATE,
+                    timeout=max(0.0, ai_deadline - time.time() - 1), cancel=cancel, scope=f"{route}:{model_name}")
+            except BudgetExceeded as e:
+                raise RuntimeError(f"[AI BUDGET] {e}")
+
+            # Streaming: the timeout applies between bytes, the stage deadline bounds the whole read
+            timeout = max(1.0, min(AI_REQUEST_TIMEOUT_SEC, ai_deadline - time.time()))
+            log_diag(f"[IN] API_CALL: {{ provider: 'AI_Gateway', route: {route}, model: {model_name}, endpoint: '/{endpoint}', timeout: {timeout:.0f}s }}")
+            try:
+                response = http_client.post(target_url, json=payload, headers=headers, timeout=timeout, stream=AI_STREAMING)
+            except requests.exceptions.Timeout:
+                raise RuntimeError(f"[AI_TIMEOUT] timed out after {timeout:.0f}s")
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"[AI_REQUEST] {type(e).__name__}: {e}")
+
+            log_diag(f"[OUT] API_RESPONSE: {{ provider: 'AI_Gateway', route: {route}, model: {model_name}, status: {response.status_code}, duration: {int((time.time() - route_start) * 1000)}ms }}")
+            if response.status_code == 429:
+                # Cools down this route only: the hedged alternates (other route / model) go ahead at once
+                get_governor().penalize(AI_RATE_LIMIT_COOLDOWN_SEC, f"engine:{route}:{model_name}", PRIORITY_ENGINE,
+                                        scope=f"{route}:{model_name}")
+                raise RuntimeError("[AI RATE LIMIT] Status=429")
+            if response.status_code != 200:
+                raise RuntimeError(f"[AI ERROR] Status={response.status_code}, Body={response.text.strip()[:300]}")
+
+            if AI_STREAMING:
+                usage = {}
+                try:
+                    reports, text = read_report_stream(response, f"{route}:{model_name}", route_start, cancel, languages,
+                                                       usage, timing, salvage)
+                finally:
+                    lease.settle(usage_tokens(usage))
+                    prompt_size["tokens"] = usage.get("promptTokenCount") or prompt_size["tokens"]
+                result = {"streamed": True, "model": model_name, "route": route, "text": text, "usageMetadata": usage}
+            else:
+                result = response.json()
+                lease.settle(usage_tokens(result.get("usageMetadata")))
+                prompt_size["tokens"] = (result.get("usageMetadata") or {}).get("promptTokenCount") or prompt_size["tokens"]
+                if not result.get('candidates'):
+                    raise RuntimeError("[AI ERROR] No candidates in response")
+                text = result['candidates'][0]['content']['parts'][0]['text']
+                text = text.replace("```json", "").replace("```", "").strip()
+                reports = json.loads(text)
+                problem = validate_reports(reports, languages, valid=salvage)
+                if problem:
+                    raise RuntimeError(f"[AI INVALID] {problem}")
+            if cancel.is_set():
+                raise RuntimeError("superseded by a faster route")
+
+            # LOGGING: Output Audit (winner only)
+            try:
+                with open(cassette.sandboxed(os.path.join(SCRIPT_DIR, "logs", "latest_raw_response.json")), "w", encoding="utf-8") as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+            except (IOError, OSError, TypeError) as e:
+                log_diag(f"[WARN] Failed to write audit log: {e}")
+        except Exception:
+            record_route(False)
+            raise
+        record_route(True)
+        return reports
+
+    winners = []
+
+    def hedged_reports(languages):
+        """Hedged routes for one language set.
+
+        Returns the winning route's reports, else the languages that validated in rejected answers
+        (possibly empty), or None once the stage deadline is spent.
+        """
+        remaining = ai_deadline - time.time()
+        if remaining <= 1:
+            log_diag(f"[AI GATEWAY] AI stage deadline ({AI_STAGE_DEADLINE_SEC}s) exhausted before {'+'.join(languages)}.")
+            return None
+        tag = "" if list(languages) == REPORT_LANGUAGES else f"[{'+'.join(languages)}]"
+        salvage = {}
+        routes = [
+            (f"{route}:{model_name}{tag}", lambda cancel, m=model_name, r=route: call_route(m, r, cancel, languages, salvage))
+            for model_name in models for route in ("gateway", "direct")
+        ]
+        winner, reports = hedged_first(routes, hedge_after=AI_HEDGE_AFTER_SEC, deadline=remaining, log_callback=log_diag)
+        if winner:
+            winners.append(winner)
+            return reports
+        if salvage:
+            log_diag(f"[AI PARTIAL] {'+'.join(languages)}: keeping validated {sorted(salvage)} from rejected answers.")
+        return dict(salvage)
+
+    # One batch, language groups or single languages, fanned out concurrently. Languages that
+    # validated are kept (also out of a rejected batch/group); only the missing ones are re-requested:
+    # together in batch mode (one hedged call, not one per language), one per call otherwise.
+    if AI_GENERATION_MODE == "per_language":
+        groups = [[lang] for lang in REPORT_LANGUAGES]
+    elif AI_GENERATION_MODE == "groups":
+        groups = AI_LANGUAGE_GROUPS
+    else:
+        groups = [REPORT_LANGUAGES]
+    collected = fan_out_partial(groups, hedged_reports, retries=AI_GROUP_RETRIES,
+                                deadline=ai_deadline - time.time(), log_callback=log_diag,
+                                retry_as_group=AI_GENERATION_MODE not in ("groups", "per_language"))
+
+    if len(collected) == len(REPORT_LANGUAGES):
+        reports = {lang: collected[lang] for lang in REPORT_LANGUAGES}
+        source = winners[0] if len(winners) == 1 and len(groups) == 1 else f"{AI_GENERATION_MODE}_fan_out"
+        log_diag(f"[AI SUCCESS] Generated via {source}.")
+        remember_valid_reports(cache_key, reports, source)
+        return reports
+    if collected:
+        # Partial success: fresh languages are kept, the rest come from the last valid report
+        valid_cache = get_last_valid_analysis()
+        if valid_cache and all(lang in valid_cache for lang in REPORT_LANGUAGES):
+            missing = [lang for lang in REPORT_LANGUAGES if lang not in collected]
+            log_diag(f"[AI PARTIAL] {len(collected)}/{len(REPORT_LANGUAGES)} languages fresh; {missing} from last valid report (marked).")
+            return {lang: collected[lang] if lang in collected else
+                    (valid_cache[lang] if valid_cache[lang].endswith("..") else valid_cache[lang] + "..")
+                    for lang in REPORT_LANGUAGES}
 
     # BACKSTOPS REMOVED: Strict Gateway Enforcement
     # If Gateway loop fails, the function will proceed to raise the Exception below.
@@ -1621,7 +2147,7 @@ Output JSON format (Keep consistent across languages):
     
     # 1. Create Failure Flag (to trigger GitHub Action Failure later)
     try:
-        flag_path = os.path.join(SCRIPT_DIR, "ai_failed.flag")
+        flag_path = cassette.sandboxed(os.path.join(SCRIPT_DIR, "ai_failed.flag"))
         with open(flag_path, "w") as f:
             f.write("FAILURE")
         log_diag(f"[ALERT] Failure flag created at {flag_path}")
@@ -1713,6 +2239,14 @@ def get_next_event_dates():
     return final_events
 
 def update_signal(force_news=False):
+    """Runs one engine cycle. AI metrics are merged into the rolling store after every run, failed
+    ones included, so in-process callers such as scheduler.py persist them too."""
+    try:
+        return _run_signal_update(force_news)
+    finally:
+        ai_metrics.save()
+
+def _run_signal_update(force_news):
     print(f"Running OmniMetric v2.0 Engine (Force News: {force_news})...")
     
     # 1. Execution Control: 10-Minute Cool-down (DISABLED FOR DEBUG)
@@ -1738,24 +2272,28 @@ def update_signal(force_news=False):
     log_diag(f"[GUARD] Market data acquisition: {status}")
     
     if market_data:
+        previous_data = None
+        try:
+            if os.path.exists(DATA_FILE):
+                with open(DATA_FILE, 'r', encoding='utf-8') as f:
+                    previous_data = json.load(f)
+        except Exception as e:
+            log_diag(f"[WARN] Could not load previous data for anomaly detection: {e}")
+
+        # Validate and screen provider prints before they reach scoring and the frontend
+        previous_market_data = (previous_data or {}).get("market_data")
+        quality_reports = [validate_market_data(market_data, previous_market_data, stage="fetch")]
+        screen_market_data(market_data, previous_market_data)
+
         # CALCULATE SCORES
-        sector_scores = {}
-        for sector in SECTORS.keys():
-            score = calculate_sector_score(sector, market_data)
-            sector_scores[sector] = score
+        sector_scores = sector_scorer.score(market_data)
+        for sector, score in sector_scores.items():
             log_diag(f"[OUT] CALC_SCORE: {{ sector: {sector}, score: {score} }}")
             
-        # Calculate GMS Score with history for dynamic thresholds
-        history_data = None
-        try:
-            history_file = os.path.join(os.path.dirname(__file__), "history.json")
-            if os.path.exists(history_file):
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    history_data = json.load(f)
-        except Exception as e:
-            log_diag(f"[WARN] Could not load history for dynamic thresholds: {e}")
-        
-        score = calculate_total_gms(market_data, sector_scores, history_data)
+        # Calculate GMS Score with the Net Liquidity percentile index (ranked before today's reading is added)
+        liquidity_index = load_liquidity_index()
+        score = calculate_total_gms(market_data, sector_scores, liquidity_index)
+        record_liquidity_observation(liquidity_index, market_data)
         
         # Validate range
         score = validate_range(score, "GMS_SCORE")
@@ -1763,14 +2301,6 @@ def update_signal(force_news=False):
             score = 50  # Neutral fallback
         
         # Anomaly detection
-        previous_data = None # Placeholder for previous data, assuming it's loaded elsewhere or needs to be loaded here
-        try:
-            if os.path.exists(DATA_FILE):
-                with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                    previous_data = json.load(f)
-        except Exception as e:
-            log_diag(f"[WARN] Could not load previous data for anomaly detection: {e}")
-
         if previous_data and 'gms_score' in previous_data: # Assuming 'gms_score' is the key for the total GMS score
             detect_anomaly(score, previous_data['gms_score'], "GMS_SCORE", threshold_percent=30)
         
@@ -1792,8 +2322,10 @@ def update_signal(force_news=False):
         except (FileNotFoundError, IOError) as e:
             log_diag(f"[FILE_ERROR] Failed to load history: {e}")
 
-        # Trend Analysis
-        trend_context = calculate_trend_context(history, score)
+        # Trend Analysis (current score enters the multi-resolution store first; saved with history)
+        score_series = load_score_series(history)
+        score_series.append(datetime.now(timezone.utc), score)
+        trend_context = calculate_trend_context(history, score, score_series)
         log_diag(f"[AI CONTEXT] Trend: {trend_context['vector']} | {trend_context['narrative']}")
 
         # AI Analysis (Pass context)
@@ -1850,6 +2382,7 @@ def update_signal(force_news=False):
                 json.dump(history, f, indent=4)
         except (IOError, OSError) as e:
             log_diag(f"[ERROR] Failed to save history file: {e}")
+        score_series.save()
 
         # Format for Frontend Chart
         # Expected format: [{"date": "HH:MM", "score": 75}, ...]
@@ -1859,6 +2392,10 @@ def update_signal(force_news=False):
                 fmt_date = h["timestamp"]
                 history_chart.append({"date": fmt_date, "score": h["score"]})
 
+        # Final schema gate on what is about to be published
+        quality_reports.append(validate_market_data(market_data, previous_market_data, stage="publish"))
+        save_data_quality_report(quality_reports)
+
         # Prepare Payload
         payload = {
             "last_updated": datetime.now(timezone.utc).isoformat(),
@@ -1930,6 +2467,11 @@ def update_signal(force_news=False):
             if len(history) >= 2:
                 prev_score = history[-2]["score"]
 
+            # Cassette runs are benchmarks: no search-engine pings, no archive summary rewrite
+            if cassette.mode:
+                log_diag("[AIO] Cassette run: skipping IndexNow and Performance Audit")
+                return payload
+
             # 1. SEO IndexNow Acceleration
             try:
                 seo = SEOMonitor(log_callback=print)
@@ -2009,13 +2551,15 @@ def update_signal(force_news=False):
 if __name__ == "__main__":
     try:
         # 1. Cleanup old flags
-        flag_path = os.path.join(SCRIPT_DIR, "ai_failed.flag")
+        flag_path = cassette.sandboxed(os.path.join(SCRIPT_DIR, "ai_failed.flag"))
         if os.path.exists(flag_path):
             os.remove(flag_path)
 
         print(f"--- [START] Engine Run at {datetime.now(timezone.utc).isoformat()} ---")
         result = update_signal(force_news=True)
         print(f"--- [FINISH] Engine Run SUCCESS (Score: {result.get('gms_score', 'N/A')}) ---")
+        if cassette.mode:
+            log_diag(cassette.summary())
     except Exception as e:
         print(f"--- [FATAL ERROR] ---")
         print(f"Type: {type(e).__name__}")
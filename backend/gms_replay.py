@@ -0,0 +1,331 @@
+"""
+GMS Replay / Backtest Engine
+
+Re-scores archived history under alternative weight configurations:
+- Loads every archive/YYYY-MM-DD.json snapshot and archive/summary.json into one
+  date-indexed table (summary-only days contribute their VIX / HY spread readings)
+- Recomputes sector scores and the composite GMS for any weight set in a single
+  vectorized pass (see utils.sector_scoring)
+- Fans parameter sweeps out across a process pool, each worker scoring a whole
+  chunk of configurations as one weight stack
+- Optionally applies the Net Liquidity percentile adjustment (LIQUIDITY_ADJUSTMENT
+  in gms_engine), ranking each day's reading against the days before it
+
+A weight configuration looks like:
+    {"name": "stocks_heavy",
+     "gms": {"LEGACY": 0.2, "STOCKS": 0.35, ...},        # optional, default GMS_WEIGHTS
+     "sectors": {"STOCKS": {"VIX": 0.3, "SPY": 0.2}},    # optional per-sector overrides
+     "liquidity_adjustment": true}                       # optional, default as the sweep
+
+Usage:
+    python backend/gms_replay.py                          # replay live weights
+    python backend/gms_replay.py --sweep sweep.json --workers 4
+    python backend/gms_replay.py --liquidity-adjustment   # include the Net Liquidity term
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.percentile_index import PercentileIndex
+from utils.sector_scoring import SectorScorer, SnapshotArrays
+
+# CONFIGURATION
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.join(SCRIPT_DIR, "archive")
+SUMMARY_FILE = os.path.join(ARCHIVE_DIR, "summary.json")
+
+ARCHIVE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}\.json$')
+
+# Legacy block defaults (same as calculate_total_gms)
+DEFAULT_VIX = 20.0
+DEFAULT_HY = 3.5
+# Net Liquidity adjustment (same as LIQUIDITY_MIN_SAMPLES in gms_engine)
+LIQUIDITY_MIN_SAMPLES = 30
+
+
+class ReplayTable(NamedTuple):
+    """Columnar replay input: one row per date."""
+    frame: pd.DataFrame       # date index; live gms_score, vix, hy_spread, spy_price, net_liquidity, source
+    arrays: SnapshotArrays    # packed sector inputs aligned with frame rows
+
+
+def _price(market_data: Mapping[str, Any], key: str) -> Optional[float]:
+    value = (market_data.get(key) or {}).get("price")
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def load_table(scorer: SectorScorer, archive_dir: str = ARCHIVE_DIR, summary_file: Optional[str] = None) -> ReplayTable:
+    """
+    Load archived snapshots and the summary into a ReplayTable.
+
+    Args:
+        scorer: Compiled sector configuration (defines the indicator columns)
+        archive_dir: Directory of YYYY-MM-DD.json snapshots
+        summary_file: summary.json path (default: <archive_dir>/summary.json)
+
+    Returns:
+        ReplayTable sorted by date; archive snapshots win over summary rows
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    snapshots: Dict[str, Mapping[str, Any]] = {}
+
+    summary_file = summary_file or os.path.join(archive_dir, "summary.json")
+    if os.path.exists(summary_file):
+        with open(summary_file, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                rows[item["date"]] = {
+                    "gms_score": item.get("gms_score"),
+                    "vix": item.get("vix_price"),
+                    "hy_spread": item.get("hy_spread", item.get("hy_spread_price")),
+                    "spy_price": item.get("spy_price"),
+                    "net_liquidity": item.get("net_liquidity"),
+                    "source": "summary"
+                }
+
+    if os.path.exists(archive_dir):
+        for name in sorted(os.listdir(archive_dir)):
+            if not ARCHIVE_PATTERN.match(name):
+                continue
+            try:
+                with open(os.path.join(archive_dir, name), 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (json.JSONDecodeError, IOError, OSError) as e:
+                print(f"[REPLAY] [WARN] Skipping unreadable {name}: {e}")
+                continue
+            market_data = snapshot.get("market_data") or {}
+            date = name[:-5]
+            snapshots[date] = market_data
+            rows[date] = {
+                "gms_score": snapshot.get("gms_score"),
+                "vix": _price(market_data, "VIX"),
+                "hy_spread": _price(market_data, "HY_SPREAD"),
+                "spy_price": _price(market_data, "SPY"),
+                "net_liquidity": _price(market_data, "NET_LIQUIDITY"),
+                "source": "archive"
+            }
+
+    dates = sorted(rows)
+    frame = pd.DataFrame([rows[d] for d in dates], index=pd.to_datetime(dates),
+                         columns=["gms_score", "vix", "hy_spread", "spy_price", "net_liquidity", "source"])
+    for col in ("gms_score", "vix", "hy_spread", "spy_price", "net_liquidity"):
+        frame[col] = pd.to_numeric(frame[col], errors='coerce')
+    arrays = scorer.pack([snapshots.get(d, {}) for d in dates])
+    return ReplayTable(frame, arrays)
+
+
+def legacy_scores(vix: np.ndarray, hy: np.ndarray) -> np.ndarray:
+    """Vectorized legacy VIX / HY spread block of calculate_total_gms."""
+    vix = np.where(np.isfinite(vix), vix, DEFAULT_VIX)
+    hy = np.where(np.isfinite(hy), hy, DEFAULT_HY)
+    score = 50 + (20 - vix) * 1.5
+    score = score + np.where(hy > 5.0, -20.0, np.where(hy < 3.5, 10.0, 0.0))
+    return np.clip(score, 0, 100)
+
+
+def liquidity_adjustments(net_liquidity: np.ndarray, vix: np.ndarray,
+                          min_samples: int = LIQUIDITY_MIN_SAMPLES) -> np.ndarray:
+    """
+    Net Liquidity block of calculate_total_gms for every row.
+
+    Each reading is ranked against the earlier rows' readings (as the live index ranks
+    today's value before recording it); rows with fewer than min_samples earlier readings
+    or no reading get no adjustment.
+
+    Args:
+        net_liquidity: (N,) readings in date order (NaN = missing)
+        vix: (N,) VIX prices (NaN = default 20)
+
+    Returns:
+        (N,) additive adjustments
+    """
+    vix = np.where(np.isfinite(vix), vix, DEFAULT_VIX)
+    index = PercentileIndex(log_callback=lambda msg: None)
+    adj = np.zeros(len(net_liquidity))
+    for i, value in enumerate(net_liquidity):
+        if not np.isfinite(value):
+            continue
+        if len(index) >= min_samples:
+            adj[i] = ((index.percentile(value) - 50) / 10.0) * (vix[i] / 20.0)
+        index.add(str(i), value)
+    return adj
+
+
+def compose_gms(legacy: np.ndarray, sector_scores: np.ndarray, sector_names: Sequence[str],
+                gms_weights: Mapping[str, float], liquidity_adj: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Combine legacy and sector scores into the 0-100 GMS.
+
+    Sectors are accumulated in gms_weights order, exactly like calculate_total_gms,
+    so replaying live weights reproduces live scores bit for bit. That holds with
+    LIQUIDITY_ADJUSTMENT off (the default); with it on, pass liquidity_adjustments().
+
+    Args:
+        legacy: (N,) legacy block scores
+        sector_scores: (..., N, S) sector scores
+        sector_names: Sector order of the last axis
+        gms_weights: {"LEGACY": w, sector: w, ...}
+        liquidity_adj: Optional (N,) Net Liquidity adjustments added before clipping
+    """
+    index = {name: i for i, name in enumerate(sector_names)}
+    final = legacy * gms_weights.get("LEGACY", 0.0)
+    for sector, weight in gms_weights.items():
+        if sector == "LEGACY":
+            continue
+        column = sector_scores[..., index[sector]] if sector in index else 50
+        final = final + column * weight
+    if liquidity_adj is not None:
+        final = final + liquidity_adj
+    return np.floor(np.clip(final, 0, 100)).astype(int)
+
+
+def _liquidity_adj(table: ReplayTable, enabled: bool) -> Optional[np.ndarray]:
+    if not enabled:
+        return None
+    return liquidity_adjustments(table.frame["net_liquidity"].to_numpy(float), table.frame["vix"].to_numpy(float))
+
+
+def replay(table: ReplayTable, scorer: SectorScorer, gms_weights: Mapping[str, float],
+           sector_weights: Optional[Mapping[str, Mapping[str, float]]] = None,
+           liquidity_adjustment: bool = False) -> pd.DataFrame:
+    """
+    Re-score history under one weight configuration.
+
+    Set liquidity_adjustment to mirror a live engine running with LIQUIDITY_ADJUSTMENT=1.
+
+    Returns:
+        DataFrame (date index) with one column per sector, 'gms' and the live 'gms_live'
+    """
+    scores = scorer.score_arrays(table.arrays, scorer.weight_matrix(sector_weights))
+    legacy = legacy_scores(table.frame["vix"].to_numpy(float), table.frame["hy_spread"].to_numpy(float))
+    out = pd.DataFrame(scores, index=table.frame.index, columns=scorer.sector_names)
+    out["gms"] = compose_gms(legacy, scores, scorer.sector_names, gms_weights, _liquidity_adj(table, liquidity_adjustment))
+    out["gms_live"] = table.frame["gms_score"]
+    return out
+
+
+def evaluate(gms: np.ndarray, live: np.ndarray, spy: np.ndarray) -> Dict[str, Optional[float]]:
+    """Summary metrics of one replayed GMS series."""
+    fwd = np.full(len(spy), np.nan)
+    fwd[:-1] = spy[1:] / spy[:-1] - 1
+    metrics: Dict[str, Optional[float]] = {
+        "mean": round(float(gms.mean()), 2),
+        "std": round(float(gms.std()), 2),
+        "pct_defensive": round(float((gms < 40).mean() * 100), 1),
+        "pct_accumulate": round(float((gms > 60).mean() * 100), 1),
+        "corr_live": None,
+        "mean_abs_diff_live": None,
+        "corr_fwd_spy": None
+    }
+    ok = np.isfinite(live)
+    if ok.sum() >= 3 and gms[ok].std() > 0 and live[ok].std() > 0:
+        metrics["corr_live"] = round(float(np.corrcoef(gms[ok], live[ok])[0, 1]), 3)
+    if ok.any():
+        metrics["mean_abs_diff_live"] = round(float(np.abs(gms[ok] - live[ok]).mean()), 2)
+    ok = np.isfinite(fwd)
+    if ok.sum() >= 3 and gms[ok].std() > 0 and fwd[ok].std() > 0:
+        metrics["corr_fwd_spy"] = round(float(np.corrcoef(gms[ok], fwd[ok])[0, 1]), 3)
+    return metrics
+
+
+# ---------- process-pool sweeps ----------
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(table: ReplayTable, scorer: SectorScorer, default_gms: Mapping[str, float],
+                 liquidity_adjustment: bool = False):
+    _worker.update(table=table, scorer=scorer, default_gms=default_gms, liquidity_adjustment=liquidity_adjustment)
+
+
+def _score_chunk(configs: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Score a chunk of configurations as one (P, S, K) weight stack."""
+    table, scorer, default_gms = _worker["table"], _worker["scorer"], _worker["default_gms"]
+    stack = np.stack([scorer.weight_matrix(c.get("sectors")) for c in configs])
+    scores = scorer.score_arrays(table.arrays, stack)  # (P, N, S)
+    legacy = legacy_scores(table.frame["vix"].to_numpy(float), table.frame["hy_spread"].to_numpy(float))
+    live = table.frame["gms_score"].to_numpy(float)
+    spy = table.frame["spy_price"].to_numpy(float)
+    liq = {flag: _liquidity_adj(table, flag) for flag in (False, True)
+           if any(c.get("liquidity_adjustment", _worker["liquidity_adjustment"]) == flag for c in configs)}
+
+    results = []
+    for p, config in enumerate(configs):
+        liquidity_adj = liq[config.get("liquidity_adjustment", _worker["liquidity_adjustment"])]
+        gms = compose_gms(legacy, scores[p], scorer.sector_names, config.get("gms") or default_gms, liquidity_adj)
+        results.append({"name": config.get("name", f"config_{p}"), **evaluate(gms, live, spy)})
+    return results
+
+
+def sweep(table: ReplayTable, scorer: SectorScorer, configs: Sequence[Mapping[str, Any]],
+          default_gms: Mapping[str, float], workers: Optional[int] = None, chunk_size: int = 64,
+          liquidity_adjustment: bool = False) -> pd.DataFrame:
+    """
+    Evaluate many weight configurations in parallel.
+
+    Args:
+        table: Loaded history
+        scorer: Compiled sector configuration
+        configs: Weight configurations (see module docstring)
+        default_gms: Composite weights for configs without a "gms" entry
+        workers: Process count (1 runs inline; default: CPU count)
+        chunk_size: Configurations per task (scored together as one weight stack)
+        liquidity_adjustment: Default for configs without a "liquidity_adjustment" entry
+
+    Returns:
+        DataFrame of metrics, one row per configuration, in input order
+    """
+    configs = list(configs)
+    chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        _init_worker(table, scorer, default_gms, liquidity_adjustment)
+        results = [r for chunk in chunks for r in _score_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(table, scorer, default_gms, liquidity_adjustment)) as pool:
+            results = [r for chunk_results in pool.map(_score_chunk, chunks) for r in chunk_results]
+    return pd.DataFrame(results).set_index("name")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay archived GMS history under alternative weights")
+    parser.add_argument("--config", help="JSON file with one weight configuration")
+    parser.add_argument("--sweep", help="JSON file with a list of weight configurations")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--liquidity-adjustment", action="store_true",
+                        help="Apply the Net Liquidity term (default: as LIQUIDITY_ADJUSTMENT in the engine)")
+    args = parser.parse_args()
+
+    from gms_engine import SECTORS, GMS_WEIGHTS, LIQUIDITY_ADJUSTMENT
+    liquidity_adjustment = args.liquidity_adjustment or LIQUIDITY_ADJUSTMENT
+
+    scorer = SectorScorer(SECTORS)
+    table = load_table(scorer)
+    print(f"[REPLAY] Loaded {len(table.frame)} days ({(table.frame['source'] == 'archive').sum()} full snapshots)")
+
+    if args.sweep:
+        with open(args.sweep, 'r', encoding='utf-8') as f:
+            configs = json.load(f)
+        print(sweep(table, scorer, configs, GMS_WEIGHTS, workers=args.workers,
+                    liquidity_adjustment=liquidity_adjustment).to_string())
+        return
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    result = replay(table, scorer, config.get("gms") or GMS_WEIGHTS, config.get("sectors"),
+                    config.get("liquidity_adjustment", liquidity_adjustment))
+    print(result[["gms", "gms_live"] + scorer.sector_names].to_string())
+    print(json.dumps(evaluate(result["gms"].to_numpy(), result["gms_live"].to_numpy(float),
+                              table.frame["spy_price"].to_numpy(float)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
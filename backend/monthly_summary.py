@@ -2,20 +2,22 @@ import os
 import json
 import sys
 import time
-import subprocess
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
+from utils.node_bridge import BridgeError, get_bridge
+from utils.ai_governor import PRIORITY_NEWS, BudgetExceeded, estimate_tokens, get_governor
+from utils.cassette import get_cassette
 
 # Path Configuration
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ARCHIVE_DIR = os.path.join(SCRIPT_DIR, "archive")
-FRONTEND_DATA_DIR = os.path.join(SCRIPT_DIR, "../frontend/public/data")
+# Outputs are redirected into the cassette sandbox during record/replay (daily archives are still read from ARCHIVE_DIR)
+SUMMARY_ARCHIVE_DIR = get_cassette().sandboxed(ARCHIVE_DIR)
+FRONTEND_DATA_DIR = get_cassette().sandboxed(os.path.join(SCRIPT_DIR, "../frontend/public/data"))
 FRONTEND_ARCHIVE_DIR = os.path.join(FRONTEND_DATA_DIR, "archive")
-FRONTEND_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "frontend")
-BRIDGE_SCRIPT = os.path.join(FRONTEND_DIR, "scripts", "generate_insight.ts")
 
 # Ensure directories exist
-os.makedirs(ARCHIVE_DIR, exist_ok=True)
+os.makedirs(SUMMARY_ARCHIVE_DIR, exist_ok=True)
 os.makedirs(FRONTEND_ARCHIVE_DIR, exist_ok=True)
 
 load_dotenv()
@@ -90,42 +92,28 @@ Output JSON format (Keep consistent across languages):
   "HI": "...", "ID": "...", "AR": "...", "DE": "...", "FR": "..."
 }}
 """
-    # AI Generation (Using Bridge)
-    import shutil
-    if not shutil.which("npx"):
+    # AI Generation (Using the shared Bridge worker)
+    bridge = get_bridge()
+    if bridge is None:
         print("[ERROR] npx not found. Skipping Bridge.")
         return None
 
     try:
-        cmd = ["npx", "tsx", BRIDGE_SCRIPT]
-        print(f"[AI BRIDGE] Executing: {' '.join(cmd)}")
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            shell=(os.name == 'nt'),
-            cwd=FRONTEND_DIR
-        )
-        stdout, stderr = process.communicate(input=prompt, timeout=180)
-        
-        if process.returncode == 0:
-            json_start = stdout.find('{')
-            json_end = stdout.rfind('}') + 1
-            if json_start != -1 and json_end > json_start:
-                final_json = stdout[json_start:json_end]
-                wrapper = json.loads(final_json)
-                if "text" in wrapper:
-                    inner_text = wrapper["text"]
-                    if "```json" in inner_text:
-                        inner_text = inner_text.split("```json")[1].split("```")[0].strip()
-                    elif "```" in inner_text:
-                        inner_text = inner_text.split("```")[1].split("```")[0].strip()
-                    return json.loads(inner_text)
-        else:
-            print(f"[AI ERROR] Bridge failed: {stderr}")
+        print("[AI BRIDGE] Sending monthly summary prompt to bridge worker")
+        lease = get_governor().acquire("monthly_summary", PRIORITY_NEWS, tokens=estimate_tokens(prompt) + 6000, timeout=600)
+        # The worker may try several models for one prompt; charge every call it sent
+        bridge_usage = {}
+        try:
+            inner_text = bridge.request(prompt, timeout=180, usage=bridge_usage)
+        finally:
+            lease.settle(bridge_usage.get("tokens"), requests=bridge_usage.get("calls", 1))
+        if "```json" in inner_text:
+            inner_text = inner_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in inner_text:
+            inner_text = inner_text.split("```")[1].split("```")[0].strip()
+        return json.loads(inner_text)
+    except (BridgeError, BudgetExceeded) as e:
+        print(f"[AI ERROR] Bridge failed: {e}")
     except Exception as e:
         print(f"[AI EXCEPTION] {e}")
     
@@ -148,7 +136,7 @@ def main():
     month_key = start_date.strftime("%Y-%m")
     
     filename = f"summary_{month_key}.json"
-    archive_path = os.path.join(ARCHIVE_DIR, filename)
+    archive_path = os.path.join(SUMMARY_ARCHIVE_DIR, filename)
     frontend_path = os.path.join(FRONTEND_ARCHIVE_DIR, filename)
     
     if os.path.exists(archive_path):
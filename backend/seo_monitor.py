@@ -1,14 +1,15 @@
 import os
 import json
-import requests
 import datetime
+from utils.http_client import get_client
+from utils.endpoints import INDEXNOW_BASE_URL
 
 class SEOMonitor:
     def __init__(self, host="omnimetric.net", log_callback=None):
         self.host = host
         self.log_callback = log_callback
         self.indexnow_key = os.getenv("INDEXNOW_KEY")
-        self.indexnow_url = "https://api.indexnow.org/indexnow"
+        self.indexnow_url = f"{INDEXNOW_BASE_URL}/indexnow"
 
     def _log(self, message):
         if self.log_callback:
@@ -57,7 +58,7 @@ class SEOMonitor:
                 "urlList": url_list
             }
             # Note: IndexNow API doesn't use the summary, but it's good to have for future logs/GSC
-            response = requests.post(self.indexnow_url, headers=headers, json=data, timeout=10)
+            response = get_client().post(self.indexnow_url, headers=headers, json=data, timeout=10)
             self._log(f"IndexNow Result: {response.status_code}")
             return response.status_code == 200
         except Exception as e:
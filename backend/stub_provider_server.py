@@ -0,0 +1,319 @@
+"""
+Local Stand-in Provider Server for GlobalMacroSignal
+
+Imitates the external endpoints the backend calls so update_signal, fetch_news
+and enhance_wiki can be load-tested without touching real services:
+- FRED series observations (XML, as consumed by fredapi)
+- alternative.me /fng/
+- Alpha Vantage ECONOMIC_CALENDAR (CSV)
+- CNBC RSS
+- IndexNow
+- Gemini generateContent / streamGenerateContent (SSE) on the direct v1 / v1beta
+  and Vercel AI Gateway paths
+
+Failure injection: per-route latency with jitter, random 5xx error rate and
+periodic 429 bursts. GET /__stats returns request counts and latency per route.
+
+Usage:
+    python backend/stub_provider_server.py --port 8765 --latency-ms 200 --error-rate 0.05 --burst-every 40
+    GMS_PROVIDER_BASE_URL=http://127.0.0.1:8765 python backend/gms_engine.py
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+LANGS = ["JP", "EN", "CN", "ES", "HI", "ID", "AR", "DE", "FR"]
+
+# Rough levels so stubbed series land in realistic ranges
+FRED_LEVELS = {
+    "VIXCLS": 16.0, "T10Y2Y": 0.4, "WALCL": 6_700_000.0, "WTREGEN": 750_000.0,
+    "RRPONTSYD": 150.0, "NFCI": -0.5, "BAMLH0A0HYM2": 3.2, "DGS10": 4.2
+}
+
+
+@dataclass
+class RouteProfile:
+    """Failure profile applied to one route."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    burst_every: int = 0     # Every N requests a 429 burst starts (0 disables)
+    burst_length: int = 3    # Consecutive 429 responses per burst
+
+
+@dataclass
+class StubConfig:
+    """Server-wide default profile plus per-route overrides."""
+    default: RouteProfile = field(default_factory=RouteProfile)
+    routes: Dict[str, RouteProfile] = field(default_factory=dict)
+    seed: Optional[int] = None
+
+    def profile(self, route: str) -> RouteProfile:
+        return self.routes.get(route, self.default)
+
+
+def _rng_for(key: str) -> random.Random:
+    return random.Random(int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16))
+
+
+# ---------- payloads ----------
+
+def fred_observations(series_id: str, observation_start: Optional[str]) -> bytes:
+    end = datetime.now(timezone.utc).date()
+    start = datetime.strptime(observation_start, "%Y-%m-%d").date() if observation_start else end - timedelta(days=90)
+    rng = _rng_for(series_id)
+    level = FRED_LEVELS.get(series_id, 100.0)
+    rows = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            level += level * rng.gauss(0, 0.01) if level else rng.gauss(0, 0.05)
+            rows.append(f'<observation realtime_start="{end}" realtime_end="{end}" date="{day}" value="{level:.4f}"/>')
+        day += timedelta(days=1)
+    xml = f'<?xml version="1.0" encoding="utf-8"?><observations count="{len(rows)}">{"".join(rows)}</observations>'
+    return xml.encode("utf-8")
+
+
+def fng_payload(limit: int) -> bytes:
+    now = int(time.time())
+    rng = _rng_for(str(now // 86400))
+    data = []
+    for i in range(limit):
+        value = rng.randint(10, 90)
+        label = "Extreme Fear" if value < 25 else "Fear" if value < 45 else "Neutral" if value < 56 else "Greed" if value < 76 else "Extreme Greed"
+        data.append({"value": str(value), "value_classification": label, "timestamp": str(now - i * 86400)})
+    return json.dumps({"name": "Fear and Greed Index", "data": data, "metadata": {"error": None}}).encode("utf-8")
+
+
+def calendar_csv() -> bytes:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=["date", "currency", "event", "impact"])
+    writer.writeheader()
+    base = datetime.now(timezone.utc).replace(hour=12, minute=30, second=0, microsecond=0)
+    events = [("USD", "CPI MoM"), ("USD", "Nonfarm Payrolls"), ("USD", "FOMC Rate Decision"),
+              ("EUR", "ECB Interest Rate Decision"), ("JPY", "BoJ Policy Rate"), ("USD", "GDP Growth Rate QoQ")]
+    for i, (currency, name) in enumerate(events):
+        writer.writerow({"date": (base + timedelta(days=i + 1)).strftime("%Y-%m-%d %H:%M:%S"),
+                         "currency": currency, "event": name, "impact": "high"})
+    return out.getvalue().encode("utf-8")
+
+
+def cnbc_rss() -> bytes:
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(10):
+        pub = (now - timedelta(minutes=15 * i)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        items.append(
+            f"<item><title>Stub headline {i + 1}: markets digest macro data</title>"
+            f"<link>https://www.cnbc.com/stub/{i + 1}.html</link>"
+            f"<description>Synthetic story {i + 1} served by the stand-in provider.</description>"
+            f"<pubDate>{pub}</pubDate></item>"
+        )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Stub</title>{"".join(items)}</channel></rss>'.encode("utf-8")
+
+
+def gemini_text() -> str:
+    text = {lang: f"[{lang}] Stub insight: liquidity stable, volatility contained, credit spreads compressed "
+                  f"and breadth improving across regions. [MARKET STATUS: ACCUMULATE]" for lang in LANGS}
+    text.update({
+        "summary": "Stub summary.", "deep_dive": "Stub deep dive.",
+        "council_debate": {k: "Stub view." for k in ("geopolitics", "macro", "quant", "technical", "policy", "tech")},
+        "forecast_risks": "Stub risks.", "gms_conclusion": "Stub conclusion."
+    })
+    return json.dumps(text, ensure_ascii=False)
+
+
+def gemini_payload() -> bytes:
+    body = {"candidates": [{"content": {"parts": [{"text": gemini_text()}], "role": "model"},
+                            "finishReason": "STOP"}]}
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def gemini_sse(chunk_chars: int = 120) -> bytes:
+    """streamGenerateContent?alt=sse body: the same text split across events."""
+    text = gemini_text()
+    events = []
+    for i in range(0, len(text), chunk_chars):
+        event = {"candidates": [{"content": {"parts": [{"text": text[i:i + chunk_chars]}], "role": "model"}}]}
+        events.append(f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n")
+    return "".join(events).encode("utf-8")
+
+
+# route name -> (method, path regex)
+ROUTES = [
+    ("fred", "GET", re.compile(r"^/fred/series/observations$")),
+    ("fng", "GET", re.compile(r"^/fng/?$")),
+    ("alpha_vantage", "GET", re.compile(r"^/query$")),
+    ("cnbc_rss", "GET", re.compile(r"^/rs/search/combinedcms/view\.xml$")),
+    ("indexnow", "POST", re.compile(r"^/indexnow$")),
+    ("gemini", "POST", re.compile(r"^(/v1/google)?/v1(beta)?/models/[^/]+:(stream)?[gG]enerateContent$")),
+]
+
+
+class StubState:
+    """Counters shared by all handler threads."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def decide(self, route: str) -> Tuple[Optional[int], float]:
+        """Return (forced status or None, delay seconds) for the next request."""
+        profile = self.config.profile(route)
+        with self.lock:
+            n = self.counts.get(route, 0)
+            self.counts[route] = n + 1
+            delay = max(0.0, profile.latency_ms + self.rng.uniform(-profile.jitter_ms, profile.jitter_ms)) / 1000.0
+            if profile.burst_every and n % profile.burst_every >= profile.burst_every - profile.burst_length:
+                return 429, delay
+            if profile.error_rate and self.rng.random() < profile.error_rate:
+                return self.rng.choice([500, 502, 503]), delay
+        return None, delay
+
+    def observe(self, route: str, status: int, duration_ms: float):
+        with self.lock:
+            s = self.stats.setdefault(route, {"requests": 0, "errors": 0, "rate_limited": 0, "total_ms": 0.0, "max_ms": 0.0})
+            s["requests"] += 1
+            s["errors"] += 1 if status >= 500 else 0
+            s["rate_limited"] += 1 if status == 429 else 0
+            s["total_ms"] += duration_ms
+            s["max_ms"] = max(s["max_ms"], duration_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            return {route: dict(s, mean_ms=round(s["total_ms"] / s["requests"], 1)) for route, s in self.stats.items()}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "GMSStub/1.0"
+    state: StubState = None  # Bound per server in make_server
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet; use /__stats instead
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _handle(self, method: str):
+        start = time.time()
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+        if method == "GET" and parts.path == "/__stats":
+            return self._send(200, json.dumps(self.state.snapshot(), indent=2).encode("utf-8"))
+
+        route = next((name for name, m, rx in ROUTES if m == method and rx.match(parts.path)), None)
+        if route is None:
+            return self._send(404, b'{"error": "unknown stub route"}')
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        forced, delay = self.state.decide(route)
+        time.sleep(delay)
+        if forced == 429:
+            status, body, ctype, headers = 429, b'{"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}', "application/json", {"Retry-After": "1"}
+        elif forced:
+            status, body, ctype, headers = forced, b'{"error": "injected failure"}', "application/json", None
+        else:
+            status, headers = 200, None
+            if route == "fred":
+                body, ctype = fred_observations(query.get("series_id", ""), query.get("observation_start")), "text/xml"
+            elif route == "fng":
+                body, ctype = fng_payload(int(query.get("limit", 1))), "application/json"
+            elif route == "alpha_vantage":
+                body, ctype = calendar_csv(), "text/csv"
+            elif route == "cnbc_rss":
+                body, ctype = cnbc_rss(), "application/rss+xml"
+            elif route == "indexnow":
+                status, body, ctype = 202, b"", "text/plain"
+            elif parts.path.endswith(":streamGenerateContent"):
+                body, ctype = gemini_sse(), "text/event-stream"
+            else:
+                body, ctype = gemini_payload(), "application/json"
+        self._send(status, body, ctype, headers)
+        self.state.observe(route, status, (time.time() - start) * 1000)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+def make_server(config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """
+    Build (but do not start) a stand-in server.
+
+    Args:
+        config: Failure profile (default: no latency, no errors)
+        host: Bind address
+        port: Bind port (0 picks a free port)
+
+    Returns:
+        ThreadingHTTPServer; call serve_forever() (e.g. in a thread) and shutdown()
+    """
+    handler = type("BoundStubHandler", (StubHandler,), {"state": StubState(config or StubConfig())})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def load_config(args) -> StubConfig:
+    default = RouteProfile(args.latency_ms, args.jitter_ms, args.error_rate, args.burst_every, args.burst_length)
+    routes = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            for route, overrides in json.load(f).items():
+                routes[route] = replace(default, **overrides)
+    return StubConfig(default=default, routes=routes, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for GMS external providers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around the base latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected 5xx")
+    parser.add_argument("--burst-every", type=int, default=0, help="Start a 429 burst every N requests per route")
+    parser.add_argument("--burst-length", type=int, default=3, help="Consecutive 429s per burst")
+    parser.add_argument("--config", help='JSON per-route overrides, e.g. {"gemini": {"latency_ms": 4000}}')
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible failure patterns")
+    args = parser.parse_args()
+
+    server = make_server(load_config(args), args.host, args.port)
+    print(f"[STUB] Serving providers on http://{args.host}:{server.server_address[1]} (stats: /__stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
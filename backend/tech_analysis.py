@@ -1,11 +1,10 @@
-
-import yfinance as yf
 import pandas as pd
 import pandas_ta as ta
 import json
 import os
 import numpy as np
 from datetime import datetime, timedelta
+from utils.price_store import PriceStore
 
 # Configuration
 SYMBOLS = {
@@ -31,6 +30,10 @@ LIMITS = {
     "Monthly": timedelta(days=730 * 5)
 }
 
+# Shared incremental OHLCV store (also used by gms_engine / update_ogv_beacons)
+# Downloads keep threads disabled to avoid issues in CI (as the direct yf.download calls did)
+price_store = PriceStore(download_options={"threads": False})
+
 OUTPUT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend", "public", "data", "market_analysis.json")
 
 class MarketDataEncoder(json.JSONEncoder):
@@ -62,9 +65,9 @@ def fetch_and_process(symbol_code, interval_name):
         period = "2y" 
 
     try:
-        # Fetch data - disable threads to avoid issues in CI
-        print(f"  Downloading {symbol_code} ({yf_interval}) for period {period}...")
-        df = yf.download(symbol_code, interval=yf_interval, period=period, progress=False, auto_adjust=True, threads=False)
+        # Read through the shared store (only bars newer than the stored ones are downloaded)
+        print(f"  Loading {symbol_code} ({yf_interval}) for period {period}...")
+        df = price_store.history([symbol_code], period=period, interval=yf_interval).get(symbol_code, pd.DataFrame())
         
         if df.empty:
             print(f"  Warning: No data returned for {symbol_code} {interval_name}")
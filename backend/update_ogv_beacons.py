@@ -1,10 +1,10 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import json
 import os
 import time
 from datetime import datetime, timedelta, timezone
+from utils.price_store import PriceStore
 
 # ==========================================
 # CONFIGURATION
@@ -68,13 +68,8 @@ def fetch_data():
     print(f"[FETCH] Starting batch download for {len(all_tickers)} tickers...")
     
     # Fetch 250 days to ensure enough context for Z-Score and 60-day trails
-    data = yf.download(all_tickers, period="1y", interval="1d", progress=False)
-    
-    if isinstance(data.columns, pd.MultiIndex):
-        try:
-            data = data['Adj Close']
-        except KeyError:
-            data = data['Close']
+    # Shared store: only bars newer than the stored history are downloaded (adjusted closes)
+    data = PriceStore().closes(all_tickers, period="1y", interval="1d")
             
     return data
 
@@ -0,0 +1,339 @@
+"""
+AI Budget Governor for GlobalMacroSignal
+
+Shares one Gemini quota between every process on the machine (engine, news
+translation, monthly summary, wiki generation):
+- Requests and tokens per minute are tracked in a small SQLite ledger
+  (BEGIN IMMEDIATE serializes concurrent processes and threads)
+- Callers reserve an estimated token count and settle it with the response's
+  usageMetadata once the call returns (plus any extra model calls the request made)
+- Priority scheduling: a caller waits while any higher-priority caller is
+  queued, and lower priorities may only use a share of the per-minute budget,
+  so the engine always preempts bulk wiki generation
+- A 429 sets a cooldown on the route that returned it (e.g. 'gateway:<model>'),
+  for the caller's priority and every lower one: alternate routes stay usable
+  and a rate-limited bulk job backs off without holding up the engine
+- Fails open: if the ledger is unusable the call proceeds ungoverned
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from .cassette import get_cassette
+
+# Lower value = higher priority
+PRIORITY_ENGINE = 0      # Hourly signal report (deadline-bound)
+PRIORITY_NEWS = 1        # News translation / monthly summary
+PRIORITY_BULK = 2        # Wiki generation and other backfills
+
+# Fraction of the per-minute budget each priority may consume
+DEFAULT_SHARES = {PRIORITY_ENGINE: 1.0, PRIORITY_NEWS: 0.8, PRIORITY_BULK: 0.5}
+
+# Longest single sleep while queued (keeps the heartbeat fresh and notices new arrivals)
+MAX_POLL_SECONDS = 1.0
+
+
+class BudgetExceeded(TimeoutError):
+    """No slot was granted before the timeout, or the wait was cancelled."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate for reservations (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def usage_tokens(usage_metadata: Optional[Mapping[str, Any]]) -> Optional[int]:
+    """Total tokens from a Gemini usageMetadata block (None when absent)."""
+    if not usage_metadata:
+        return None
+    total = usage_metadata.get("totalTokenCount")
+    if total is None:
+        total = (usage_metadata.get("promptTokenCount") or 0) + (usage_metadata.get("candidatesTokenCount") or 0)
+    return int(total) if total else None
+
+
+class Lease:
+    """Granted slot; settle() replaces the reserved token estimate with actual usage."""
+
+    def __init__(self, governor: Optional["AIGovernor"], row_id: Optional[int], tokens: int):
+        self.governor = governor
+        self.row_id = row_id
+        self.tokens = tokens
+
+    def settle(self, tokens: Optional[int], requests: int = 1):
+        """
+        Record actual usage.
+
+        Args:
+            tokens: Tokens used (None keeps the estimate)
+            requests: Model calls actually sent; calls beyond the granted one are added to the ledger
+        """
+        if self.governor is None or self.row_id is None or (tokens is None and requests <= 1):
+            return
+        if tokens is not None:
+            self.tokens = tokens
+        self.governor._settle(self.row_id, self.tokens, max(0, requests - 1))
+
+
+class AIGovernor:
+    """Cross-process requests/tokens-per-minute governor with priority scheduling."""
+
+    def __init__(self, db_path: str, rpm_limit: int = 15, tpm_limit: int = 1_000_000,
+                 shares: Optional[Mapping[int, float]] = None, window_seconds: float = 60.0,
+                 stale_seconds: float = 30.0, log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize governor.
+
+        Args:
+            db_path: SQLite file shared by all processes
+            rpm_limit: Requests per window across all callers
+            tpm_limit: Tokens per window across all callers
+            shares: Fraction of both limits usable per priority (default: DEFAULT_SHARES)
+            window_seconds: Length of the rate window
+            stale_seconds: Queued callers without a heartbeat this long are dropped (crashed processes)
+            log_callback: Optional logging function (default: print)
+        """
+        self.db_path = db_path
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.shares = dict(DEFAULT_SHARES if shares is None else shares)
+        self.window_seconds = window_seconds
+        self.stale_seconds = stale_seconds
+        self.log_callback = log_callback
+        self._disabled = False
+        try:
+            self._init_schema()
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _disable(self, error: Exception):
+        if not self._disabled:
+            self._log(f"[AI_GOVERNOR] [WARN] Ledger unavailable, calls proceed ungoverned: {error}")
+        self._disabled = True
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def _init_schema(self):
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        db = self._connect()
+        try:
+            db.execute("CREATE TABLE IF NOT EXISTS ledger (id INTEGER PRIMARY KEY, ts REAL, tokens INTEGER, priority INTEGER, caller TEXT)")
+            db.execute("CREATE TABLE IF NOT EXISTS waiters (id INTEGER PRIMARY KEY, priority INTEGER, caller TEXT, heartbeat REAL)")
+            # scope '' = every route
+            db.execute("CREATE TABLE IF NOT EXISTS route_cooldowns (scope TEXT, priority INTEGER, until REAL, "
+                       "PRIMARY KEY (scope, priority))")
+        finally:
+            db.close()
+
+    def _blocked_for(self, db: sqlite3.Connection, waiter_id: int, priority: int, tokens: int,
+                     now: float, scope: str = "") -> Tuple[float, Optional[str]]:
+        """Seconds to wait before retrying (0 = grant now) and the reason."""
+        # Only cooldowns on this route (or on every route) raised at the same or a more urgent
+        # priority hold this caller back; a less urgent caller's 429 never does
+        until = db.execute("SELECT MAX(until) FROM route_cooldowns WHERE priority <= ? AND scope IN ('', ?)",
+                           (priority, scope)).fetchone()[0]
+        if until is not None and until > now:
+            return until - now, "rate-limit cooldown"
+
+        ahead = db.execute(
+            "SELECT COUNT(*) FROM waiters WHERE id != ? AND (priority < ? OR (priority = ? AND id < ?))",
+            (waiter_id, priority, priority, waiter_id)
+        ).fetchone()[0]
+        if ahead:
+            return 0.25, f"{ahead} caller(s) ahead"
+
+        share = self.shares.get(priority, 1.0)
+        rpm_cap = max(1, int(self.rpm_limit * share))
+        tpm_cap = self.tpm_limit * share
+        count, used, oldest = db.execute("SELECT COUNT(*), COALESCE(SUM(tokens), 0), MIN(ts) FROM ledger").fetchone()
+        # An oversized request is still granted once the window is empty
+        if count >= rpm_cap or (count and used + tokens > tpm_cap):
+            reason = f"{count}/{rpm_cap} requests" if count >= rpm_cap else f"{used + tokens}/{int(tpm_cap)} tokens"
+            return max(0.05, oldest + self.window_seconds - now), reason
+        return 0.0, None
+
+    def acquire(self, caller: str, priority: int = PRIORITY_BULK, tokens: int = 0,
+                timeout: Optional[float] = None, cancel: Optional[threading.Event] = None,
+                scope: Optional[str] = None) -> Lease:
+        """
+        Wait for a slot in the shared budget.
+
+        Args:
+            caller: Label for logs and the ledger
+            priority: PRIORITY_ENGINE / PRIORITY_NEWS / PRIORITY_BULK
+            tokens: Estimated tokens to reserve (settle the actual count on the lease)
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            cancel: Optional event that abandons the wait when set
+            scope: Route the call goes to (e.g. 'direct:gemini-2.5-flash'); cooldowns on other
+                   routes are ignored (None = only cooldowns covering every route apply)
+
+        Returns:
+            Lease for the granted slot
+
+        Raises:
+            BudgetExceeded: The timeout elapsed or cancel was set before a slot was granted
+        """
+        if self._disabled:
+            return Lease(None, None, tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waiter_id = None
+        logged = False
+        db = None
+        try:
+            db = self._connect()
+            while True:
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    now = time.time()
+                    db.execute("DELETE FROM ledger WHERE ts <= ?", (now - self.window_seconds,))
+                    db.execute("DELETE FROM waiters WHERE heartbeat <= ?", (now - self.stale_seconds,))
+                    if waiter_id is None:
+                        waiter_id = db.execute("INSERT INTO waiters (priority, caller, heartbeat) VALUES (?, ?, ?)",
+                                               (priority, caller, now)).lastrowid
+                    else:
+                        db.execute("INSERT OR REPLACE INTO waiters (id, priority, caller, heartbeat) VALUES (?, ?, ?, ?)",
+                                   (waiter_id, priority, caller, now))
+                    wait, reason = self._blocked_for(db, waiter_id, priority, tokens, now, scope or "")
+                    if not wait:
+                        row_id = db.execute("INSERT INTO ledger (ts, tokens, priority, caller) VALUES (?, ?, ?, ?)",
+                                            (now, tokens, priority, caller)).lastrowid
+                        db.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+                        waiter_id = None
+                        db.execute("COMMIT")
+                        return Lease(self, row_id, tokens)
+                    db.execute("COMMIT")
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    raise
+
+                if not logged:
+                    self._log(f"[AI_GOVERNOR] {caller} (priority {priority}) queued: {reason}")
+                    logged = True
+                sleep = min(wait, MAX_POLL_SECONDS)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BudgetExceeded(f"{caller}: no slot within {timeout:.0f}s ({reason})")
+                    sleep = min(sleep, remaining)
+                if cancel is not None:
+                    if cancel.wait(sleep):
+                        raise BudgetExceeded(f"{caller}: cancelled while queued")
+                else:
+                    time.sleep(sleep)
+        except sqlite3.Error as e:
+            self._disable(e)
+            return Lease(None, None, tokens)
+        finally:
+            if db is not None:
+                if waiter_id is not None:
+                    try:
+                        db.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+                    except sqlite3.Error:
+                        pass
+                db.close()
+
+    def _settle(self, row_id: int, tokens: int, extra_requests: int = 0):
+        try:
+            db = self._connect()
+            try:
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    db.execute("UPDATE ledger SET tokens = ? WHERE id = ?", (int(tokens), row_id))
+                    if extra_requests:
+                        db.executemany("INSERT INTO ledger (ts, tokens, priority, caller) "
+                                       "SELECT ?, 0, priority, caller FROM ledger WHERE id = ?",
+                                       [(time.time(), row_id)] * extra_requests)
+                    db.execute("COMMIT")
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    raise
+            finally:
+                db.close()
+        except sqlite3.Error as e:
+            self._log(f"[AI_GOVERNOR] [WARN] Failed to settle usage: {e}")
+
+    def penalize(self, seconds: float, caller: str = "", priority: int = PRIORITY_ENGINE,
+                 scope: Optional[str] = None):
+        """
+        Start (or extend) a cooldown after a 429 so no process hammers the quota.
+
+        Args:
+            seconds: Cooldown length
+            caller: Label for logs
+            priority: Priority of the rate-limited caller; it and every less urgent
+                      priority cool down on the scope
+            scope: Route that returned the 429 (None = every route)
+        """
+        if self._disabled:
+            return
+        until = time.time() + seconds
+        try:
+            db = self._connect()
+            try:
+                db.execute("INSERT INTO route_cooldowns (scope, priority, until) VALUES (?, ?, ?) "
+                           "ON CONFLICT(scope, priority) DO UPDATE SET until = MAX(until, excluded.until)",
+                           (scope or "", priority, until))
+            finally:
+                db.close()
+            self._log(f"[AI_GOVERNOR] Rate limited{f' ({caller})' if caller else ''}; priority {priority}+ callers "
+                      f"on {scope or 'every route'} cool down for {seconds:.0f}s")
+        except sqlite3.Error as e:
+            self._log(f"[AI_GOVERNOR] [WARN] Failed to record cooldown: {e}")
+
+    def usage(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Current window: requests, tokens, queued callers and remaining cooldowns per route and priority."""
+        if self._disabled:
+            return {}
+        now = time.time() if now is None else now
+        db = self._connect()
+        try:
+            count, used = db.execute("SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM ledger WHERE ts > ?",
+                                     (now - self.window_seconds,)).fetchone()
+            waiting = dict(db.execute("SELECT priority, COUNT(*) FROM waiters WHERE heartbeat > ? GROUP BY priority",
+                                      (now - self.stale_seconds,)).fetchall())
+            raised = db.execute("SELECT scope, priority, until FROM route_cooldowns WHERE until > ?", (now,)).fetchall()
+        finally:
+            db.close()
+        cooldowns: Dict[str, Dict[int, float]] = {}
+        for scope, priority, until in raised:
+            cooldowns.setdefault(scope or "*", {})[priority] = until - now
+        return {"requests": count, "tokens": used, "waiting": waiting, "cooldowns": cooldowns,
+                "cooldown": max((until - now for _, _, until in raised), default=0.0)}
+
+
+# Process-wide governor shared by every caller
+_governor: Optional[AIGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor(log_callback: Optional[Callable[[str], None]] = None) -> AIGovernor:
+    """
+    Return the governor backed by backend/cache/ai_governor.sqlite.
+
+    Limits come from AI_RPM_LIMIT / AI_TPM_LIMIT (defaults: 15 requests, 1M tokens per minute).
+    Cassette runs use a ledger in the cassette sandbox, apart from production traffic.
+    """
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                _governor = AIGovernor(
+                    get_cassette().sandboxed(os.getenv("AI_GOVERNOR_DB", os.path.join(backend_dir, "cache", "ai_governor.sqlite"))),
+                    rpm_limit=int(os.getenv("AI_RPM_LIMIT", "15")),
+                    tpm_limit=int(os.getenv("AI_TPM_LIMIT", "1000000")),
+                    log_callback=log_callback
+                )
+    return _governor
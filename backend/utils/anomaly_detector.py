@@ -0,0 +1,137 @@
+"""
+Streaming EWMA Anomaly Detector for GlobalMacroSignal
+
+Flags implausible provider prints across every market_data indicator:
+- Exponentially weighted mean / variance kept per indicator key
+- One vectorized z-score pass per run over all keys
+- Outliers do not update the state, so one bad print cannot poison the baseline;
+  a level that persists for several runs is accepted as a genuine regime shift
+- Compact JSON state ({key: [mean, var, count, streak]}) persisted between runs
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+
+class EwmaAnomalyDetector:
+    """Per-indicator EWMA z-score detector with persisted state."""
+
+    def __init__(self, state_file: Optional[str] = None, alpha: float = 0.1, z_threshold: float = 6.0,
+                 warmup: int = 10, accept_after: int = 3, rel_std_floor: float = 0.01, abs_std_floor: float = 0.05,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize detector.
+
+        Args:
+            state_file: Optional JSON path for persistence (None keeps it in memory)
+            alpha: EWMA smoothing factor (weight of the newest observation)
+            z_threshold: |z| above which a value is flagged
+            warmup: Observations required before a key can be flagged
+            accept_after: Consecutive flags after which the new level is absorbed
+            rel_std_floor: Minimum std as a fraction of |mean| (markets often print
+                unchanged values for hours, which would collapse the variance)
+            abs_std_floor: Minimum absolute std (for indicators hovering near zero)
+            log_callback: Optional logging function (default: print)
+        """
+        self.state_file = state_file
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.accept_after = accept_after
+        self.rel_std_floor = rel_std_floor
+        self.abs_std_floor = abs_std_floor
+        self.log_callback = log_callback
+        self.keys: Dict[str, int] = {}
+        self.state = np.zeros((0, 4))  # columns: mean, var, count, streak
+        self._load()
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            self.keys = {k: i for i, k in enumerate(raw)}
+            self.state = np.array([raw[k] for k in raw], dtype=float).reshape(len(raw), 4)
+        except (json.JSONDecodeError, IOError, OSError, TypeError, ValueError) as e:
+            self._log(f"[ANOMALY] [WARN] Resetting unreadable state: {e}")
+            self.keys, self.state = {}, np.zeros((0, 4))
+
+    def save(self):
+        """Persist state atomically (no-op without a state file)."""
+        if not self.state_file:
+            return
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        temp_path = self.state_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({k: [round(float(x), 8) for x in self.state[i]] for k, i in self.keys.items()}, f)
+            os.replace(temp_path, self.state_file)
+        except (IOError, OSError) as e:
+            self._log(f"[ANOMALY] [WARN] Failed to save state: {e}")
+
+    def observe(self, values: Mapping[str, float]) -> Dict[str, Dict[str, float]]:
+        """
+        Score one run's values and update the state.
+
+        Args:
+            values: {indicator key: numeric value}; non-finite values are ignored
+
+        Returns:
+            {key: {value, mean, z}} for every flagged (and not yet accepted) key
+        """
+        items = [(k, float(v)) for k, v in values.items()
+                 if isinstance(v, (int, float)) and not isinstance(v, bool) and np.isfinite(v)]
+        if not items:
+            return {}
+
+        new_keys = [k for k, _ in items if k not in self.keys]
+        if new_keys:
+            for k in new_keys:
+                self.keys[k] = len(self.keys)
+            self.state = np.vstack([self.state, np.zeros((len(new_keys), 4))])
+
+        idx = np.array([self.keys[k] for k, _ in items])
+        x = np.array([v for _, v in items])
+        mean, var, count, streak = (self.state[idx, c] for c in range(4))
+
+        std = np.maximum(np.sqrt(var), np.maximum(self.rel_std_floor * np.abs(mean), self.abs_std_floor))
+        z = np.where(count > 0, (x - mean) / std, 0.0)
+        outlier = (count >= self.warmup) & (np.abs(z) > self.z_threshold)
+        streak = np.where(outlier, streak + 1, 0)
+        accepted = outlier & (streak >= self.accept_after)
+        flagged = outlier & ~accepted
+
+        # EWMA update for normal and accepted points; fresh keys start at their first value
+        update = ~flagged
+        diff = x - mean
+        incr = self.alpha * diff
+        new_mean = np.where(count == 0, x, mean + incr)
+        new_var = np.where(count == 0, 0.0, (1 - self.alpha) * (var + diff * incr))
+        # An accepted regime shift restarts the baseline at the new level
+        new_mean = np.where(accepted, x, new_mean)
+        new_var = np.where(accepted, 0.0, new_var)
+
+        self.state[idx, 0] = np.where(update, new_mean, mean)
+        self.state[idx, 1] = np.where(update, new_var, var)
+        self.state[idx, 2] = count + update
+        self.state[idx, 3] = np.where(accepted, 0, streak)
+
+        for i in np.flatnonzero(accepted):
+            self._log(f"[ANOMALY] {items[i][0]}: level {x[i]:g} persisted {int(streak[i])} runs, accepting as new baseline")
+
+        return {
+            items[i][0]: {"value": float(x[i]), "mean": round(float(mean[i]), 6), "z": round(float(z[i]), 2)}
+            for i in np.flatnonzero(flagged)
+        }
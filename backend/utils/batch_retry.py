@@ -0,0 +1,175 @@
+"""
+Batched Retry with Circuit Breaker for GlobalMacroSignal
+
+Re-requests every failed key (e.g., Yahoo tickers) together instead of one by one:
+- One batched call per attempt for all still-missing keys
+- Exponential backoff between attempts
+- Optional deadline: attempts and backoff sleeps never run past the remaining budget
+- Persistent circuit breaker that remembers flaky keys across runs and
+  skips them until a cooldown has passed
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class CircuitBreaker:
+    """Per-key circuit breaker persisted as JSON between runs."""
+
+    def __init__(self, state_file: str, failure_threshold: int = 3, cooldown_seconds: int = 6 * 3600,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize breaker.
+
+        Args:
+            state_file: Path to the JSON state file
+            failure_threshold: Consecutive failures before a key is skipped
+            cooldown_seconds: How long an open key is skipped before one trial retry
+            log_callback: Optional logging function (default: print)
+        """
+        self.state_file = state_file
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.log_callback = log_callback
+        self.state: Dict[str, Dict[str, Any]] = self._load()
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError, OSError) as e:
+            self._log(f"[BREAKER] [WARN] Resetting unreadable state: {e}")
+            return {}
+
+    def save(self):
+        """Persist breaker state atomically."""
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        temp_path = self.state_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(temp_path, self.state_file)
+        except (IOError, OSError) as e:
+            self._log(f"[BREAKER] [WARN] Failed to save state: {e}")
+
+    def allow(self, key: str) -> bool:
+        """Return False while a key's breaker is open (cooling down)."""
+        entry = self.state.get(key)
+        if not entry or entry.get("failures", 0) < self.failure_threshold:
+            return True
+        return time.time() - entry.get("opened_at", 0) >= self.cooldown_seconds
+
+    def open_keys(self) -> List[str]:
+        """Keys currently being skipped."""
+        return [k for k in self.state if not self.allow(k)]
+
+    def record_success(self, key: str):
+        if key in self.state:
+            del self.state[key]
+
+    def record_failure(self, key: str):
+        entry = self.state.setdefault(key, {"failures": 0})
+        entry["failures"] = entry.get("failures", 0) + 1
+        entry["last_failure"] = datetime.now(timezone.utc).isoformat()
+        if entry["failures"] >= self.failure_threshold:
+            # (Re)open: also restarts the cooldown after a failed trial retry
+            entry["opened_at"] = time.time()
+            self._log(f"[BREAKER] {key} open after {entry['failures']} consecutive failures")
+
+
+def _call_with_timeout(fetch: Callable[[List[str]], Dict[str, Any]], keys: List[str], timeout: float):
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="retry")
+    try:
+        return executor.submit(fetch, keys).result(timeout=timeout)
+    finally:
+        # Never block on an overrunning attempt; its result is discarded
+        executor.shutdown(wait=False)
+
+
+def retry_batched(fetch: Callable[[List[str]], Dict[str, Any]], keys: Iterable[str], attempts: int = 3,
+                  base_delay: float = 1.0, backoff: float = 2.0, breaker: Optional[CircuitBreaker] = None,
+                  log_callback: Optional[Callable[[str], None]] = None,
+                  sleep: Callable[[float], None] = time.sleep, deadline: Optional[float] = None,
+                  clock: Callable[[], float] = time.monotonic) -> Dict[str, Any]:
+    """
+    Retry all failed keys together with exponential backoff.
+
+    Args:
+        fetch: Batched fetch taking a list of keys and returning {key: value}
+        keys: Keys that failed the first pass
+        attempts: Maximum number of batched calls
+        base_delay: Delay before the second attempt (seconds)
+        backoff: Multiplier applied to the delay for each further attempt
+        breaker: Optional circuit breaker; open keys are skipped and outcomes recorded
+        log_callback: Optional logging function (default: print)
+        sleep: Sleep function (injectable for tests)
+        deadline: Seconds of budget for all attempts and sleeps (None = unbounded). No attempt
+            starts and no backoff is slept once it would exceed the budget, and a running
+            attempt is abandoned (left to finish in the background) when the budget runs out.
+        clock: Monotonic clock (injectable for tests)
+
+    Returns:
+        Dict of recovered keys to their values
+    """
+    log = log_callback or print
+    keys = list(dict.fromkeys(keys))
+    pending = [k for k in keys if breaker is None or breaker.allow(k)]
+    skipped = [k for k in keys if k not in pending]
+    if skipped:
+        log(f"[RETRY] Circuit open, skipping {len(skipped)} flaky keys: {', '.join(skipped)}")
+
+    end = clock() + deadline if deadline is not None else None
+    attempted: List[str] = []
+    recovered: Dict[str, Any] = {}
+    for attempt in range(attempts):
+        if not pending:
+            break
+        delay = base_delay * (backoff ** (attempt - 1)) if attempt > 0 else 0.0
+        remaining = end - clock() if end is not None else None
+        if remaining is not None and remaining <= delay:
+            log(f"[RETRY] [WARN] Budget exhausted ({max(0.0, remaining):.1f}s left), "
+                f"skipping attempt {attempt + 1}/{attempts} for {len(pending)} keys")
+            break
+        if delay:
+            log(f"[RETRY] Backing off {delay:.1f}s before attempt {attempt + 1}/{attempts}")
+            sleep(delay)
+        if not attempted:
+            attempted = list(pending)
+        try:
+            if end is None:
+                got = fetch(list(pending)) or {}
+            else:
+                got = _call_with_timeout(fetch, list(pending), max(0.0, end - clock())) or {}
+        except FutureTimeout:
+            log(f"[RETRY] [WARN] Batched attempt {attempt + 1} ran past the budget. Giving up.")
+            break
+        except Exception as e:
+            log(f"[RETRY] [WARN] Batched attempt {attempt + 1} failed: {type(e).__name__}: {e}")
+            got = {}
+        for key, value in got.items():
+            if key in pending and value is not None:
+                recovered[key] = value
+        pending = [k for k in pending if k not in recovered]
+        log(f"[RETRY] Attempt {attempt + 1}: recovered {len(recovered)}/{len(attempted)}")
+
+    if breaker is not None:
+        for key in attempted:
+            if key in recovered:
+                breaker.record_success(key)
+            else:
+                breaker.record_failure(key)
+    return recovered
@@ -0,0 +1,269 @@
+"""
+Provider Record/Replay Cassettes for GlobalMacroSignal
+
+Captures every external provider response so a full engine run can be
+replayed offline, profiled and compared between commits:
+- HTTP responses sent through the shared HttpClient (status, headers, body, latency)
+- Python-level provider calls such as yfinance batch downloads and FRED series
+- Node bridge answers (the worker subprocess itself is never started on replay)
+- Replay with optional latency simulation (scaled recorded durations)
+- Isolation from production state: while a cassette is active, every output and
+  cache path is redirected into a fresh per-process sandbox directory, so runs never
+  touch published files and always start from empty caches (every provider call
+  reaches the cassette, whatever the cache state was at record time)
+
+Enabled with environment variables:
+    GMS_CASSETTE=record|replay     (unset: disabled)
+    GMS_CASSETTE_DIR=<path>        (default: backend/cache/cassettes)
+    GMS_CASSETTE_LATENCY=<float>   (replay only; 0 = instant, 1.0 = as recorded)
+    GMS_CASSETTE_SANDBOX=<path>    (parent of the per-run sandboxes; default: system temp dir)
+
+Lookups are tried with the exact request first and then with a loose key that
+ignores volatile inputs (request bodies, incremental start dates), so a
+recording keeps replaying after timestamps in prompts or date windows move.
+API keys are stripped from URLs before hashing and are never written to disk.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_CASSETTE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "cassettes")
+# Paths inside the repository keep their relative layout inside the sandbox
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Query parameters that carry credentials (dropped from keys and stored URLs)
+SECRET_PARAMS = {"key", "apikey", "api_key", "token", "access_token", "apiKey"}
+
+MODES = ("record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when no recording matches a request."""
+
+
+def _digest(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _strip_secrets(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+class Cassette:
+    """Record or replay provider responses from a cassette directory."""
+
+    def __init__(self, mode: Optional[str] = None, cassette_dir: Optional[str] = None,
+                 latency_scale: float = 0.0, log_callback: Optional[Callable[[str], None]] = None,
+                 sandbox_parent: Optional[str] = None):
+        """
+        Initialize cassette.
+
+        Args:
+            mode: 'record', 'replay' or None (disabled)
+            cassette_dir: Directory holding recordings (default: backend/cache/cassettes)
+            latency_scale: Replay sleeps recorded duration * scale (0 disables)
+            log_callback: Optional logging function (default: print)
+            sandbox_parent: Directory in which the run's sandbox is created (default: system temp dir)
+        """
+        if mode and mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.mode = mode or None
+        self.cassette_dir = cassette_dir or DEFAULT_CASSETTE_DIR
+        self.latency_scale = latency_scale
+        self.log_callback = log_callback
+        self.sandbox_parent = sandbox_parent
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._sandbox_dir: Optional[str] = None
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    # ---------- sandbox ----------
+
+    @property
+    def sandbox_dir(self) -> str:
+        """Fresh directory (created on first use) receiving this process's output and cache writes."""
+        with self._lock:
+            if self._sandbox_dir is None:
+                if self.sandbox_parent:
+                    os.makedirs(self.sandbox_parent, exist_ok=True)
+                self._sandbox_dir = tempfile.mkdtemp(prefix=f"gms_{self.mode}_", dir=self.sandbox_parent)
+                created = True
+            else:
+                created = False
+        if created:
+            self._log(f"[CASSETTE] Writing outputs and caches to sandbox {self._sandbox_dir}")
+        return self._sandbox_dir
+
+    def sandboxed(self, path: str) -> str:
+        """
+        Map an output or cache path into the sandbox while a cassette is active.
+
+        Args:
+            path: Production path (e.g. backend/cache/fred)
+
+        Returns:
+            The path unchanged when disabled, else the same repo-relative path under the sandbox
+        """
+        if not self.mode:
+            return path
+        path = os.path.abspath(path)
+        rel = os.path.relpath(path, REPO_ROOT)
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            rel = os.path.join("external", path.lstrip(os.sep))
+        return os.path.join(self.sandbox_dir, rel)
+
+    # ---------- storage ----------
+
+    def _path(self, namespace: str, key: str, ext: str) -> str:
+        return os.path.join(self.cassette_dir, namespace, f"{key}.{ext}")
+
+    def _write(self, namespace: str, keys, ext: str, payload: bytes):
+        for key in keys:
+            path = self._path(namespace, key, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        with self._lock:
+            self.stats["recorded"] += 1
+
+    def _read(self, namespace: str, keys, ext: str, label: str) -> bytes:
+        for key in keys:
+            path = self._path(namespace, key, ext)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    payload = f.read()
+                with self._lock:
+                    self.stats["replayed"] += 1
+                return payload
+        with self._lock:
+            self.stats["misses"] += 1
+        self._log(f"[CASSETTE] [WARN] No recording for {namespace}: {label}")
+        raise CassetteMiss(f"{namespace}: {label}")
+
+    def _simulate(self, duration_ms: float):
+        if self.latency_scale > 0 and duration_ms:
+            time.sleep(duration_ms * self.latency_scale / 1000.0)
+
+    # ---------- HTTP ----------
+
+    @staticmethod
+    def _http_keys(method: str, url: str, body: Any):
+        clean = _strip_secrets(url)
+        parts = urlsplit(clean)
+        return [_digest(method, clean, body), _digest(method, parts.netloc, parts.path)]
+
+    def record_http(self, method: str, url: str, body: Any, response, duration_ms: float):
+        """Store a live requests.Response under the request's keys."""
+        entry = {
+            "method": method,
+            "url": _strip_secrets(url),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in ("set-cookie", "content-encoding", "transfer-encoding")},
+            "encoding": response.encoding,
+            "body": response.content.decode("latin-1"),
+            "duration_ms": duration_ms
+        }
+        try:
+            self._write("http", self._http_keys(method, url, body), "json", json.dumps(entry).encode("utf-8"))
+        except (IOError, OSError) as e:
+            self._log(f"[CASSETTE] [WARN] Failed to record {entry['url']}: {e}")
+
+    def replay_http(self, method: str, url: str, body: Any):
+        """Rebuild a requests.Response from the recording (raises CassetteMiss)."""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        label = f"{method} {urlsplit(url).netloc}{urlsplit(url).path}"
+        entry = json.loads(self._read("http", self._http_keys(method, url, body), "json", label))
+        self._simulate(entry.get("duration_ms", 0))
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.encoding = entry.get("encoding")
+        response._content = entry["body"].encode("latin-1")
+        response._content_consumed = True  # iter_content / iter_lines (streamed calls) read _content
+        response.url = entry["url"]
+        return response
+
+    # ---------- Python-level provider calls ----------
+
+    def wrap_call(self, namespace: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a provider function so its results are recorded or replayed.
+
+        The loose key only uses positional arguments (e.g. tickers or series id),
+        so keyword windows such as start dates may move between runs.
+
+        Args:
+            namespace: Subdirectory for this provider (e.g. 'yfinance', 'fred')
+            func: Function returning a picklable result (DataFrame, Series, ...)
+
+        Returns:
+            The wrapped function (or func unchanged when the cassette is disabled)
+        """
+        if not self.mode:
+            return func
+
+        def wrapped(*args, **kwargs):
+            keys = [_digest(namespace, args, kwargs), _digest(namespace, args)]
+            if self.replaying:
+                entry = pickle.loads(self._read(namespace, keys, "pkl", repr(args)[:120]))
+                self._simulate(entry["duration_ms"])
+                return entry["result"]
+            start = time.time()
+            result = func(*args, **kwargs)
+            entry = {"result": result, "duration_ms": int((time.time() - start) * 1000)}
+            try:
+                self._write(namespace, keys, "pkl", pickle.dumps(entry))
+            except (IOError, OSError, pickle.PicklingError) as e:
+                self._log(f"[CASSETTE] [WARN] Failed to record {namespace} call: {e}")
+            return result
+
+        return wrapped
+
+    def summary(self) -> str:
+        return f"[CASSETTE] {self.mode}: {self.stats['recorded']} recorded, {self.stats['replayed']} replayed, {self.stats['misses']} misses"
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """Return the process-wide cassette configured from the environment."""
+    global _cassette
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette(
+                    mode=os.getenv("GMS_CASSETTE", "").strip().lower() or None,
+                    cassette_dir=os.getenv("GMS_CASSETTE_DIR") or None,
+                    latency_scale=float(os.getenv("GMS_CASSETTE_LATENCY", "0") or 0),
+                    sandbox_parent=os.getenv("GMS_CASSETTE_SANDBOX") or None
+                )
+    return _cassette
@@ -0,0 +1,78 @@
+"""
+Provider Base URLs for GlobalMacroSignal
+
+Single place for the external endpoints the backend calls, so a run can be
+pointed at the local stand-in server (stub_provider_server.py) or any other
+mirror without touching call sites:
+- GMS_PROVIDER_BASE_URL overrides every provider at once
+- <PROVIDER>_BASE_URL overrides a single provider (takes precedence)
+- worker_env() hands the resolved Gemini / AI Gateway hosts to the Node AI worker,
+  so bridge calls follow the same overrides as the Python HTTP calls
+
+Base URLs carry no trailing slash; call sites append the provider path.
+"""
+
+import os
+from typing import Dict
+
+DEFAULT_BASE_URLS = {
+    "FRED": "https://api.stlouisfed.org/fred",
+    "FNG": "https://api.alternative.me",
+    "ALPHA_VANTAGE": "https://www.alphavantage.co",
+    "FINNHUB": "https://finnhub.io",
+    "FMP": "https://financialmodelingprep.com",
+    "CNBC_RSS": "https://search.cnbc.com",
+    "INDEXNOW": "https://api.indexnow.org",
+    "GEMINI": "https://generativelanguage.googleapis.com",
+    "AI_GATEWAY": "https://ai-gateway.vercel.sh",
+}
+
+# FRED paths live under /fred on the real host; keep that prefix on a shared stand-in
+_SHARED_SUFFIX = {"FRED": "/fred"}
+
+
+def base_url(provider: str) -> str:
+    """
+    Resolve the base URL for a provider.
+
+    Args:
+        provider: Key of DEFAULT_BASE_URLS (e.g. 'FRED', 'GEMINI')
+
+    Returns:
+        Base URL without trailing slash
+    """
+    override = os.getenv(f"{provider}_BASE_URL", "").strip()
+    if override:
+        return override.rstrip("/")
+    shared = os.getenv("GMS_PROVIDER_BASE_URL", "").strip()
+    if shared:
+        return shared.rstrip("/") + _SHARED_SUFFIX.get(provider, "")
+    return DEFAULT_BASE_URLS[provider]
+
+
+FRED_BASE_URL = base_url("FRED")
+FNG_BASE_URL = base_url("FNG")
+ALPHA_VANTAGE_BASE_URL = base_url("ALPHA_VANTAGE")
+FINNHUB_BASE_URL = base_url("FINNHUB")
+FMP_BASE_URL = base_url("FMP")
+CNBC_RSS_BASE_URL = base_url("CNBC_RSS")
+INDEXNOW_BASE_URL = base_url("INDEXNOW")
+GEMINI_BASE_URL = base_url("GEMINI")
+AI_GATEWAY_BASE_URL = base_url("AI_GATEWAY")
+
+# Providers called from the Node worker (frontend/scripts/generate_insight.ts)
+WORKER_PROVIDERS = ("GEMINI", "AI_GATEWAY")
+
+
+def worker_env() -> Dict[str, str]:
+    """
+    Environment for the Node AI worker subprocess.
+
+    Returns:
+        Copy of os.environ with GEMINI_BASE_URL / AI_GATEWAY_BASE_URL set to the resolved
+        base URLs (the worker uses them as the SDK baseURL)
+    """
+    env = dict(os.environ)
+    for provider in WORKER_PROVIDERS:
+        env[f"{provider}_BASE_URL"] = base_url(provider)
+    return env
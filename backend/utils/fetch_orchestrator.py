@@ -0,0 +1,306 @@
+"""
+Concurrent Fetch Orchestrator for GlobalMacroSignal
+
+Runs independent provider fetches (FRED, Yahoo Finance, economic calendars,
+sentiment APIs) side by side in a thread pool with:
+- A global deadline for the whole fetch stage
+- A per-source timeout
+- Graceful degradation to each source's fallback value on timeout or error
+- Racing of interchangeable providers (first acceptable answer wins)
+- Hedged execution: alternates start only when the running attempt is slow or fails
+- Grouped fan-out with partial retry (keep what succeeded, re-run only the failures)
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class FetchSource:
+    """
+    A single provider fetch.
+
+    Attributes:
+        name: Identifier used in results and logs (e.g., 'fred')
+        func: Zero-argument callable performing the fetch
+        timeout: Seconds this source may take, measured from stage start
+        fallback: Value returned on timeout/error. If callable, it is invoked
+            to build the value lazily.
+    """
+    name: str
+    func: Callable[[], Any]
+    timeout: float
+    fallback: Any = None
+
+
+class FetchOrchestrator:
+    """Runs provider fetches concurrently under a global deadline."""
+
+    def __init__(self, deadline: float = 90.0, max_workers: Optional[int] = None, log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize orchestrator.
+
+        Args:
+            deadline: Global deadline in seconds for the whole stage
+            max_workers: Thread pool size (default: one thread per source)
+            log_callback: Optional logging function (default: print)
+        """
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.log_callback = log_callback
+        self.report: Dict[str, Dict[str, Any]] = {}
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _fallback(self, source: FetchSource) -> Any:
+        if callable(source.fallback):
+            try:
+                return source.fallback()
+            except Exception as e:
+                self._log(f"[FETCH_FALLBACK_ERROR] {source.name}: {type(e).__name__}: {e}")
+                return None
+        return source.fallback
+
+    @staticmethod
+    def _timed(func: Callable[[], Any]):
+        start = time.time()
+        result = func()
+        return result, int((time.time() - start) * 1000)
+
+    def run(self, sources: List[FetchSource]) -> Dict[str, Any]:
+        """
+        Execute all sources concurrently.
+
+        Args:
+            sources: Fetch definitions
+
+        Returns:
+            Dict mapping source name to its result (or fallback value)
+        """
+        results: Dict[str, Any] = {}
+        self.report = {}
+        if not sources:
+            return results
+
+        stage_start = time.time()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers or len(sources), thread_name_prefix="fetch")
+        try:
+            futures = {source.name: executor.submit(self._timed, source.func) for source in sources}
+
+            # Collect in order of tightest budget so short timeouts are honoured first
+            for source in sorted(sources, key=lambda s: s.timeout):
+                elapsed = time.time() - stage_start
+                remaining = max(0.0, min(source.timeout, self.deadline) - elapsed)
+                future = futures[source.name]
+                duration_ms = None
+                try:
+                    results[source.name], duration_ms = future.result(timeout=remaining)
+                    status = "ok"
+                except FutureTimeout:
+                    future.cancel()
+                    budget = min(source.timeout, self.deadline)
+                    self._log(f"[FETCH_TIMEOUT] {source.name} exceeded {budget:.0f}s budget. Degrading to fallback.")
+                    results[source.name] = self._fallback(source)
+                    status = "timeout"
+                except Exception as e:
+                    self._log(f"[FETCH_ERROR] {source.name}: {type(e).__name__}: {e}. Degrading to fallback.")
+                    results[source.name] = self._fallback(source)
+                    status = "error"
+
+                if duration_ms is None:
+                    duration_ms = int((time.time() - stage_start) * 1000)
+                self.report[source.name] = {"status": status, "duration_ms": duration_ms}
+        finally:
+            # Never block on stragglers; their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        total_ms = int((time.time() - stage_start) * 1000)
+        summary = ", ".join(f"{name}={info['status']}({info['duration_ms']}ms)" for name, info in self.report.items())
+        self._log(f"[FETCH] Stage completed in {total_ms}ms: {summary}")
+        return results
+
+
+def race_first(candidates: Dict[str, Callable[[], Any]], timeout: float,
+               accept: Callable[[Any], bool] = bool,
+               log_callback: Optional[Callable[[str], None]] = None) -> Tuple[Optional[str], Any]:
+    """
+    Run interchangeable providers concurrently and keep the first acceptable answer.
+
+    Args:
+        candidates: Provider name -> zero-argument callable
+        timeout: Seconds to wait for an acceptable answer
+        accept: Predicate a result must satisfy (default: truthy, i.e. non-empty)
+        log_callback: Optional logging function (default: print)
+
+    Returns:
+        (provider name, result) of the winner, or (None, None) if none qualified
+    """
+    log = log_callback or print
+    if not candidates:
+        return None, None
+
+    executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="race")
+    start = time.time()
+    try:
+        futures = {executor.submit(func): name for name, func in candidates.items()}
+        for future in as_completed(futures, timeout=timeout):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                log(f"[RACE] {name} failed: {type(e).__name__}: {e}")
+                continue
+            if accept(result):
+                log(f"[RACE] {name} won in {int((time.time() - start) * 1000)}ms")
+                return name, result
+    except FutureTimeout:
+        log(f"[RACE] No acceptable answer within {timeout:.0f}s")
+    finally:
+        # Losers keep running in the background; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None, None
+
+
+def hedged_first(candidates: List[Tuple[str, Callable[[threading.Event], Any]]], hedge_after: float, deadline: float,
+                 accept: Callable[[Any], bool] = bool,
+                 log_callback: Optional[Callable[[str], None]] = None) -> Tuple[Optional[str], Any]:
+    """
+    Run alternates in priority order, hedging instead of waiting out slow attempts.
+
+    The first candidate starts immediately. The next one is launched when hedge_after
+    seconds pass since the last launch without an acceptable answer, or as soon as a
+    running attempt fails. The first acceptable result wins; the cancel event handed to
+    every candidate is then set so long-running losers can stop early.
+
+    Args:
+        candidates: (name, callable(cancel_event)) pairs in priority order
+        hedge_after: Latency budget (seconds) before the next candidate is started
+        deadline: End-to-end seconds for the whole call
+        accept: Predicate a result must satisfy (default: truthy, i.e. non-empty)
+        log_callback: Optional logging function (default: print)
+
+    Returns:
+        (candidate name, result) of the winner, or (None, None) if none qualified
+    """
+    log = log_callback or print
+    if not candidates:
+        return None, None
+
+    cancel = threading.Event()
+    queue = list(candidates)
+    pending: Dict[Any, str] = {}
+    executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="hedge")
+    start = time.time()
+    end = start + deadline
+    last_launch = start
+
+    def launch(reason: str):
+        nonlocal last_launch
+        name, func = queue.pop(0)
+        if pending or reason != "start":
+            log(f"[HEDGE] Launching {name} at {int((time.time() - start) * 1000)}ms ({reason})")
+        pending[executor.submit(func, cancel)] = name
+        last_launch = time.time()
+
+    try:
+        launch("start")
+        while pending or queue:
+            now = time.time()
+            if now >= end:
+                log(f"[HEDGE] No acceptable answer within {deadline:.0f}s")
+                break
+            if not pending:
+                launch("previous attempts failed")
+                continue
+            timeout = end - now
+            if queue:
+                timeout = min(timeout, max(0.0, last_launch + hedge_after - now))
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if queue and time.time() < end:
+                    launch(f"no answer within {hedge_after:g}s")
+                continue
+            failed = False
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    log(f"[HEDGE] {name} failed: {type(e).__name__}: {e}")
+                    failed = True
+                    continue
+                if accept(result):
+                    log(f"[HEDGE] {name} won in {int((time.time() - start) * 1000)}ms")
+                    return name, result
+                log(f"[HEDGE] {name} returned an unacceptable answer")
+                failed = True
+            if failed and queue and pending:
+                launch("attempt failed")
+    finally:
+        cancel.set()
+        # Losers keep running in the background until they notice the cancel event
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None, None
+
+
+def fan_out_partial(groups: List[List[str]], run: Callable[[List[str]], Optional[Dict[str, Any]]],
+                    retries: int = 1, deadline: Optional[float] = None,
+                    log_callback: Optional[Callable[[str], None]] = None,
+                    retry_as_group: bool = False) -> Dict[str, Any]:
+    """
+    Run item groups concurrently and retry only the items that did not come back.
+
+    Each round runs all pending groups in parallel. Items a group did return are kept
+    even when others are missing; the missing items are retried one per call in the
+    next round (or together in one call with retry_as_group). The deadline also bounds a running round: groups still unfinished
+    when it passes count as failed and are left running in the background.
+
+    Args:
+        groups: Item groups for the first round (e.g., [["EN", "JP"], ["DE", "FR"]])
+        run: Callable(group) -> {item: value} for the items that succeeded (possibly
+             a subset of the group), or None on failure
+        retries: Extra rounds for missing items
+        deadline: Seconds for the whole fan-out (None = unbounded)
+        log_callback: Optional logging function (default: print)
+        retry_as_group: Retry all missing items in a single call instead of one call each
+
+    Returns:
+        {item: value} for every item that succeeded (possibly partial)
+    """
+    log = log_callback or print
+    end = time.time() + deadline if deadline is not None else None
+    collected: Dict[str, Any] = {}
+    pending = [list(g) for g in groups if g]
+    for round_no in range(1 + retries):
+        if not pending or (end is not None and time.time() >= end):
+            break
+        if round_no:
+            log(f"[FANOUT] Retrying missing items: {[item for g in pending for item in g]}")
+        executor = ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="fanout")
+        try:
+            futures = {executor.submit(run, group): group for group in pending}
+            done, not_done = wait(futures, timeout=None if end is None else max(0.0, end - time.time()))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if not_done:
+            log(f"[FANOUT] Deadline reached; abandoning {[item for f in not_done for item in futures[f]]}")
+        missing = []
+        for future, group in futures.items():
+            result = None
+            if future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    log(f"[FANOUT] [WARN] Group {group} failed: {e}")
+            result = result or {}
+            collected.update({item: result[item] for item in group if item in result})
+            missing.extend(item for item in group if item not in result)
+        pending = ([missing] if missing else []) if retry_as_group else [[item] for item in missing]
+    return collected
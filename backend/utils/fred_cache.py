@@ -0,0 +1,158 @@
+"""
+Incremental FRED Series Cache for GlobalMacroSignal
+
+Keeps one JSON file per FRED series id with:
+- All cached observations (date -> value)
+- The last observation date and the time of the last refresh
+- Incremental refresh: only observations from the last cached date onward
+  are requested from FRED
+- Cache hits within the refresh interval are served without any network call
+- Stale cache is served if FRED fails or is slow
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+
+class FredSeriesCache:
+    """Drop-in wrapper around fredapi.Fred.get_series with an on-disk cache."""
+
+    def __init__(self, fred, cache_dir: str, refresh_seconds: int = 3600,
+                 series_refresh: Optional[Dict[str, int]] = None,
+                 retention_days: int = 400,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize cache.
+
+        Args:
+            fred: fredapi.Fred instance (or any object with get_series)
+            cache_dir: Directory holding one '<SERIES_ID>.json' file per series
+            refresh_seconds: Minimum age before a series is re-queried (default: 1h)
+            series_refresh: Per-series overrides of refresh_seconds (e.g. weekly series)
+            retention_days: Observations older than this are pruned on save
+            log_callback: Optional logging function (default: print)
+        """
+        self.fred = fred
+        self.cache_dir = cache_dir
+        self.refresh_seconds = refresh_seconds
+        self.series_refresh = series_refresh or {}
+        self.retention_days = retention_days
+        self.log_callback = log_callback
+        self.stats = {"hits": 0, "incremental": 0, "full": 0, "stale": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _path(self, series_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{series_id}.json")
+
+    def _load(self, series_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(series_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError, OSError) as e:
+            self._log(f"[FRED_CACHE] [WARN] Discarding unreadable cache for {series_id}: {e}")
+            return None
+
+    def _save(self, series_id: str, entry: Dict[str, Any]):
+        path = self._path(series_id)
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except (IOError, OSError) as e:
+            self._log(f"[FRED_CACHE] [WARN] Failed to save cache for {series_id}: {e}")
+
+    @staticmethod
+    def _to_series(entry: Dict[str, Any], observation_start=None) -> pd.Series:
+        observations = entry.get("observations", {})
+        series = pd.Series(
+            [float("nan") if v is None else v for v in observations.values()],
+            index=pd.to_datetime(list(observations.keys())),
+            dtype="float64"
+        ).sort_index()
+        if observation_start is not None:
+            series = series[series.index >= pd.Timestamp(observation_start)]
+        return series
+
+    def _is_fresh(self, series_id: str, entry: Dict[str, Any]) -> bool:
+        try:
+            fetched_at = datetime.fromisoformat(entry["fetched_at"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        ttl = self.series_refresh.get(series_id, self.refresh_seconds)
+        return (datetime.now(timezone.utc) - fetched_at).total_seconds() < ttl
+
+    def get_series(self, series_id: str, observation_start=None) -> pd.Series:
+        """
+        Return a series, refreshing only the observations newer than the cache.
+
+        Args:
+            series_id: FRED series id (e.g., 'VIXCLS')
+            observation_start: Earliest date required by the caller ('YYYY-MM-DD')
+
+        Returns:
+            pandas Series indexed by observation date
+        """
+        entry = self._load(series_id)
+        start_str = str(observation_start)[:10] if observation_start is not None else None
+
+        # Cache must cover the requested window to be reusable
+        covers_window = entry is not None and (start_str is None or entry.get("covered_from", "9999") <= start_str)
+
+        if covers_window and self._is_fresh(series_id, entry):
+            self.stats["hits"] += 1
+            self._log(f"[FRED_CACHE] HIT {series_id} (last obs: {entry.get('last_observation')})")
+            return self._to_series(entry, observation_start)
+
+        if covers_window and entry.get("last_observation"):
+            # Re-request from the last cached date so late revisions of that point are picked up
+            fetch_start = entry["last_observation"]
+            mode = "incremental"
+        else:
+            fetch_start = start_str
+            mode = "full"
+
+        try:
+            fresh = self.fred.get_series(series_id, observation_start=fetch_start)
+        except Exception as e:
+            if entry is not None:
+                self.stats["stale"] += 1
+                self._log(f"[FRED_CACHE] [WARN] {series_id} refresh failed ({e}). Serving stale cache.")
+                return self._to_series(entry, observation_start)
+            raise
+
+        observations = dict(entry.get("observations", {})) if mode == "incremental" else {}
+        for idx, value in fresh.items():
+            observations[pd.Timestamp(idx).strftime('%Y-%m-%d')] = None if pd.isna(value) else float(value)
+
+        # Prune beyond retention but never below what callers have asked for
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        covered_from = entry.get("covered_from") if mode == "incremental" else (start_str or min(observations, default=cutoff))
+        if covered_from and covered_from < cutoff:
+            covered_from = cutoff
+        observations = {d: observations[d] for d in sorted(observations) if d >= covered_from}
+
+        entry = {
+            "series_id": series_id,
+            "covered_from": covered_from,
+            "last_observation": max(observations) if observations else None,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "observations": observations
+        }
+        self._save(series_id, entry)
+        self.stats[mode] += 1
+        self._log(f"[FRED_CACHE] {mode.upper()} {series_id}: {len(fresh)} obs fetched since {fetch_start}")
+        return self._to_series(entry, observation_start)
@@ -0,0 +1,124 @@
+"""
+Shared Pooled HTTP Client for GlobalMacroSignal
+
+One process-wide requests.Session for every backend network call, providing:
+- Keep-alive connection pools per host (no repeated TCP/TLS handshakes)
+- Unified default timeout
+- Retry policy for idempotent requests (connection errors, 502/503/504)
+- Per-request timing hooks (method, host, path, status, duration, size)
+- Optional record/replay of every response through a Cassette
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cassette import Cassette, get_cassette
+
+DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5  # urllib3 backoff factor: 0.5s, 1s, ...
+RETRY_STATUSES = (502, 503, 504)
+
+
+class HttpClient:
+    """Thin wrapper around a pooled requests.Session with timing hooks."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF, pool_connections: int = 20, pool_maxsize: int = 10,
+                 cassette: Optional[Cassette] = None):
+        """
+        Initialize client.
+
+        Args:
+            timeout: Default timeout (seconds) when a call does not pass one
+            retries: Retries for idempotent methods on connection errors / 5xx gateways
+            backoff_factor: urllib3 exponential backoff factor between retries
+            pool_connections: Number of per-host pools kept alive
+            pool_maxsize: Max concurrent keep-alive connections per host
+            cassette: Optional cassette to record responses to or replay them from
+        """
+        self.timeout = timeout
+        self.cassette = cassette if cassette is not None and cassette.mode else None
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,  # Never re-send after a read timeout; callers own their latency budget
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._hooks: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_timing_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback invoked after every request.
+
+        Args:
+            hook: Receives {method, host, path, status, duration_ms, bytes, error}.
+                Query strings are never included (they may carry API keys).
+        """
+        if hook not in self._hooks:
+            self._hooks.append(hook)
+
+    def _emit(self, info: Dict[str, Any]):
+        for hook in self._hooks:
+            try:
+                hook(info)
+            except Exception:
+                pass  # Instrumentation must never break a request
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Send a request through the pooled session."""
+        parts = urlsplit(url)
+        info = {"method": method.upper(), "host": parts.netloc, "path": parts.path, "status": None, "bytes": 0, "error": None}
+        body = {k: kwargs.get(k) for k in ("params", "json", "data") if kwargs.get(k) is not None}
+        start = time.time()
+        try:
+            if self.cassette is not None and self.cassette.replaying:
+                response = self.cassette.replay_http(info["method"], url, body)
+            else:
+                response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+                if self.cassette is not None:
+                    self.cassette.record_http(info["method"], url, body, response, int((time.time() - start) * 1000))
+            info["status"] = response.status_code
+            if not kwargs.get("stream"):
+                info["bytes"] = len(response.content)
+            return response
+        except Exception as e:
+            info["error"] = type(e).__name__
+            raise
+        finally:
+            info["duration_ms"] = int((time.time() - start) * 1000)
+            self._emit(info)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Return the process-wide shared client (created on first use)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(cassette=get_cassette())
+    return _client
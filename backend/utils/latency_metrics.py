@@ -0,0 +1,310 @@
+"""
+Latency Metrics for GlobalMacroSignal
+
+Fixed-memory latency tracking for the AI fallback layers, persisted across runs:
+- LatencyHistogram: fixed bucket bounds (ms), so memory does not grow with attempts;
+  percentiles are interpolated inside the bucket that holds the requested rank
+- RollingMetrics: per-method attempts / successes / histograms in hourly slots,
+  merged after each run and pruned past the retention period
+- Windowed summaries (e.g. 1h / 24h / 7d) with counts, success rates and p50/p95/p99,
+  plus average prompt size (characters / tokens) where callers report it
+- Export as JSON or as a Prometheus textfile (node_exporter textfile collector)
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+# Upper bucket bounds in milliseconds (a final overflow bucket catches anything slower)
+DEFAULT_BOUNDS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 15000, 30000, 60000, 120000, 180000)
+
+DEFAULT_WINDOWS = {"1h": 3600, "24h": 86400, "7d": 7 * 86400}
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Additive per-method counters besides attempts / successes (prompt size sums and their sample count)
+PROMPT_FIELDS = ("prompt_samples", "prompt_chars", "prompt_tokens")
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution with O(buckets) memory."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, latency_ms: float):
+        """Add one latency sample."""
+        latency_ms = max(0.0, float(latency_ms))
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if latency_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's samples (bounds must match)."""
+        if other.bounds != self.bounds:
+            raise ValueError("cannot merge histograms with different bounds")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def mean(self) -> Optional[float]:
+        count = self.count
+        return self.total_ms / count if count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-quantile (0..1).
+
+        Returns:
+            Latency in ms, linearly interpolated within the bucket (None when empty)
+        """
+        count = self.count
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            if cumulative + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max_ms
+                upper = min(upper, self.max_ms)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (max(upper, lower) - lower) * fraction
+            cumulative += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"counts": self.counts, "total_ms": self.total_ms, "max_ms": self.max_ms}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], bounds: Sequence[float] = DEFAULT_BOUNDS_MS) -> "LatencyHistogram":
+        hist = cls(bounds)
+        counts = list(data.get("counts", []))
+        if len(counts) != len(hist.counts):
+            raise ValueError("bucket count mismatch")
+        hist.counts = [int(c) for c in counts]
+        hist.total_ms = float(data.get("total_ms", 0.0))
+        hist.max_ms = float(data.get("max_ms", 0.0))
+        return hist
+
+
+class RollingMetrics:
+    """Per-method AI metrics persisted in hourly slots for windowed summaries."""
+
+    def __init__(self, state_file: Optional[str] = None, slot_seconds: int = 3600,
+                 retention_seconds: int = 7 * 86400, bounds: Sequence[float] = DEFAULT_BOUNDS_MS,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize store.
+
+        Args:
+            state_file: Optional JSON path for persistence (None keeps it in memory)
+            slot_seconds: Width of one aggregation slot
+            retention_seconds: Slots older than this are dropped on merge
+            bounds: Histogram bucket bounds in ms (a change resets the stored history)
+            log_callback: Optional logging function (default: print)
+        """
+        self.state_file = state_file
+        self.slot_seconds = slot_seconds
+        self.retention_seconds = retention_seconds
+        self.bounds = tuple(bounds)
+        self.log_callback = log_callback
+        # {slot_start: {method: {"attempts": n, "successes": n, "latency": LatencyHistogram}}}
+        self.slots: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self._load()
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if tuple(state.get("bounds", ())) != self.bounds:
+                raise ValueError("histogram bounds changed")
+            for slot, methods in state.get("slots", {}).items():
+                self.slots[int(slot)] = {
+                    method: dict(
+                        {field: int(stats.get(field, 0)) for field in PROMPT_FIELDS},
+                        attempts=int(stats["attempts"]),
+                        successes=int(stats["successes"]),
+                        latency=LatencyHistogram.from_dict(stats["latency"], self.bounds)
+                    )
+                    for method, stats in methods.items()
+                }
+        except (json.JSONDecodeError, IOError, OSError, KeyError, TypeError, ValueError, AttributeError) as e:
+            self._log(f"[AI_METRICS] [WARN] Resetting unreadable metrics: {e}")
+            self.slots = {}
+
+    def save(self):
+        """Persist slots atomically (no-op without a state file)."""
+        if not self.state_file:
+            return
+        state = {
+            "bounds": list(self.bounds),
+            "slots": {
+                str(slot): {
+                    method: dict({field: s[field] for field in PROMPT_FIELDS if s.get(field)},
+                                 attempts=s["attempts"], successes=s["successes"], latency=s["latency"].to_dict())
+                    for method, s in methods.items()
+                }
+                for slot, methods in sorted(self.slots.items())
+            }
+        }
+        _write_atomic(self.state_file, json.dumps(state), self._log)
+
+    def merge_run(self, methods: Mapping[str, Mapping[str, Any]], now: Optional[float] = None):
+        """
+        Fold one run's metrics into the current slot and drop expired slots.
+
+        Args:
+            methods: {method: {"attempts": n, "successes": n, "latency": LatencyHistogram}}
+                (optionally with prompt_samples / prompt_chars / prompt_tokens sums)
+            now: Run timestamp (default: time.time())
+        """
+        now = time.time() if now is None else now
+        slot_start = int(now // self.slot_seconds * self.slot_seconds)
+        slot = self.slots.setdefault(slot_start, {})
+        for method, stats in methods.items():
+            _accumulate(slot.setdefault(method, self._empty()), stats)
+        cutoff = now - self.retention_seconds
+        self.slots = {s: m for s, m in self.slots.items() if s + self.slot_seconds > cutoff}
+
+    def _empty(self) -> Dict[str, Any]:
+        return dict({field: 0 for field in PROMPT_FIELDS}, attempts=0, successes=0, latency=LatencyHistogram(self.bounds))
+
+    def summary(self, window_seconds: int, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate the slots overlapping the last window_seconds.
+
+        Returns:
+            {method: {"attempts", "successes", "success_rate", "avg_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms",
+                      "avg_prompt_chars", "avg_prompt_tokens"}}
+        """
+        now = time.time() if now is None else now
+        cutoff = now - window_seconds
+        merged: Dict[str, Dict[str, Any]] = {}
+        for slot_start, methods in self.slots.items():
+            if slot_start + self.slot_seconds <= cutoff:
+                continue
+            for method, stats in methods.items():
+                _accumulate(merged.setdefault(method, self._empty()), stats)
+        return {method: describe(stats) for method, stats in sorted(merged.items())}
+
+    def export_json(self, path: str, windows: Mapping[str, int] = DEFAULT_WINDOWS, now: Optional[float] = None):
+        """Write windowed summaries as JSON for dashboards."""
+        now = time.time() if now is None else now
+        report = {
+            "generated_at": int(now),
+            "windows": {name: self.summary(seconds, now) for name, seconds in windows.items()}
+        }
+        _write_atomic(path, json.dumps(report, indent=2), self._log)
+
+    def export_prometheus(self, path: str, windows: Mapping[str, int] = DEFAULT_WINDOWS,
+                          now: Optional[float] = None, prefix: str = "gms_ai"):
+        """Write windowed summaries in the Prometheus text exposition format."""
+        now = time.time() if now is None else now
+        summaries = {name: self.summary(seconds, now) for name, seconds in windows.items()}
+        lines = [
+            f"# HELP {prefix}_attempts AI generation attempts per method over a rolling window.",
+            f"# TYPE {prefix}_attempts gauge",
+        ]
+        for name, methods in summaries.items():
+            for method, s in methods.items():
+                lines.append(f'{prefix}_attempts{{method="{method}",window="{name}"}} {s["attempts"]}')
+        lines += [
+            f"# HELP {prefix}_success_ratio Share of successful attempts per method over a rolling window.",
+            f"# TYPE {prefix}_success_ratio gauge",
+        ]
+        for name, methods in summaries.items():
+            for method, s in methods.items():
+                lines.append(f'{prefix}_success_ratio{{method="{method}",window="{name}"}} {s["success_rate"]:.4f}')
+        lines += [
+            f"# HELP {prefix}_latency_ms Estimated latency quantiles per method over a rolling window.",
+            f"# TYPE {prefix}_latency_ms gauge",
+        ]
+        for name, methods in summaries.items():
+            for method, s in methods.items():
+                for q in PERCENTILES:
+                    value = s[f"p{int(q * 100)}_ms"]
+                    if value is not None:
+                        lines.append(f'{prefix}_latency_ms{{method="{method}",window="{name}",quantile="{q}"}} {value:.1f}')
+        for field in ("chars", "tokens"):
+            lines += [
+                f"# HELP {prefix}_prompt_{field}_avg Average prompt size in {field} per method over a rolling window.",
+                f"# TYPE {prefix}_prompt_{field}_avg gauge",
+            ]
+            for name, methods in summaries.items():
+                for method, s in methods.items():
+                    if s[f"avg_prompt_{field}"] is not None:
+                        lines.append(f'{prefix}_prompt_{field}_avg{{method="{method}",window="{name}"}} {s[f"avg_prompt_{field}"]:.0f}')
+        lines += [
+            f"# HELP {prefix}_metrics_generated_timestamp_seconds Time the metrics file was written.",
+            f"# TYPE {prefix}_metrics_generated_timestamp_seconds gauge",
+            f"{prefix}_metrics_generated_timestamp_seconds {int(now)}",
+        ]
+        _write_atomic(path, "\n".join(lines) + "\n", self._log)
+
+
+def describe(stats: Mapping[str, Any]) -> Dict[str, Any]:
+    """Counts, success rate and latency quantiles of one method's stats."""
+    hist = stats["latency"]
+    attempts = stats["attempts"]
+    summary = {
+        "attempts": attempts,
+        "successes": stats["successes"],
+        "success_rate": stats["successes"] / attempts if attempts else 0.0,
+        "avg_ms": _round(hist.mean()),
+        "max_ms": _round(hist.max_ms) if hist.count else None
+    }
+    for q in PERCENTILES:
+        summary[f"p{int(q * 100)}_ms"] = _round(hist.percentile(q))
+    samples = stats.get("prompt_samples", 0)
+    summary["avg_prompt_chars"] = _round(stats["prompt_chars"] / samples) if samples else None
+    summary["avg_prompt_tokens"] = _round(stats["prompt_tokens"] / samples) if samples else None
+    return summary
+
+
+def _accumulate(target: Dict[str, Any], stats: Mapping[str, Any]):
+    target["attempts"] += stats["attempts"]
+    target["successes"] += stats["successes"]
+    for field in PROMPT_FIELDS:
+        target[field] += stats.get(field, 0)
+    target["latency"].merge(stats["latency"])
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+def _write_atomic(path: str, text: str, log: Callable[[str], None]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except (IOError, OSError) as e:
+        log(f"[AI_METRICS] [WARN] Failed to write {path}: {e}")
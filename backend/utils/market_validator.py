@@ -0,0 +1,150 @@
+"""
+Schema-Driven Market Data Validator for GlobalMacroSignal
+
+Validates an entire market_data dict in one vectorized pass:
+- Schema compiled once into bound / typical-band / max-age arrays
+- Type (finite numeric price), hard bounds and staleness (item 'as_of') checked
+  for every key at once
+- Invalid or missing indicators are substituted from the last published
+  snapshot when that value is itself valid, including its age: a frozen value
+  carried over run after run goes stale and is no longer accepted
+- Returns a structured report of every substitution and warning
+
+Schema entry format:
+    {"min": float, "max": float, "typical": (lo, hi), "max_age_days": float}
+All fields are optional; 'typical' only produces warnings.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+def _epoch(value: Any) -> float:
+    if not isinstance(value, str):
+        return np.nan
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return np.nan
+    return (dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt).timestamp()
+
+
+def _price(item: Any) -> float:
+    if not isinstance(item, Mapping):
+        return np.nan
+    value = item.get("price")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+
+class MarketDataValidator:
+    """Compiled validation schema for market_data snapshots."""
+
+    def __init__(self, schema: Mapping[str, Mapping[str, Any]], log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Compile the schema.
+
+        Args:
+            schema: {indicator key: rule} (see module docstring)
+            log_callback: Optional logging function (default: print)
+        """
+        self.keys: List[str] = list(schema)
+        self.index = {k: i for i, k in enumerate(self.keys)}
+        self.log_callback = log_callback
+
+        def column(field, default):
+            return np.array([float(schema[k].get(field, default)) for k in self.keys])
+
+        self.lo = column("min", -np.inf)
+        self.hi = column("max", np.inf)
+        self.typ_lo = np.array([float(schema[k].get("typical", (-np.inf, np.inf))[0]) for k in self.keys])
+        self.typ_hi = np.array([float(schema[k].get("typical", (-np.inf, np.inf))[1]) for k in self.keys])
+        self.max_age = column("max_age_days", np.inf) * 86400
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _gather(self, data: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        items = [data.get(k) for k in self.keys]
+        present = np.array([isinstance(item, Mapping) for item in items], dtype=bool)
+        prices = np.array([_price(item) for item in items])
+        as_of = np.array([_epoch(item.get("as_of")) if isinstance(item, Mapping) else np.nan for item in items])
+        return present, prices, as_of
+
+    def _valid(self, prices: np.ndarray, as_of: np.ndarray, now: float) -> Dict[str, np.ndarray]:
+        finite = np.isfinite(prices)
+        with np.errstate(invalid="ignore"):
+            return {
+                "not_numeric": ~finite,
+                "out_of_bounds": finite & ((prices < self.lo) | (prices > self.hi)),
+                "stale": finite & np.isfinite(as_of) & (now - as_of > self.max_age)
+            }
+
+    def validate(self, market_data: Dict[str, Any], previous: Optional[Mapping[str, Any]] = None,
+                 now: Optional[float] = None, stage: str = "fetch") -> Dict[str, Any]:
+        """
+        Validate market_data in place, substituting bad indicators from previous.
+
+        Args:
+            market_data: Snapshot to validate (modified in place)
+            previous: Last published market_data (substitution source)
+            now: Epoch seconds for staleness checks (default: current time)
+            stage: Label recorded in the report
+
+        Returns:
+            Report {stage, checked, substituted, unresolved, missing, warnings, unschematized}
+        """
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        previous = previous or {}
+
+        present, prices, as_of = self._gather(market_data)
+        checks = self._valid(prices, as_of, now)
+        missing = ~present
+        invalid = present & (checks["not_numeric"] | checks["out_of_bounds"] | checks["stale"])
+
+        # Previous snapshot is a usable substitute only if it passes every check itself (staleness included)
+        prev_present, prev_prices, prev_as_of = self._gather(previous)
+        prev_checks = self._valid(prev_prices, prev_as_of, now)
+        prev_ok = prev_present & ~(prev_checks["not_numeric"] | prev_checks["out_of_bounds"] | prev_checks["stale"])
+
+        with np.errstate(invalid="ignore"):
+            atypical = present & ~invalid & ((prices < self.typ_lo) | (prices > self.typ_hi))
+
+        reasons = np.select(
+            [missing, checks["not_numeric"], checks["out_of_bounds"], checks["stale"]],
+            ["missing", "not_numeric", "out_of_bounds", "stale"], default=""
+        )
+        substitute = (missing | invalid) & prev_ok
+        unresolved = invalid & ~prev_ok
+
+        report: Dict[str, Any] = {
+            "stage": stage, "checked": len(self.keys),
+            "substituted": [], "unresolved": [], "warnings": [],
+            "unschematized": sorted(k for k in market_data if k not in self.index)
+        }
+        for i in np.flatnonzero(substitute):
+            key = self.keys[i]
+            report["substituted"].append({"key": key, "reason": str(reasons[i]), "value": market_data.get(key, {}).get("price") if present[i] else None,
+                                          "replacement": previous[key].get("price")})
+            market_data[key] = previous[key]
+        for i in np.flatnonzero(unresolved):
+            key = self.keys[i]
+            report["unresolved"].append({"key": key, "reason": str(reasons[i]), "value": market_data[key].get("price")})
+            if reasons[i] == "not_numeric":
+                del market_data[key]  # NaN / missing prices would poison scoring and JSON output
+        report["missing"] = [self.keys[i] for i in np.flatnonzero(missing & ~prev_ok)]
+        for i in np.flatnonzero(atypical):
+            report["warnings"].append({"key": self.keys[i], "reason": "atypical", "value": float(prices[i])})
+
+        if report["substituted"] or report["unresolved"]:
+            self._log(f"[VALIDATE] [WARN] {stage}: {len(report['substituted'])} substituted, {len(report['unresolved'])} unresolved "
+                      f"({', '.join(e['key'] + ':' + e['reason'] for e in report['substituted'] + report['unresolved'])})")
+        else:
+            self._log(f"[VALIDATE] {stage}: {len(self.keys)} indicators OK ({len(report['warnings'])} atypical)")
+        return report
@@ -0,0 +1,238 @@
+"""
+Persistent Node.js AI Bridge for GlobalMacroSignal
+
+One long-lived `generate_insight.ts --worker` process shared by every AI caller
+(gms_engine, fetch_news, monthly_summary), replacing a fresh `npx tsx` spawn
+(npx resolution + transpile + Node startup) per request:
+- JSON-lines protocol on stdin/stdout: {"id", "prompt"} -> {"id", "text"} | {"id", "error"}
+- Responses report the model calls the worker sent and their token usage, so the
+  AI governor can charge every call rather than one per request
+- Request ids let several threads share the worker concurrently
+- Health check (ping) on startup and on demand
+- Automatic restart when the worker dies; in-flight requests fail fast
+- Graceful shutdown: closing stdin lets the worker answer in-flight requests before it exits
+- Process-wide singleton, so the scheduler reuses the worker across cycles
+- Under a cassette, answers are recorded / replayed like any provider call
+  (replay never starts the worker and does not need npx)
+"""
+
+import atexit
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional
+
+from .cassette import get_cassette
+from .endpoints import worker_env
+
+DEFAULT_REQUEST_TIMEOUT = 120  # seconds
+DEFAULT_STARTUP_TIMEOUT = 60  # npx resolution + tsx transpile on a cold cache
+
+
+class BridgeError(RuntimeError):
+    """The worker failed, timed out, or returned an error for a request."""
+
+
+class NodeBridge:
+    """Client for one long-lived JSON-lines worker process."""
+
+    def __init__(self, command: List[str], cwd: Optional[str] = None,
+                 startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 env: Optional[Dict[str, str]] = None):
+        """
+        Initialize bridge (the worker is started lazily on first use).
+
+        Args:
+            command: Worker command line (e.g., ["npx", "tsx", script, "--worker"])
+            cwd: Working directory for the worker
+            startup_timeout: Seconds to wait for the startup health check
+            log_callback: Optional logging function (default: print)
+            env: Worker environment (default: inherit this process's environment)
+        """
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.startup_timeout = startup_timeout
+        self.log_callback = log_callback
+        self.restarts = 0
+
+        self._process: Optional[subprocess.Popen] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()  # Guards process lifecycle and the pending table
+        self._write_lock = threading.Lock()
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _spawn(self):
+        if self._process is not None:
+            self.restarts += 1
+            self._log(f"[AI BRIDGE] Worker exited (code {self._process.returncode}), restarting ({self.restarts})...")
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+            shell=(os.name == 'nt'),
+            cwd=self.cwd,
+            env=self.env,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        process = self._process
+        threading.Thread(target=self._read_stdout, args=(process,), daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(process,), daemon=True).start()
+
+    def _read_stdout(self, process: subprocess.Popen):
+        for line in process.stdout:
+            line = line.strip()
+            if not line.startswith('{'):
+                continue  # dotenv / npx noise
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            with self._lock:
+                future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+
+        # EOF: the worker is gone, fail everything still waiting on it
+        process.wait()
+        with self._lock:
+            orphaned = list(self._pending.values())
+            self._pending.clear()
+        for future in orphaned:
+            if not future.done():
+                future.set_exception(BridgeError(f"Worker exited (code {process.returncode})"))
+
+    def _read_stderr(self, process: subprocess.Popen):
+        for line in process.stderr:
+            if line.strip():
+                self._log(f"[AI BRIDGE] {line.rstrip()}")
+
+    def _send(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        future: Future = Future()
+        with self._lock:
+            if not self.alive:
+                try:
+                    self._spawn()
+                except OSError as e:
+                    raise BridgeError(f"Failed to start worker: {e}")
+            process = self._process
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        try:
+            with self._write_lock:
+                process.stdin.write(json.dumps(dict(payload, id=request_id), ensure_ascii=False) + "\n")
+                process.stdin.flush()
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            raise BridgeError(f"No response within {timeout}s")
+        except (BrokenPipeError, OSError) as e:
+            raise BridgeError(f"Worker pipe closed: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def ping(self, timeout: Optional[float] = None) -> bool:
+        """Health check; starts the worker if needed. Returns False instead of raising."""
+        try:
+            return bool(self._send({"op": "ping"}, timeout or self.startup_timeout).get("ok"))
+        except BridgeError as e:
+            self._log(f"[AI BRIDGE WARN] Health check failed: {e}")
+            process = self._process
+            if process is not None and process.poll() is None:
+                process.kill()  # Hung worker: the next call starts a fresh one
+            return False
+
+    def request(self, prompt: str, timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                usage: Optional[Dict[str, int]] = None) -> str:
+        """
+        Run one prompt through the worker's model loop.
+
+        Args:
+            prompt: Prompt text
+            timeout: Seconds to wait for this request's response
+            usage: Optional dict receiving "calls" (model calls sent, failed ones included)
+                   and "tokens" (reported usage), when the worker provides them
+
+        Returns:
+            Generated text
+
+        Raises:
+            BridgeError: Worker unavailable, timed out, or all models failed
+        """
+        if not self.alive and not self.ping():
+            raise BridgeError("Worker failed to start")
+        response = self._send({"prompt": prompt}, timeout)
+        if usage is not None:
+            usage.update({key: int(response[key]) for key in ("calls", "tokens") if response.get(key)})
+        if "error" in response:
+            raise BridgeError(response["error"])
+        return response.get("text", "")
+
+    def close(self, timeout: float = 5, drain_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        """
+        Stop the worker. Closing stdin lets it finish in-flight requests and exit cleanly.
+
+        Args:
+            timeout: Seconds to wait for an idle worker to exit before killing it
+            drain_timeout: Seconds to wait instead while requests are still in flight
+        """
+        with self._lock:
+            process, self._process = self._process, None
+            in_flight = len(self._pending)
+        if process is None or process.poll() is not None:
+            return
+        if in_flight:
+            self._log(f"[AI BRIDGE] Closing worker, draining {in_flight} in-flight request(s)...")
+        try:
+            process.stdin.close()
+            process.wait(timeout=drain_timeout if in_flight else timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+
+# Process-wide worker shared by every caller
+_bridge: Optional[NodeBridge] = None
+_bridge_lock = threading.Lock()
+
+
+def get_bridge(log_callback: Optional[Callable[[str], None]] = None) -> Optional[NodeBridge]:
+    """
+    Return the shared bridge for frontend/scripts/generate_insight.ts.
+
+    Returns:
+        NodeBridge, or None when npx is not available (and no cassette is replaying)
+    """
+    global _bridge
+    if _bridge is None:
+        with _bridge_lock:
+            if _bridge is None:
+                cassette = get_cassette()
+                if not shutil.which("npx") and not cassette.replaying:
+                    return None
+                frontend_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "frontend")
+                script_path = os.path.join(frontend_dir, "scripts", "generate_insight.ts")
+                # Base-URL overrides (e.g. stub_provider_server.py) reach the worker's SDK clients too
+                _bridge = NodeBridge(["npx", "tsx", script_path, "--worker"], cwd=frontend_dir,
+                                     log_callback=log_callback, env=worker_env())
+                _bridge.request = cassette.wrap_call("node_bridge", _bridge.request)
+                atexit.register(_bridge.close)
+    return _bridge
@@ -0,0 +1,176 @@
+"""
+Incremental Percentile Index for GlobalMacroSignal
+
+Persistent order-statistics structure for long indicator histories
+(e.g., Net Liquidity), replacing per-run rebuild-and-sort passes:
+- Sorted value array maintained with bisect (O(log n) search per observation)
+- One observation per key (e.g., date); re-observing a key replaces its value
+- Direct answers for quantile thresholds and the percentile rank of any value
+- Optional cap on retained observations (oldest keys evicted first)
+- Persisted as a snapshot holding the sorted array (loaded as-is, never re-sorted)
+  plus an append-only journal of later observations; save() only appends what
+  changed and rewrites the snapshot once the journal outgrows a fraction of it
+"""
+
+import bisect
+import json
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Journal lines tolerated before compaction, relative to the snapshot size (with a floor)
+COMPACT_RATIO = 0.25
+COMPACT_MIN_ENTRIES = 64
+
+
+class PercentileIndex:
+    """Sorted, keyed observation set persisted as JSON."""
+
+    def __init__(self, state_file: Optional[str] = None, max_size: Optional[int] = None,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize index.
+
+        Args:
+            state_file: Optional JSON path for persistence (None keeps it in memory)
+            max_size: Maximum observations kept (None = unbounded)
+            log_callback: Optional logging function (default: print)
+        """
+        self.state_file = state_file
+        self.max_size = max_size
+        self.log_callback = log_callback
+        self._sorted: List[float] = []
+        self._by_key: Dict[str, float] = {}  # Insertion-ordered: oldest key first
+        self._dirty: List[Tuple[str, float]] = []  # Observations not yet journaled
+        self._journal_entries = 0
+        self._snapshot_size = 0
+        self._load()
+
+    @property
+    def journal_file(self) -> Optional[str]:
+        return self.state_file + ".journal" if self.state_file else None
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _load(self):
+        if not self.state_file:
+            return
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                self._by_key = {str(k): float(v) for k, v in state.get("observations", [])}
+                stored = [float(v) for v in state.get("sorted", [])]
+                # Older snapshots (or a mismatched array) fall back to one sort
+                self._sorted = stored if len(stored) == len(self._by_key) else sorted(self._by_key.values())
+                self._snapshot_size = len(self._by_key)
+            except (json.JSONDecodeError, IOError, OSError, TypeError, ValueError) as e:
+                self._log(f"[PERCENTILE] [WARN] Resetting unreadable index: {e}")
+                self._by_key, self._sorted = {}, []
+                return
+
+        if os.path.exists(self.journal_file):
+            try:
+                with open(self.journal_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            key, value = json.loads(line)
+                        except (json.JSONDecodeError, TypeError, ValueError):
+                            continue  # Torn last line from an interrupted append
+                        self._journal_entries += 1
+                        self.add(str(key), value)
+            except (IOError, OSError) as e:
+                self._log(f"[PERCENTILE] [WARN] Ignoring unreadable journal: {e}")
+            self._dirty = []
+
+    def save(self):
+        """Persist new observations (no-op without a state file or changes)."""
+        if not self.state_file or not self._dirty:
+            return
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        if self._journal_entries + len(self._dirty) > max(COMPACT_MIN_ENTRIES, self._snapshot_size * COMPACT_RATIO):
+            self.compact()
+            return
+        try:
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps([key, value]) + "\n" for key, value in self._dirty))
+            self._journal_entries += len(self._dirty)
+            self._dirty = []
+        except (IOError, OSError) as e:
+            self._log(f"[PERCENTILE] [WARN] Failed to append to journal: {e}")
+
+    def compact(self):
+        """Rewrite the snapshot (observations + sorted array) atomically and clear the journal."""
+        if not self.state_file:
+            return
+        temp_path = self.state_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"observations": list(self._by_key.items()), "sorted": self._sorted}, f)
+            os.replace(temp_path, self.state_file)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._snapshot_size = len(self._by_key)
+            self._journal_entries = 0
+            self._dirty = []
+        except (IOError, OSError) as e:
+            self._log(f"[PERCENTILE] [WARN] Failed to save index: {e}")
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def _remove_value(self, value: float):
+        i = bisect.bisect_left(self._sorted, value)
+        if i < len(self._sorted) and self._sorted[i] == value:
+            del self._sorted[i]
+
+    def add(self, key: str, value: float) -> bool:
+        """
+        Record an observation.
+
+        Args:
+            key: Observation identity (e.g., 'YYYY-MM-DD'); an existing key is replaced
+            value: Observed value
+
+        Returns:
+            True if the index changed
+        """
+        value = float(value)
+        old = self._by_key.get(key)
+        if old == value:
+            return False
+        if old is not None:
+            self._remove_value(old)
+            del self._by_key[key]  # Re-insert so the key counts as newest
+        self._by_key[key] = value
+        bisect.insort(self._sorted, value)
+        self._dirty.append((key, value))
+
+        if self.max_size is not None:
+            while len(self._by_key) > self.max_size:
+                oldest = next(iter(self._by_key))
+                self._remove_value(self._by_key.pop(oldest))
+        return True
+
+    def extend(self, observations: Iterable[Tuple[str, float]]) -> int:
+        """Record many (key, value) observations; returns how many changed the index."""
+        return sum(1 for key, value in observations if self.add(key, value))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0-1), using the sorted[int(n * q)] convention."""
+        if not self._sorted:
+            return None
+        return self._sorted[min(int(len(self._sorted) * q), len(self._sorted) - 1)]
+
+    def percentile(self, value: float) -> Optional[float]:
+        """Percentage (0-100) of observations strictly below value."""
+        if not self._sorted:
+            return None
+        return bisect.bisect_left(self._sorted, value) / len(self._sorted) * 100
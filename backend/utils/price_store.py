@@ -0,0 +1,299 @@
+"""
+Shared Incremental OHLCV Store for GlobalMacroSignal
+
+A local columnar (Parquet) price store keyed by ticker and interval, shared by
+gms_engine, tech_analysis and update_ogv_beacons:
+- One file per (interval, ticker) under backend/cache/prices/<interval>/
+- Only bars newer than the last stored bar are downloaded
+- Prices are split/dividend adjusted: when a refreshed bar that was already complete
+  no longer matches the stored close, Yahoo has rescaled the history and the ticker
+  is re-downloaded in full instead of appending bars on the new scale
+- All stale tickers of a call are refreshed with a single batched download
+- Recently refreshed tickers are served from disk without any network call
+- Refresh metadata lives next to each file (<ticker>.meta.json), so a write only
+  touches the tickers it refreshed and concurrent processes cannot drop each other's entries
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .cassette import get_cassette
+
+# Approximate calendar span of yfinance period strings
+PERIOD_DAYS = {"5d": 5, "1mo": 31, "3mo": 93, "6mo": 183, "1y": 366, "2y": 731, "5y": 1827, "10y": 3653}
+
+# A stored history "covers" a period if its first bar is within this slack of the period start
+COVERAGE_SLACK_DAYS = {"1wk": 14, "1mo": 40}
+
+# Yahoo only serves ~730 days of hourly bars
+RETENTION_DAYS = {"1h": 730}
+DEFAULT_RETENTION_DAYS = 3653
+
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+
+# Relative close difference on re-downloaded bars that signals a split/dividend re-adjustment
+ADJUSTMENT_TOLERANCE = 1e-4
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "prices")
+
+
+def _yf_download(tickers: List[str], **kwargs) -> pd.DataFrame:
+    """Default downloader (yfinance batch call, grouped by ticker)."""
+    import yfinance as yf
+    return yf.download(tickers, group_by='ticker', auto_adjust=True, progress=False, **kwargs)
+
+
+def _to_utc(ts) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _index_utc(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    return index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+
+
+def _covering_period(start: pd.Timestamp) -> str:
+    """Shortest yfinance period reaching back to start."""
+    days = (_to_utc(datetime.now(timezone.utc)) - start).days + 1
+    for period, span in sorted(PERIOD_DAYS.items(), key=lambda item: item[1]):
+        if span >= days:
+            return period
+    return "max"
+
+
+class PriceStore:
+    """Incremental on-disk OHLCV store backed by Parquet files."""
+
+    def __init__(self, store_dir: Optional[str] = None, refresh_seconds: int = 300,
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 downloader: Optional[Callable[..., pd.DataFrame]] = None,
+                 download_options: Optional[Dict] = None):
+        """
+        Initialize store.
+
+        Args:
+            store_dir: Root directory (default: backend/cache/prices)
+            refresh_seconds: Tickers refreshed more recently than this are served
+                from disk without a download (default: 5 minutes)
+            log_callback: Optional logging function (default: print)
+            downloader: Batch download function (default: yfinance, recorded/replayed
+                through the process cassette when one is enabled)
+            download_options: Extra keyword arguments for every download (e.g. {"threads": False})
+        """
+        # The default store is swapped for the cassette sandbox during record/replay
+        self.store_dir = store_dir or get_cassette().sandboxed(DEFAULT_STORE_DIR)
+        self.refresh_seconds = refresh_seconds
+        self.log_callback = log_callback
+        self.downloader = downloader or get_cassette().wrap_call("yfinance", _yf_download)
+        self.download_options = dict(download_options or {})
+        self.stats = {"hits": 0, "incremental": 0, "full": 0, "downloads": 0}
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    # ---------- persistence ----------
+
+    def _path(self, ticker: str, interval: str) -> str:
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+        return os.path.join(self.store_dir, interval, f"{safe}.parquet")
+
+    def _meta_path(self, ticker: str, interval: str) -> str:
+        return self._path(ticker, interval)[:-len(".parquet")] + ".meta.json"
+
+    def _load_meta(self, ticker: str, interval: str) -> Dict:
+        path = self._meta_path(ticker, interval)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError, OSError) as e:
+            self._log(f"[PRICE_STORE] [WARN] Ignoring unreadable metadata for {ticker} ({interval}): {e}")
+            return {}
+
+    def _save_meta(self, ticker: str, interval: str, entry: Dict):
+        path = self._meta_path(ticker, interval)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, indent=2)
+            os.replace(temp_path, path)
+        except (IOError, OSError) as e:
+            self._log(f"[PRICE_STORE] [WARN] Failed to save metadata for {ticker} ({interval}): {e}")
+
+    def _load(self, ticker: str, interval: str) -> Optional[pd.DataFrame]:
+        key = (ticker, interval)
+        if key in self._frames:
+            return self._frames[key]
+        path = self._path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            frame = pd.read_parquet(path)
+        except Exception as e:
+            self._log(f"[PRICE_STORE] [WARN] Discarding unreadable {ticker} ({interval}): {e}")
+            return None
+        self._frames[key] = frame
+        return frame
+
+    def _save(self, ticker: str, interval: str, frame: pd.DataFrame):
+        path = self._path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            frame.to_parquet(path)
+        except Exception as e:
+            self._log(f"[PRICE_STORE] [WARN] Failed to persist {ticker} ({interval}): {e}")
+
+    def _is_fresh(self, ticker: str, interval: str) -> bool:
+        entry = self._load_meta(ticker, interval)
+        if not entry:
+            return False
+        try:
+            fetched_at = datetime.fromisoformat(entry["fetched_at"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return (datetime.now(timezone.utc) - fetched_at).total_seconds() < self.refresh_seconds
+
+    # ---------- network ----------
+
+    @staticmethod
+    def _rescaled(existing: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+        """True when re-downloaded bars that were complete when stored no longer match their closes."""
+        if "Close" not in existing.columns or "Close" not in fresh.columns:
+            return False
+        # The last stored bar may have been an unfinished session, so it is not compared
+        settled = existing.index[existing.index < existing.index.max()]
+        fresh_close = fresh["Close"][~fresh.index.duplicated(keep='last')]
+        overlap = settled.intersection(fresh_close.index)
+        if overlap.empty:
+            return False
+        stored = existing["Close"][~existing.index.duplicated(keep='last')].loc[overlap]
+        drift = ((fresh_close.loc[overlap] - stored).abs() / stored.abs()).dropna()
+        return bool((drift > ADJUSTMENT_TOLERANCE).any())
+
+    @staticmethod
+    def _split(raw: Optional[pd.DataFrame], tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """Split a yfinance batch frame into per-ticker OHLCV frames."""
+        if raw is None or raw.empty:
+            return {}
+        if isinstance(raw.columns, pd.MultiIndex):
+            out = {}
+            level0 = set(raw.columns.get_level_values(0))
+            level1 = set(raw.columns.get_level_values(1))
+            for t in tickers:
+                if t in level0:
+                    out[t] = raw[t]
+                elif t in level1:
+                    out[t] = raw.xs(t, axis=1, level=1)
+            return out
+        return {tickers[0]: raw} if len(tickers) == 1 else {}
+
+    def _fetch(self, tickers: List[str], interval: str, mode: str, **kwargs):
+        """Download tickers in one batched call and merge them into the store."""
+        self.stats["downloads"] += 1
+        try:
+            raw = self.downloader(tickers, interval=interval, **self.download_options, **kwargs)
+        except Exception as e:
+            self._log(f"[PRICE_STORE] [WARN] Batch download failed for {len(tickers)} tickers ({interval}): {type(e).__name__}: {e}")
+            return
+
+        now_iso = datetime.now(timezone.utc).isoformat()
+        retention = pd.Timedelta(days=RETENTION_DAYS.get(interval, DEFAULT_RETENTION_DAYS))
+        new_bars = 0
+        rescaled = []
+        for ticker, fresh in self._split(raw, tickers).items():
+            fresh = fresh[[c for c in OHLCV if c in fresh.columns]].dropna(how='all')
+            if fresh.empty:
+                continue
+            existing = self._frames.get((ticker, interval)) if mode == "incremental" else None
+            if existing is not None and self._rescaled(existing, fresh):
+                rescaled.append(ticker)
+                continue
+            merged = fresh if existing is None else pd.concat([existing, fresh])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+            merged = merged[_index_utc(merged.index) >= _to_utc(datetime.now(timezone.utc)) - retention]
+
+            new_bars += len(fresh)
+            self._frames[(ticker, interval)] = merged
+            self._save(ticker, interval, merged)
+            self._save_meta(ticker, interval, {
+                "fetched_at": now_iso,
+                "rows": len(merged),
+                "first": str(merged.index[0]),
+                "last": str(merged.index[-1])
+            })
+        self.stats[mode] += len(tickers)
+        self._log(f"[PRICE_STORE] {mode.upper()} {interval}: {len(tickers)} tickers, {new_bars} bars downloaded")
+
+        if rescaled:
+            # Stored bars are on the pre-split/dividend scale; appending would leave a jump at the seam
+            self._log(f"[PRICE_STORE] History re-adjusted upstream for {rescaled} ({interval}); re-downloading in full")
+            start = min(_to_utc(self._frames[(t, interval)].index[0]) for t in rescaled)
+            self._fetch(rescaled, interval, "full", period=_covering_period(start))
+
+    # ---------- public API ----------
+
+    def history(self, tickers: Iterable[str], period: str = "3mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        Return OHLCV history per ticker, downloading only what the store lacks.
+
+        Args:
+            tickers: Yahoo symbols
+            period: yfinance-style lookback ('3mo', '1y', '5y', ...)
+            interval: Bar interval ('1h', '1d', '1wk', '1mo')
+
+        Returns:
+            Dict mapping ticker to its OHLCV frame (tickers with no data are omitted)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        required_start = _to_utc(datetime.now(timezone.utc)) - pd.Timedelta(days=PERIOD_DAYS.get(period, 93))
+        slack = pd.Timedelta(days=COVERAGE_SLACK_DAYS.get(interval, 7))
+
+        full, incremental = [], []
+        for ticker in tickers:
+            frame = self._load(ticker, interval)
+            if frame is None or frame.empty or _to_utc(frame.index[0]) > required_start + slack:
+                full.append(ticker)
+            elif self._is_fresh(ticker, interval):
+                self.stats["hits"] += 1
+            else:
+                incremental.append(ticker)
+
+        if full:
+            self._fetch(full, interval, "full", period=period)
+        if incremental:
+            # One batched call from the oldest stale ticker's second-to-last bar: the refetched,
+            # already complete bar shows whether Yahoo has re-adjusted the history since
+            start = min(_to_utc(self._frames[(t, interval)].index[max(0, len(self._frames[(t, interval)]) - 2)])
+                        for t in incremental)
+            self._fetch(incremental, interval, "incremental", start=start.strftime('%Y-%m-%d'))
+
+        result = {}
+        for ticker in tickers:
+            frame = self._frames.get((ticker, interval))
+            if frame is None or frame.empty:
+                continue
+            result[ticker] = frame[_index_utc(frame.index) >= required_start]
+        return result
+
+    def download(self, tickers: Iterable[str], period: str = "3mo", interval: str = "1d") -> Optional[pd.DataFrame]:
+        """Drop-in for yf.download(..., group_by='ticker'): columns are (ticker, field)."""
+        histories = self.history(tickers, period=period, interval=interval)
+        if not histories:
+            return None
+        return pd.concat(histories, axis=1)
+
+    def closes(self, tickers: Iterable[str], period: str = "3mo", interval: str = "1d") -> pd.DataFrame:
+        """Wide close-price matrix with one column per ticker."""
+        histories = self.history(tickers, period=period, interval=interval)
+        return pd.DataFrame({t: h["Close"] for t, h in histories.items() if "Close" in h.columns})
@@ -0,0 +1,73 @@
+"""
+Compact Prompt Encoder for GlobalMacroSignal
+
+Encodes the market matrix for the report prompt with as few tokens as possible:
+- One pipe-delimited table (header once) instead of a labelled line per indicator
+- Only narrative-relevant fields: level, daily change and trend label
+  (prev_price, change_percent, sparklines and timestamps are dropped)
+- Levels rounded to 4 significant digits, changes to 2 decimals
+- Known aliases (the same instrument under a second key, e.g. HY_BOND for HYG)
+  are skipped when the canonical indicator is present
+- Legacy line format kept for comparison and rollback
+"""
+
+from typing import Any, Mapping
+
+TABLE_HEADER = "id|level|chg%|trend"
+
+# Alias -> canonical key for instruments listed under two sectors in gms_engine.SECTORS
+INDICATOR_ALIASES = {
+    "HY_BOND": "HYG",
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+
+def format_level(value: float, digits: int = 4) -> str:
+    """Round to significant digits without scientific notation (189534.2 -> '189500')."""
+    rounded = float(f"{value:.{digits}g}")
+    return str(int(rounded)) if rounded.is_integer() else repr(rounded)
+
+
+def _has_price(item: Any) -> bool:
+    return isinstance(item, dict) and _is_number(item.get("price"))
+
+
+def encode_market_table(data: Mapping[str, Any], aliases: Mapping[str, str] = INDICATOR_ALIASES) -> str:
+    """
+    Encode indicators as a compact table.
+
+    Args:
+        data: {indicator: {"price", "daily_chg", "trend", ...}} (non-dict values are ignored)
+        aliases: {alias: canonical} keys skipped while the canonical indicator has a row
+
+    Returns:
+        Header line followed by one "ID|level|change|trend" row per distinct indicator
+    """
+    rows = [TABLE_HEADER]
+    for key, item in data.items():
+        if not _has_price(item) or _has_price(data.get(aliases.get(key))):
+            continue
+        chg = item.get("daily_chg")
+        rows.append("|".join((
+            key,
+            format_level(item["price"]),
+            f"{chg:+.2f}" if _is_number(chg) else "",
+            str(item.get("trend") or "")
+        )))
+    return "\n".join(rows) + "\n"
+
+
+def encode_market_lines(data: Mapping[str, Any]) -> str:
+    """Legacy encoding: one labelled line per indicator with current, previous and daily change."""
+    market_summary = ""
+    for k, v in data.items():
+        if isinstance(v, dict) and "price" in v:
+            p = v['price']
+            prev = v.get('prev_price', p)
+            d_chg = v.get('daily_chg', 0.0)
+            market_summary += f"- {k}: {p} (Prev: {prev}, DailyChg: {d_chg}%)\n"
+    return market_summary
+
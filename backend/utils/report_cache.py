@@ -0,0 +1,181 @@
+"""
+Input-Addressed Report Cache for GlobalMacroSignal
+
+Reuses validated AI reports while the material prompt inputs are unchanged:
+- Key = SHA-256 of the canonical JSON of the inputs (sorted keys, fixed separators)
+- Entries expire after a configurable TTL, so wording is refreshed periodically
+  even through long quiet stretches
+- Bounded number of entries (oldest evicted first), persisted as one JSON file
+- LastValidReport: small sidecar holding the most recent validated report set and
+  its hash, maintained at write time so fallbacks need no archive scan
+"""
+
+import copy
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+def canonical_key(inputs: Mapping[str, Any]) -> str:
+    """Stable hash of the inputs (independent of dict ordering)."""
+    blob = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def round_sig(value: float, digits: int = 3) -> float:
+    """Round to significant digits so sub-threshold ticks map to the same key."""
+    return float(f"{value:.{digits}g}")
+
+
+class ReportCache:
+    """TTL cache of report dicts keyed by canonical input hashes."""
+
+    def __init__(self, state_file: Optional[str] = None, ttl_seconds: int = 3600, max_entries: int = 32,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize cache.
+
+        Args:
+            state_file: Optional JSON path for persistence (None keeps it in memory)
+            ttl_seconds: Age after which an entry is no longer served (0 disables the cache)
+            max_entries: Maximum entries kept
+            log_callback: Optional logging function (default: print)
+        """
+        self.state_file = state_file
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.log_callback = log_callback
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.entries = dict(json.load(f).get("entries", {}))
+        except (json.JSONDecodeError, IOError, OSError, AttributeError) as e:
+            self._log(f"[REPORT_CACHE] [WARN] Resetting unreadable cache: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Persist entries atomically (no-op without a state file)."""
+        if not self.state_file:
+            return
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        temp_path = self.state_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"entries": self.entries}, f, ensure_ascii=False)
+            os.replace(temp_path, self.state_file)
+        except (IOError, OSError) as e:
+            self._log(f"[REPORT_CACHE] [WARN] Failed to save cache: {e}")
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a fresh entry.
+
+        Returns:
+            A copy of the cached reports, or None on a miss / expired entry
+        """
+        if self.ttl_seconds <= 0:
+            return None
+        entry = self.entries.get(key)
+        now = time.time() if now is None else now
+        if entry is None or now - entry["stored_at"] > self.ttl_seconds:
+            return None
+        return copy.deepcopy(entry["reports"])
+
+    def put(self, key: str, reports: Mapping[str, Any], now: Optional[float] = None):
+        """Store validated reports under key, dropping expired and excess entries, then persist."""
+        if self.ttl_seconds <= 0:
+            return
+        now = time.time() if now is None else now
+        self.entries.pop(key, None)
+        self.entries[key] = {"stored_at": now, "reports": copy.deepcopy(dict(reports))}
+        self.entries = {k: e for k, e in self.entries.items() if now - e["stored_at"] <= self.ttl_seconds}
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        self.save()
+
+
+class LastValidReport:
+    """Single-entry sidecar with the most recent validated report set."""
+
+    def __init__(self, state_file: str, log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize index.
+
+        Args:
+            state_file: JSON path of the sidecar
+            log_callback: Optional logging function (default: print)
+        """
+        self.state_file = state_file
+        self.log_callback = log_callback
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the sidecar.
+
+        Returns:
+            {"hash", "source", "recorded_at", "reports"} (a fresh copy on every call),
+            or None when missing, unreadable or failing its hash check
+        """
+        if not os.path.exists(self.state_file):
+            return None
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            reports = entry["reports"]
+            if not isinstance(reports, dict) or canonical_key(reports) != entry["hash"]:
+                raise ValueError("hash mismatch")
+            return entry
+        except (json.JSONDecodeError, IOError, OSError, KeyError, TypeError, ValueError) as e:
+            self._log(f"[LAST_VALID] [WARN] Ignoring unreadable index: {e}")
+            return None
+
+    def record(self, reports: Mapping[str, Any], source: str, now: Optional[float] = None) -> str:
+        """
+        Point the index at a validated report set (atomic write; unchanged sets are not rewritten).
+
+        Returns:
+            Hash of the report set
+        """
+        reports = dict(reports)
+        digest = canonical_key(reports)
+        current = self.load()
+        if current and current["hash"] == digest:
+            return digest
+        entry = {
+            "hash": digest,
+            "source": source,
+            "recorded_at": time.time() if now is None else now,
+            "reports": reports
+        }
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        temp_path = self.state_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, self.state_file)
+        except (IOError, OSError) as e:
+            self._log(f"[LAST_VALID] [WARN] Failed to save index: {e}")
+        return digest
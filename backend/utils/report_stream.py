@@ -0,0 +1,210 @@
+"""
+Streaming Report Parser for GlobalMacroSignal
+
+Validates a multilingual report JSON object while the model is still generating it:
+- Incremental parser for a flat {"LANG": "text", ...} object fed in arbitrary chunks
+  (optionally wrapped in a ```json fence)
+- Each language entry is sanitized and length-checked the moment its string closes
+- Extra keys are tolerated (non-string values are skipped without being parsed)
+- Raises ReportStreamRejected as soon as the output is clearly invalid, so the
+  caller can abort the stream and let fallbacks start early
+- Helper to pull text deltas out of Gemini streamGenerateContent SSE lines
+"""
+
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Models occasionally emit raw newlines inside strings; accept them like a lenient json.loads
+_DECODER = json.JSONDecoder(strict=False)
+
+# Non-whitespace characters tolerated before the opening brace (e.g. a ```json fence)
+MAX_PREFIX_CHARS = 16
+
+
+class ReportStreamRejected(ValueError):
+    """The streamed output can no longer become a valid report."""
+
+
+class IncrementalReportParser:
+    """Character-level state machine over a flat JSON object of string values."""
+
+    def __init__(self, required: List[str], min_chars: int = 0,
+                 sanitize: Optional[Callable[[str], str]] = None):
+        """
+        Initialize parser.
+
+        Args:
+            required: Keys (languages) that must all be present
+            min_chars: Minimum sanitized length of every required entry
+            sanitize: Optional cleanup applied to each value before the length check
+        """
+        self.required = list(required)
+        self.min_chars = min_chars
+        self.sanitize = sanitize
+        self.reports: Dict[str, str] = {}
+        self.done = False
+
+        self._state = "prefix"
+        self._prefix = 0
+        self._buf: List[str] = []
+        self._escape = False
+        self._key: Optional[str] = None
+        self._depth = 0
+        self._skip_str = False
+
+    def _decode(self) -> str:
+        raw = "".join(self._buf)
+        self._buf = []
+        try:
+            return _DECODER.decode(f'"{raw}"')
+        except json.JSONDecodeError as e:
+            raise ReportStreamRejected(f"invalid string literal: {e}")
+
+    def _accept(self, key: str, value: str):
+        if key in self.reports:
+            raise ReportStreamRejected(f"duplicate key {key}")
+        if self.sanitize is not None:
+            value = self.sanitize(value)
+        if key in self.required and len(value) < self.min_chars:
+            raise ReportStreamRejected(f"{key} report too short ({len(value)} chars)")
+        self.reports[key] = value
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Consume a text chunk.
+
+        Returns:
+            Keys completed (and validated) by this chunk
+
+        Raises:
+            ReportStreamRejected: The output is malformed or a value failed validation
+        """
+        completed = []
+        for ch in chunk:
+            state = self._state
+            if state in ("key", "value"):
+                if self._escape:
+                    self._escape = False
+                    self._buf.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._buf.append(ch)
+                elif ch == '"':
+                    text = self._decode()
+                    if state == "key":
+                        self._key, self._state = text, "colon"
+                    else:
+                        self._accept(self._key, text)
+                        completed.append(self._key)
+                        self._state = "after_value"
+                else:
+                    self._buf.append(ch)
+                continue
+            if state == "skip":
+                self._skip(ch)
+                continue
+            if ch.isspace() or state == "done":
+                continue
+            if state == "prefix":
+                if ch == "{":
+                    self._state = "key_or_end"
+                else:
+                    self._prefix += 1
+                    if self._prefix > MAX_PREFIX_CHARS:
+                        raise ReportStreamRejected("output does not start with a JSON object")
+            elif state in ("key_or_end", "key_next"):
+                if ch == '"':
+                    self._state = "key"
+                elif ch == "}" and state == "key_or_end":
+                    self._finish()
+                else:
+                    raise ReportStreamRejected(f"unexpected {ch!r} where a key was expected")
+            elif state == "colon":
+                if ch != ":":
+                    raise ReportStreamRejected(f"unexpected {ch!r} after key {self._key}")
+                self._state = "value_start"
+            elif state == "value_start":
+                if ch == '"':
+                    self._state = "value"
+                elif self._key in self.required:
+                    raise ReportStreamRejected(f"{self._key} value is not a string")
+                else:
+                    self._state, self._depth = "skip", 0
+                    self._skip(ch)
+            elif state == "after_value":
+                if ch == ",":
+                    self._state = "key_next"
+                elif ch == "}":
+                    self._finish()
+                else:
+                    raise ReportStreamRejected(f"unexpected {ch!r} after {self._key} value")
+        return completed
+
+    def _skip(self, ch: str):
+        """Pass over a non-string value of an extra key (nested objects, arrays or literals)."""
+        if self._skip_str:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._skip_str = False
+        elif ch == '"':
+            self._skip_str = True
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            if self._depth == 0:
+                if ch == "]":
+                    raise ReportStreamRejected(f"unexpected ']' in {self._key} value")
+                self._finish()  # Closing brace of the report object right after a literal
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._state = "after_value"
+        elif ch == "," and self._depth == 0:
+            self._state = "key_next"
+
+    def _finish(self):
+        self._state = "done"
+        self.done = True
+        missing = [k for k in self.required if k not in self.reports]
+        if missing:
+            raise ReportStreamRejected(f"missing languages {missing}")
+
+    def close(self) -> Dict[str, str]:
+        """
+        End of stream.
+
+        Returns:
+            The validated reports
+
+        Raises:
+            ReportStreamRejected: The object never closed or languages are missing
+        """
+        if not self.done:
+            raise ReportStreamRejected(f"stream ended inside the report object (state: {self._state})")
+        return self.reports
+
+
+def iter_sse_text(lines: Iterable[str], usage: Optional[Dict] = None) -> Iterator[str]:
+    """
+    Yield text deltas from Gemini streamGenerateContent?alt=sse lines.
+
+    Args:
+        lines: Decoded SSE lines
+        usage: Optional dict updated with each event's usageMetadata (the last event carries the totals)
+    """
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue
+        try:
+            event = json.loads(line[5:].strip())
+        except json.JSONDecodeError:
+            continue
+        if usage is not None and event.get("usageMetadata"):
+            usage.update(event["usageMetadata"])
+        for candidate in event.get("candidates", [])[:1]:
+            for part in candidate.get("content", {}).get("parts", []):
+                if part.get("text"):
+                    yield part["text"]
@@ -0,0 +1,236 @@
+"""
+Multi-Resolution Score Series Store for GlobalMacroSignal
+
+Keeps the GMS score at several resolutions so trend questions of any horizon
+are answered from a handful of pre-aggregated buckets:
+- raw: every engine run (10-minute cadence)
+- hourly / daily / weekly: rolled-up buckets with min, max, mean, first, last
+- Each append updates the current bucket of every resolution in place (O(1))
+- Trend horizons cover a time span, not a bucket count, so gaps in the run
+  cadence (weekends, holidays, outages) never stretch "1D" over several days
+- Per-resolution retention caps keep the file size constant over the years
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Buckets kept per resolution
+DEFAULT_RETENTION = {"raw": 1008, "hourly": 24 * 90, "daily": 366 * 3, "weekly": 52 * 10}
+
+# Trend horizons: label -> (resolution, time span covered by the buckets)
+HORIZONS = {
+    "1D": ("hourly", timedelta(days=1)),
+    "1W": ("daily", timedelta(days=7)),
+    "1M": ("daily", timedelta(days=30)),
+    "1Y": ("weekly", timedelta(days=365)),
+}
+
+
+def _parse(ts: Any) -> datetime:
+    if isinstance(ts, datetime):
+        dt = ts
+    else:
+        dt = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def bucket_start(resolution: str, ts: datetime) -> str:
+    """ISO start of the bucket containing ts (weeks start on Monday)."""
+    if resolution == "hourly":
+        start = ts.replace(minute=0, second=0, microsecond=0)
+    elif resolution == "daily":
+        start = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    elif resolution == "weekly":
+        start = (ts - timedelta(days=ts.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    return start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class ScoreSeriesStore:
+    """Raw points plus hourly / daily / weekly aggregates, persisted as JSON."""
+
+    ROLLUPS = ("hourly", "daily", "weekly")
+
+    def __init__(self, state_file: Optional[str] = None, retention: Optional[Dict[str, int]] = None,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize store.
+
+        Args:
+            state_file: Optional JSON path for persistence (None keeps it in memory)
+            retention: Buckets kept per resolution (default: DEFAULT_RETENTION)
+            log_callback: Optional logging function (default: print)
+        """
+        self.state_file = state_file
+        self.retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        self.log_callback = log_callback
+        self.series: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self.retention}
+        self._load()
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            for name in self.series:
+                self.series[name] = list(state.get(name, []))
+        except (json.JSONDecodeError, IOError, OSError) as e:
+            self._log(f"[SERIES] [WARN] Resetting unreadable store: {e}")
+
+    def save(self):
+        """Persist all resolutions atomically (no-op without a state file)."""
+        if not self.state_file:
+            return
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        temp_path = self.state_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.series, f)
+            os.replace(temp_path, self.state_file)
+        except (IOError, OSError) as e:
+            self._log(f"[SERIES] [WARN] Failed to save store: {e}")
+
+    def __len__(self) -> int:
+        return len(self.series["raw"])
+
+    def _trim(self, name: str):
+        excess = len(self.series[name]) - self.retention[name]
+        if excess > 0:
+            del self.series[name][:excess]
+
+    def _roll(self, name: str, start: str, value: float):
+        buckets = self.series[name]
+        if buckets and buckets[-1]["start"] == start:
+            b = buckets[-1]
+            b["min"] = min(b["min"], value)
+            b["max"] = max(b["max"], value)
+            b["sum"] += value
+            b["count"] += 1
+            b["last"] = value
+        elif buckets and buckets[-1]["start"] > start:
+            return  # Out-of-order points are only kept at raw resolution
+        else:
+            buckets.append({"start": start, "min": value, "max": value, "sum": value, "count": 1, "first": value, "last": value})
+            self._trim(name)
+
+    def append(self, timestamp: Any, score: float):
+        """
+        Record a score and update the current bucket at every resolution.
+
+        Args:
+            timestamp: datetime or ISO string (UTC assumed when naive)
+            score: GMS score
+        """
+        ts = _parse(timestamp)
+        iso = ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+        raw = self.series["raw"]
+        if raw and raw[-1]["timestamp"] == iso:
+            return
+        raw.append({"timestamp": iso, "score": score})
+        self._trim("raw")
+        for name in self.ROLLUPS:
+            self._roll(name, bucket_start(name, ts), float(score))
+
+    def seed_daily(self, points: Iterable[Tuple[str, float]]) -> int:
+        """
+        Back-fill daily and weekly buckets from one score per day (e.g., archive summary).
+
+        Days already covered by a daily bucket are skipped.
+
+        Returns:
+            Number of days added
+        """
+        covered = {b["start"] for b in self.series["daily"]}
+        added = {}
+        for day, score in points:
+            start = bucket_start("daily", _parse(f"{day[:10]}T00:00:00Z"))
+            if start not in covered and isinstance(score, (int, float)):
+                added[start] = float(score)
+        if not added:
+            return 0
+        self.series["daily"] = sorted(
+            self.series["daily"] + [{"start": s, "min": v, "max": v, "sum": v, "count": 1, "first": v, "last": v} for s, v in added.items()],
+            key=lambda b: b["start"]
+        )
+        self._trim("daily")
+
+        # Rebuild only the weeks that received new days
+        touched = {bucket_start("weekly", _parse(s)) for s in added}
+        rebuilt: Dict[str, Dict[str, Any]] = {}
+        for b in self.series["daily"]:
+            start = bucket_start("weekly", _parse(b["start"]))
+            if start not in touched:
+                continue
+            w = rebuilt.get(start)
+            if w is None:
+                rebuilt[start] = dict(b, start=start)
+            else:
+                w.update(min=min(w["min"], b["min"]), max=max(w["max"], b["max"]),
+                         sum=w["sum"] + b["sum"], count=w["count"] + b["count"], last=b["last"])
+        kept = [w for w in self.series["weekly"] if w["start"] not in touched]
+        self.series["weekly"] = sorted(kept + list(rebuilt.values()), key=lambda b: b["start"])
+        self._trim("weekly")
+        return len(added)
+
+    def window(self, resolution: str, n: int) -> List[Dict[str, Any]]:
+        """Last n buckets (or raw points) of a resolution."""
+        return self.series[resolution][-n:] if n > 0 else []
+
+    def since(self, resolution: str, start: datetime) -> List[Dict[str, Any]]:
+        """Buckets (or raw points) of a resolution starting at or after start."""
+        cutoff = _parse(start).strftime("%Y-%m-%dT%H:%M:%SZ")
+        field = "timestamp" if resolution == "raw" else "start"
+        return [b for b in self.series[resolution] if b[field] >= cutoff]
+
+    def trend(self, resolution: str, span: timedelta, now: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Summarize the buckets of a resolution that start within span of now.
+
+        Args:
+            resolution: 'raw', 'hourly', 'daily' or 'weekly'
+            span: Horizon length
+            now: End of the horizon (default: current UTC time)
+
+        Returns:
+            {from, to, delta, min, max, mean, buckets} or None without data in the span
+        """
+        end = datetime.now(timezone.utc) if now is None else _parse(now)
+        buckets = self.since(resolution, end - span)
+        if not buckets:
+            return None
+        if resolution == "raw":
+            values = [p["score"] for p in buckets]
+            low, high, total, count = min(values), max(values), sum(values), len(values)
+            first, last = values[0], values[-1]
+        else:
+            low = min(b["min"] for b in buckets)
+            high = max(b["max"] for b in buckets)
+            total = sum(b["sum"] for b in buckets)
+            count = sum(b["count"] for b in buckets)
+            first, last = buckets[0]["first"], buckets[-1]["last"]
+        return {
+            "from": first, "to": last, "delta": round(last - first, 2),
+            "min": low, "max": high, "mean": round(total / count, 2), "buckets": len(buckets)
+        }
+
+    def horizons(self, horizons: Optional[Dict[str, Tuple[str, timedelta]]] = None,
+                 now: Any = None) -> Dict[str, Dict[str, Any]]:
+        """Trend summary for each named horizon that has data within its span."""
+        out = {}
+        for label, (resolution, span) in (horizons or HORIZONS).items():
+            summary = self.trend(resolution, span, now)
+            if summary is not None:
+                out[label] = summary
+        return out
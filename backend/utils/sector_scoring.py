@@ -0,0 +1,136 @@
+"""
+Vectorized Sector Scoring for GlobalMacroSignal
+
+NumPy implementation of the per-sector 0-100 score:
+- SECTORS weights and invert flags compiled once into (sector x indicator) matrices
+- Market snapshots packed into (snapshot x indicator) arrays
+- Every sector of every snapshot scored in a single matrix product
+
+Scoring rule (identical to the original per-ticker loop):
+    daily  = +5 if change_percent > 0 else -5
+    trend  = 0.5 * (last - MA30) / MA30 * 100   (only with >= 30 sparkline points)
+    impact = sign * (0.6 * daily + 0.4 * trend)  (sign = -1 for inverted indicators)
+    score  = clip(50 + sum(impact * weight * 5), 0, 100), truncated to int
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+MA_WINDOW = 30
+
+
+class SnapshotArrays(NamedTuple):
+    """Indicator inputs for N snapshots over the scorer's K indicator keys."""
+    change: np.ndarray     # (N, K) change_percent, 0 where absent
+    present: np.ndarray    # (N, K) bool, indicator usable in the snapshot
+    trend_pct: np.ndarray  # (N, K) % distance of last point from its 30-point MA, 0 if unavailable
+
+
+class SectorScorer:
+    """Scores all sectors across a stack of market_data snapshots at once."""
+
+    def __init__(self, sectors: Mapping[str, Mapping[str, Any]]):
+        """
+        Compile sector configuration into arrays.
+
+        Args:
+            sectors: SECTORS-style mapping {sector: {"weights": {key: w}, "invert": [keys]}}
+        """
+        self.sector_names: List[str] = list(sectors)
+        keys: Dict[str, int] = {}
+        for config in sectors.values():
+            for key in config.get("weights", {}):
+                keys.setdefault(key, len(keys))
+        self.keys: List[str] = list(keys)
+
+        self.weights = np.zeros((len(self.sector_names), len(self.keys)))
+        self.signs = np.ones_like(self.weights)
+        for s, name in enumerate(self.sector_names):
+            config = sectors[name]
+            invert = set(config.get("invert", []))
+            for key, weight in config.get("weights", {}).items():
+                self.weights[s, keys[key]] = weight
+                if key in invert:
+                    self.signs[s, keys[key]] = -1.0
+
+    def weight_matrix(self, overrides: Optional[Mapping[str, Mapping[str, float]]] = None) -> np.ndarray:
+        """
+        Return the (S, K) weight matrix, optionally with per-sector weight overrides.
+
+        Args:
+            overrides: {sector: {key: weight}} replacing those sectors' weights
+                (keys must already be scored by some sector)
+        """
+        if not overrides:
+            return self.weights
+        weights = self.weights.copy()
+        index = {k: i for i, k in enumerate(self.keys)}
+        for sector, sector_weights in overrides.items():
+            s = self.sector_names.index(sector)
+            weights[s] = 0.0
+            for key, weight in sector_weights.items():
+                weights[s, index[key]] = weight
+        return weights
+
+    def pack(self, snapshots: Iterable[Mapping[str, Any]]) -> SnapshotArrays:
+        """
+        Pack market_data snapshots into arrays (the only per-snapshot Python pass).
+
+        Indicators without a numeric change_percent are treated as absent.
+        """
+        snapshots = list(snapshots)
+        n, k = len(snapshots), len(self.keys)
+        change = np.zeros((n, k))
+        present = np.zeros((n, k), dtype=bool)
+        tails = np.full((n, k, MA_WINDOW), np.nan)
+
+        for i, data in enumerate(snapshots):
+            for j, key in enumerate(self.keys):
+                item = data.get(key)
+                if not isinstance(item, Mapping):
+                    continue
+                chg = item.get("change_percent")
+                if not isinstance(chg, (int, float)):
+                    continue
+                change[i, j] = chg
+                present[i, j] = True
+                spark = item.get("sparkline") or []
+                if len(spark) >= MA_WINDOW:
+                    try:
+                        tails[i, j] = np.asarray(spark[-MA_WINDOW:], dtype=float)
+                    except (TypeError, ValueError):
+                        pass
+
+        ma = tails.mean(axis=2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trend_pct = (tails[:, :, -1] - ma) / ma * 100
+        trend_pct = np.where(np.isfinite(trend_pct), trend_pct, 0.0)
+        return SnapshotArrays(change, present, trend_pct)
+
+    def score_arrays(self, arrays: SnapshotArrays, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Score packed snapshots.
+
+        Args:
+            arrays: Output of pack()
+            weights: Optional (S, K) or (P, S, K) weight matrices (default: compiled SECTORS)
+
+        Returns:
+            int array (N, S), or (P, N, S) for a stack of weight matrices
+        """
+        weights = self.weights if weights is None else weights
+        daily = np.where(arrays.change > 0, 5.0, -5.0)
+        base = np.where(arrays.present, 0.6 * daily + 0.4 * 0.5 * arrays.trend_pct, 0.0)  # (N, K)
+        signed = weights * self.signs * 5.0                                              # (..., S, K)
+        raw = 50.0 + base @ np.swapaxes(signed, -1, -2)                                   # (..., N, S)
+        return np.floor(np.clip(raw, 0, 100)).astype(int)
+
+    def score_many(self, snapshots: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        """Score a stack of market_data snapshots; returns int array (N, S)."""
+        return self.score_arrays(self.pack(snapshots))
+
+    def score(self, market_data: Mapping[str, Any]) -> Dict[str, int]:
+        """Score every sector of a single snapshot."""
+        row = self.score_many([market_data])[0]
+        return {name: int(v) for name, v in zip(self.sector_names, row)}
@@ -1,10 +1,11 @@
 /* eslint-disable @typescript-eslint/no-unused-vars */
 import { generateText } from 'ai';
-import { gateway } from '@ai-sdk/gateway';
-import { google } from '@ai-sdk/google';
+import { createGateway, gateway as defaultGateway } from '@ai-sdk/gateway';
+import { createGoogleGenerativeAI, google as defaultGoogle } from '@ai-sdk/google';
 import * as dotenv from 'dotenv';
 import * as fs from 'fs';
 import * as path from 'path';
+import * as readline from 'readline';
 
 // Load environment variables strictly before any SDK calls
 const envPath = path.resolve(__dirname, '../../.env');
@@ -22,6 +23,17 @@ if (process.env.GEMINI_API_KEY && !process.env.GOOGLE_GENERATIVE_AI_API_KEY) {
     process.env.GOOGLE_GENERATIVE_AI_API_KEY = process.env.GEMINI_API_KEY;
 }
 
+// Base-URL overrides (set by the Python bridge from backend/utils/endpoints.py) so load tests
+// against stub_provider_server.py never reach the real Gemini API or the Vercel gateway
+const GEMINI_BASE_URL = process.env.GEMINI_BASE_URL?.replace(/\/+$/, '');
+const AI_GATEWAY_BASE_URL = process.env.AI_GATEWAY_BASE_URL?.replace(/\/+$/, '');
+const google = GEMINI_BASE_URL
+    ? createGoogleGenerativeAI({ baseURL: `${GEMINI_BASE_URL}/v1beta` })
+    : defaultGoogle;
+const gateway = AI_GATEWAY_BASE_URL
+    ? createGateway({ baseURL: `${AI_GATEWAY_BASE_URL}/v1/ai` })
+    : defaultGateway;
+
 const getPrompt = async () => {
     const args = process.argv.slice(2);
     if (args.length > 0) {
@@ -43,44 +55,58 @@ const getPrompt = async () => {
     });
 };
 
-async function main() {
-    // PHYSICAL GUARD: Prevent rapid consecutive calls (1 min cooldown)
-    const guardFile = path.resolve(__dirname, '../../.ai_guard');
+// PHYSICAL GUARD: Prevent rapid consecutive calls (shared with one-shot runs via the guard file)
+const GUARD_FILE = path.resolve(__dirname, '../../.ai_guard');
+// Reduced to 5s to allow sequential GMS -> News execution
+const GUARD_MS = 5000;
+
+// Returns the remaining cooldown in ms, or 0 after recording this call
+const checkGuard = (): number => {
     const now = Date.now();
     try {
-        if (fs.existsSync(guardFile)) {
-            const lastRun = parseInt(fs.readFileSync(guardFile, 'utf8'));
-            // Reduced to 5s to allow sequential GMS -> News execution
-            if (now - lastRun < 5000) {
-                console.error(`[AI GUARD] Rapid call detected. Cooling down... (${Math.round((5000 - (now - lastRun)) / 1000)}s remaining)`);
-                process.exit(1);
+        if (fs.existsSync(GUARD_FILE)) {
+            const lastRun = parseInt(fs.readFileSync(GUARD_FILE, 'utf8'));
+            if (now - lastRun < GUARD_MS) {
+                return GUARD_MS - (now - lastRun);
             }
         }
-        fs.writeFileSync(guardFile, now.toString());
+        fs.writeFileSync(GUARD_FILE, now.toString());
     } catch (e) { }
+    return 0;
+};
 
-    const prompt = await getPrompt();
+// DEFINED MODEL PAIRS (User Specification)
+// Structure: { vercel: "google/...", direct: "..." }
 
-    // DEFINED MODEL PAIRS (User Specification)
-    // Structure: { vercel: "google/...", direct: "..." }
+interface ModelPair {
+    vercel: string;
+    direct: string;
+}
+
+const GMS_MODELS: ModelPair[] = [
+    { vercel: 'google/gemini-3-flash-preview', direct: 'gemini-3-flash-preview' },           // Priority 1
+    { vercel: 'google/gemini-2.5-flash', direct: 'gemini-2.5-flash' },       // Priority 2
+    { vercel: 'google/gemini-2.5-flash-lite', direct: 'gemini-2.5-flash-lite' } // Priority 3
+];
+
+const NEWS_MODELS: ModelPair[] = [
+    { vercel: 'google/gemini-2.5-flash-lite', direct: 'gemini-2.5-flash-lite' }, // Priority 1
+    { vercel: 'google/gemini-2.5-flash', direct: 'gemini-2.5-flash-TTS' },       // Priority 2
+    { vercel: 'google/gemini-3-flash', direct: 'gemini-2.5-flash' }              // Priority 3 (Standard Flash as Fallback)
+];
 
-    interface ModelPair {
-        vercel: string;
-        direct: string;
-    }
 
-    const GMS_MODELS: ModelPair[] = [
-        { vercel: 'google/gemini-3-flash-preview', direct: 'gemini-3-flash-preview' },           // Priority 1
-        { vercel: 'google/gemini-2.5-flash', direct: 'gemini-2.5-flash' },       // Priority 2
-        { vercel: 'google/gemini-2.5-flash-lite', direct: 'gemini-2.5-flash-lite' } // Priority 3
-    ];
+// Model calls actually sent for one prompt (the Python AI governor charges each of them)
+interface CallStats {
+    calls: number;
+    tokens: number;
+}
 
-    const NEWS_MODELS: ModelPair[] = [
-        { vercel: 'google/gemini-2.5-flash-lite', direct: 'gemini-2.5-flash-lite' }, // Priority 1
-        { vercel: 'google/gemini-2.5-flash', direct: 'gemini-2.5-flash-TTS' },       // Priority 2
-        { vercel: 'google/gemini-3-flash', direct: 'gemini-2.5-flash' }              // Priority 3 (Standard Flash as Fallback)
-    ];
+const usageTokens = (usage: any): number =>
+    usage?.totalTokens ?? ((usage?.inputTokens ?? 0) + (usage?.outputTokens ?? 0));
 
+// Runs the model loop (Gateway first, Direct fallback per pair); throws when every candidate fails
+async function generateInsight(prompt: string, stats: CallStats = { calls: 0, tokens: 0 }): Promise<string> {
     const isNewsTask = /translator|Translate/i.test(prompt);
     const candidates: ModelPair[] = isNewsTask ? NEWS_MODELS : GMS_MODELS;
 
@@ -90,11 +116,10 @@ async function main() {
         const pair = candidates[i];
         console.error(`[AI LOOP] Attempt ${i + 1}/${candidates.length}: Vercel=${pair.vercel} | Direct=${pair.direct}`);
 
-        let result;
         try {
             // TRIAL 1: Vercel AI Gateway
-            // console.error(`[AI GATEWAY] Trying ${pair.vercel}...`);
-            result = await generateText({
+            stats.calls++;
+            const result = await generateText({
                 model: gateway.languageModel(pair.vercel),
                 prompt: prompt,
                 headers: {
@@ -103,40 +128,122 @@ async function main() {
                 }
             });
             console.error(`[AI GATEWAY] Success: ${pair.vercel} completed.`);
+            stats.tokens += usageTokens(result.usage);
+            return result.text;
 
         } catch (error: any) {
             const errorMsg = error.message || String(error);
             console.error(`[AI GATEWAY] FAILED (${pair.vercel}): ${errorMsg}`);
+        }
 
-            // TRIAL 2: Direct Google API Fallback
-            console.error(`[AI DIRECT] Failing over to Google Native (${pair.direct})...`);
-            try {
-                // Determine model for google SDK
-                // Note: google() SDK usually takes the model name without 'models/' prefix.
-                result = await generateText({
-                    model: google(pair.direct),
-                    prompt: prompt
-                });
-                console.error(`[AI DIRECT] Success: ${pair.direct} secured via Direct API.`);
-            } catch (directError: any) {
-                console.error(`[AI DIRECT] FAILED (${pair.direct}): ${directError.message}`);
-
-                if (i === candidates.length - 1) {
-                    console.error(`[AI FATAL] All candidates failed.`);
-                    process.exit(1);
-                } else {
-                    console.error(`[AI LOOP] Switching to next priority...`);
-                    continue; // Next candidate
-                }
+        // TRIAL 2: Direct Google API Fallback
+        console.error(`[AI DIRECT] Failing over to Google Native (${pair.direct})...`);
+        try {
+            // Note: google() SDK usually takes the model name without 'models/' prefix.
+            stats.calls++;
+            const result = await generateText({
+                model: google(pair.direct),
+                prompt: prompt
+            });
+            console.error(`[AI DIRECT] Success: ${pair.direct} secured via Direct API.`);
+            stats.tokens += usageTokens(result.usage);
+            return result.text;
+        } catch (directError: any) {
+            console.error(`[AI DIRECT] FAILED (${pair.direct}): ${directError.message}`);
+            if (i < candidates.length - 1) {
+                console.error(`[AI LOOP] Switching to next priority...`);
             }
         }
+    }
+    throw new Error('All candidates failed.');
+}
 
-        if (result) {
-            // Output ONLY the raw text for Python to capture
-            process.stdout.write(JSON.stringify({ text: result.text }) + '\n');
-            return; // Exit main function successfully
-        }
+// One-shot mode: prompt via args/stdin, a single {"text": ...} line on stdout
+async function main() {
+    const remaining = checkGuard();
+    if (remaining > 0) {
+        console.error(`[AI GUARD] Rapid call detected. Cooling down... (${Math.round(remaining / 1000)}s remaining)`);
+        process.exit(1);
+    }
+
+    const prompt = await getPrompt();
+
+    try {
+        const text = await generateInsight(prompt);
+        // Output ONLY the raw text for Python to capture
+        process.stdout.write(JSON.stringify({ text }) + '\n');
+    } catch (e: any) {
+        console.error(`[AI FATAL] ${e.message}`);
+        process.exit(1);
     }
 }
 
-main();
+// Worker mode (--worker): long-lived process speaking JSON lines on stdin/stdout.
+//   request:  {"id": 1, "prompt": "..."}  |  {"id": 2, "op": "ping"}
+//   response: {"id": 1, "text": "...", "calls": 2, "tokens": 812}  |  {"id": 1, "error": "...", "calls": 6}
+//             |  {"id": 2, "ok": true}
+// "calls" counts the model calls sent for the prompt and "tokens" the usage they reported.
+// Requests are handled concurrently; responses carry the request id and may arrive out of order.
+// The guard cooldown delays requests instead of rejecting them. When stdin closes (bridge shutdown),
+// in-flight requests are still answered before the process exits.
+async function runWorker() {
+    const send = (msg: object) => process.stdout.write(JSON.stringify(msg) + '\n');
+    let guardChain: Promise<void> = Promise.resolve();
+
+    const waitForGuard = () => {
+        guardChain = guardChain.then(async () => {
+            let remaining: number;
+            while ((remaining = checkGuard()) > 0) {
+                await new Promise(resolve => setTimeout(resolve, remaining));
+            }
+        });
+        return guardChain;
+    };
+
+    const handle = async (line: string) => {
+        let request: any;
+        try {
+            request = JSON.parse(line);
+        } catch (e) {
+            console.error(`[AI WORKER] Ignoring malformed request line: ${line.slice(0, 100)}`);
+            return;
+        }
+        if (request.op === 'ping') {
+            send({ id: request.id, ok: true, pid: process.pid });
+            return;
+        }
+        const stats: CallStats = { calls: 0, tokens: 0 };
+        try {
+            if (typeof request.prompt !== 'string' || !request.prompt.trim()) {
+                throw new Error('No prompt provided.');
+            }
+            await waitForGuard();
+            const text = await generateInsight(request.prompt, stats);
+            send({ id: request.id, text, ...stats });
+        } catch (e: any) {
+            send({ id: request.id, error: e.message || String(e), calls: stats.calls });
+        }
+    };
+
+    console.error(`[AI WORKER] Ready (pid ${process.pid}).`);
+    const inflight = new Set<Promise<void>>();
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+    rl.on('line', line => {
+        if (!line.trim()) return;
+        const task: Promise<void> = handle(line).finally(() => inflight.delete(task));
+        inflight.add(task);
+    });
+    rl.on('close', async () => {
+        if (inflight.size > 0) {
+            console.error(`[AI WORKER] Input closed, draining ${inflight.size} in-flight request(s)...`);
+            await Promise.allSettled([...inflight]);
+        }
+        process.exit(0);
+    });
+}
+
+if (process.argv.includes('--worker')) {
+    runWorker();
+} else {
+    main();
+}
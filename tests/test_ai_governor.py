@@ -0,0 +1,154 @@
+"""
+Unit tests for the cross-process AI budget governor.
+
+Tests:
+- Requests per window are capped, and bulk callers only get their share
+- Token reservations are capped and settled with actual usage and model calls
+- A queued engine caller preempts queued bulk callers
+- Timeouts, cancellation and 429 cooldowns raise BudgetExceeded
+- A bulk 429 cooldown holds back bulk callers only, never the engine
+- A route's 429 cooldown leaves the alternate routes usable
+- Governors on the same file (separate processes in production) share the ledger
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.ai_governor import (
+    PRIORITY_BULK, PRIORITY_ENGINE, PRIORITY_NEWS, AIGovernor, BudgetExceeded, usage_tokens
+)
+
+
+def _quiet(msg):
+    pass
+
+
+class TestAIGovernor:
+    """Test suite for AIGovernor."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "cache", "ai_governor.sqlite")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _governor(self, **kwargs):
+        kwargs.setdefault("rpm_limit", 4)
+        return AIGovernor(self.db_path, log_callback=_quiet, **kwargs)
+
+    def test_request_cap_and_bulk_share(self):
+        """Test bulk stops at half the window while the engine may use all of it."""
+        gov = self._governor()
+        gov.acquire("wiki", PRIORITY_BULK)
+        gov.acquire("wiki", PRIORITY_BULK)
+        with pytest.raises(BudgetExceeded, match="2/2 requests"):
+            gov.acquire("wiki", PRIORITY_BULK, timeout=0)
+        gov.acquire("engine", PRIORITY_ENGINE, timeout=0)
+        gov.acquire("engine", PRIORITY_ENGINE, timeout=0)
+        with pytest.raises(BudgetExceeded):
+            gov.acquire("engine", PRIORITY_ENGINE, timeout=0)
+        assert gov.usage()["requests"] == 4
+
+    def test_window_expiry_frees_slots(self):
+        """Test slots return once the oldest entries leave the window."""
+        gov = self._governor(rpm_limit=1, window_seconds=0.3)
+        gov.acquire("engine", PRIORITY_ENGINE)
+        start = time.monotonic()
+        gov.acquire("engine", PRIORITY_ENGINE, timeout=5)
+        assert time.monotonic() - start >= 0.2
+
+    def test_token_cap_and_settle(self):
+        """Test reservations count against the token budget until settled with real usage."""
+        gov = self._governor(rpm_limit=100, tpm_limit=1000)
+        lease = gov.acquire("news", PRIORITY_ENGINE, tokens=900)
+        with pytest.raises(BudgetExceeded, match="tokens"):
+            gov.acquire("news", PRIORITY_ENGINE, tokens=200, timeout=0)
+        lease.settle(usage_tokens({"promptTokenCount": 300, "candidatesTokenCount": 100, "totalTokenCount": 400}))
+        gov.acquire("news", PRIORITY_ENGINE, tokens=200, timeout=0)
+        assert gov.usage()["tokens"] == 600
+
+    def test_settle_charges_extra_calls(self):
+        """Test a request that sent several model calls uses that many slots."""
+        gov = self._governor(rpm_limit=4)
+        gov.acquire("news", PRIORITY_NEWS, tokens=500).settle(None, requests=3)
+        assert gov.usage()["requests"] == 3
+        assert gov.usage()["tokens"] == 500
+        with pytest.raises(BudgetExceeded, match="3/3 requests"):
+            gov.acquire("news", PRIORITY_NEWS, timeout=0)
+
+    def test_engine_preempts_queued_bulk(self):
+        """Test a waiting engine call is granted before bulk calls queued earlier."""
+        gov = self._governor(rpm_limit=2, window_seconds=0.5)
+        gov.acquire("engine", PRIORITY_ENGINE)
+        gov.acquire("engine", PRIORITY_ENGINE)
+        order = []
+
+        def run(caller, priority):
+            self._governor(rpm_limit=2, window_seconds=0.5).acquire(caller, priority, timeout=10)
+            order.append(caller)
+
+        bulk = threading.Thread(target=run, args=("wiki", PRIORITY_BULK))
+        bulk.start()
+        time.sleep(0.1)
+        engine = threading.Thread(target=run, args=("engine", PRIORITY_ENGINE))
+        engine.start()
+        bulk.join()
+        engine.join()
+        assert order == ["engine", "wiki"]
+
+    def test_cancel_and_cooldown(self):
+        """Test a set cancel event abandons the wait and an engine 429 cooldown blocks every priority."""
+        gov = self._governor(rpm_limit=1)
+        gov.acquire("engine", PRIORITY_ENGINE)
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+        with pytest.raises(BudgetExceeded, match="cancelled"):
+            gov.acquire("engine", PRIORITY_ENGINE, timeout=10, cancel=cancel)
+
+        other = AIGovernor(os.path.join(self.temp_dir, "other.sqlite"), log_callback=_quiet)
+        other.penalize(30, "engine", PRIORITY_ENGINE)
+        with pytest.raises(BudgetExceeded, match="cooldown"):
+            other.acquire("engine", PRIORITY_ENGINE, timeout=0.1)
+        with pytest.raises(BudgetExceeded, match="cooldown"):
+            other.acquire("wiki", PRIORITY_BULK, timeout=0.1)
+        assert other.usage()["cooldown"] > 25
+
+    def test_bulk_cooldown_spares_the_engine(self):
+        """Test a wiki 429 backs off bulk callers while the engine and news proceed."""
+        gov = self._governor()
+        gov.penalize(30, "wiki", PRIORITY_BULK)
+        gov.acquire("engine", PRIORITY_ENGINE, timeout=0)
+        gov.acquire("news", PRIORITY_NEWS, timeout=0)
+        with pytest.raises(BudgetExceeded, match="cooldown"):
+            gov.acquire("wiki", PRIORITY_BULK, timeout=0.1)
+        assert gov.usage()["cooldowns"] == {"*": {PRIORITY_BULK: pytest.approx(30, abs=1)}}
+
+    def test_route_cooldown_spares_alternate_routes(self):
+        """Test a gateway 429 cools that route only, so the direct candidate gets a slot at once."""
+        gov = self._governor()
+        gov.penalize(30, "engine:gateway:flash", PRIORITY_ENGINE, scope="gateway:flash")
+        start = time.monotonic()
+        gov.acquire("engine:direct:flash", PRIORITY_ENGINE, timeout=0, scope="direct:flash")
+        gov.acquire("engine:gateway:lite", PRIORITY_ENGINE, timeout=0, scope="gateway:lite")
+        assert time.monotonic() - start < 0.5
+        with pytest.raises(BudgetExceeded, match="cooldown"):
+            gov.acquire("engine:gateway:flash", PRIORITY_ENGINE, timeout=0.1, scope="gateway:flash")
+        with pytest.raises(BudgetExceeded, match="cooldown"):
+            gov.acquire("news", PRIORITY_NEWS, timeout=0.1, scope="gateway:flash")
+        assert set(gov.usage()["cooldowns"]) == {"gateway:flash"}
+
+    def test_instances_share_the_ledger(self):
+        """Test separate governors on one file see each other's requests."""
+        self._governor().acquire("news", PRIORITY_NEWS)
+        self._governor().acquire("news", PRIORITY_NEWS)
+        assert self._governor().usage()["requests"] == 2
@@ -0,0 +1,83 @@
+"""
+Unit tests for the streaming EWMA anomaly detector.
+
+Tests:
+- Stable series are never flagged
+- A bad print is flagged and does not move the baseline
+- A persisting level shift is eventually accepted
+- State persists across instances
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.anomaly_detector import EwmaAnomalyDetector
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestEwmaAnomalyDetector:
+    """Test suite for EwmaAnomalyDetector."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "ewma.json")
+        self.rng = random.Random(11)
+
+    def teardown_method(self):
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _warm(self, detector, runs=30):
+        for _ in range(runs):
+            assert detector.observe({
+                "VIX": 16 + self.rng.gauss(0, 0.3),
+                "BTC": 90000 + self.rng.gauss(0, 400),
+                "YIELD_SPREAD": 0.05 + self.rng.gauss(0, 0.01)
+            }) == {}
+
+    def test_bad_print_flagged_without_moving_baseline(self):
+        """Test a 10x print is flagged and the mean stays put."""
+        detector = EwmaAnomalyDetector(log_callback=_quiet)
+        self._warm(detector)
+        mean_before = detector.state[detector.keys["BTC"], 0]
+        flagged = detector.observe({"VIX": 16.1, "BTC": 900000, "YIELD_SPREAD": 0.06})
+        assert list(flagged) == ["BTC"]
+        assert flagged["BTC"]["z"] > 6
+        assert detector.state[detector.keys["BTC"], 0] == mean_before
+
+    def test_level_shift_accepted(self):
+        """Test a level that persists for accept_after runs becomes the new baseline."""
+        detector = EwmaAnomalyDetector(accept_after=3, log_callback=_quiet)
+        self._warm(detector)
+        assert "VIX" in detector.observe({"VIX": 45})
+        assert "VIX" in detector.observe({"VIX": 45})
+        assert detector.observe({"VIX": 45}) == {}
+        assert detector.state[detector.keys["VIX"], 0] == 45
+        assert detector.observe({"VIX": 45.5}) == {}
+
+    def test_persistence(self):
+        """Test warmed-up state survives a reload."""
+        detector = EwmaAnomalyDetector(self.state_file, log_callback=_quiet)
+        self._warm(detector)
+        detector.save()
+        reloaded = EwmaAnomalyDetector(self.state_file, log_callback=_quiet)
+        assert "VIX" in reloaded.observe({"VIX": 80})
+
+    def test_ignores_non_numeric(self):
+        """Test None / strings / NaN are skipped."""
+        detector = EwmaAnomalyDetector(log_callback=_quiet)
+        assert detector.observe({"A": None, "B": "n/a", "C": float("nan")}) == {}
+        assert detector.keys == {}
@@ -0,0 +1,124 @@
+"""
+Unit tests for batched retry and the persistent circuit breaker.
+
+Tests:
+- All failed keys are retried together in one call per attempt
+- Exponential backoff between attempts
+- A deadline caps attempts and sleeps, and an exhausted budget skips the retry
+- Breaker opens after repeated failures and persists across instances
+- Open keys are skipped until the cooldown passes
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.batch_retry import CircuitBreaker, retry_batched
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestRetryBatched:
+    """Test suite for retry_batched."""
+
+    def setup_method(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.test_dir, "breaker.json")
+        self.sleeps = []
+
+    def teardown_method(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_single_batched_call_per_attempt(self):
+        """Test missing keys are requested together, not one by one."""
+        calls = []
+
+        def fetch(keys):
+            calls.append(list(keys))
+            return {k: 1.0 for k in keys}
+
+        recovered = retry_batched(fetch, ["SPY", "HYG", "GC=F"], sleep=self.sleeps.append, log_callback=_quiet)
+        assert recovered == {"SPY": 1.0, "HYG": 1.0, "GC=F": 1.0}
+        assert calls == [["SPY", "HYG", "GC=F"]]
+        assert self.sleeps == []
+
+    def test_exponential_backoff_on_remaining_keys(self):
+        """Test only still-missing keys are retried, with growing delays."""
+        calls = []
+
+        def fetch(keys):
+            calls.append(list(keys))
+            return {"SPY": 1.0} if "SPY" in keys else {}
+
+        recovered = retry_batched(fetch, ["SPY", "BAD"], attempts=3, base_delay=2.0, backoff=2.0,
+                                  sleep=self.sleeps.append, log_callback=_quiet)
+        assert recovered == {"SPY": 1.0}
+        assert calls == [["SPY", "BAD"], ["BAD"], ["BAD"]]
+        assert self.sleeps == [2.0, 4.0]
+
+    def test_deadline_caps_attempts_and_sleeps(self):
+        """Test no backoff is slept and no attempt started past the remaining budget."""
+        now = [0.0]
+        calls = []
+
+        def sleep(delay):
+            self.sleeps.append(delay)
+            now[0] += delay
+
+        def fetch(keys):
+            calls.append(list(keys))
+            now[0] += 1.0
+            return {}
+
+        retry_batched(fetch, ["BAD"], attempts=3, base_delay=2.0, backoff=2.0, deadline=5.0,
+                      sleep=sleep, clock=lambda: now[0], log_callback=_quiet)
+        assert calls == [["BAD"], ["BAD"]]
+        assert self.sleeps == [2.0]
+
+    def test_exhausted_budget_skips_retry(self):
+        """Test a spent budget makes no call and does not count against the breaker."""
+        breaker = CircuitBreaker(self.state_file, failure_threshold=1, log_callback=_quiet)
+        calls = []
+        recovered = retry_batched(lambda keys: calls.append(keys) or {}, ["SPY"], deadline=0,
+                                  breaker=breaker, log_callback=_quiet)
+        assert recovered == {} and calls == []
+        assert breaker.allow("SPY")
+
+    def test_overrunning_attempt_is_abandoned(self):
+        """Test an attempt still running at the deadline is given up without blocking."""
+        release = threading.Event()
+        recovered = retry_batched(lambda keys: release.wait(5) and {}, ["SLOW"], deadline=0.2,
+                                  log_callback=_quiet)
+        release.set()
+        assert recovered == {}
+
+    def test_breaker_opens_and_persists(self):
+        """Test a key failing repeatedly is skipped in later runs."""
+        for _ in range(3):
+            breaker = CircuitBreaker(self.state_file, failure_threshold=3, log_callback=_quiet)
+            retry_batched(lambda keys: {}, ["BAD"], attempts=1, breaker=breaker, log_callback=_quiet)
+            breaker.save()
+
+        breaker = CircuitBreaker(self.state_file, failure_threshold=3, log_callback=_quiet)
+        assert breaker.open_keys() == ["BAD"]
+
+        calls = []
+        retry_batched(lambda keys: calls.append(keys) or {}, ["BAD"], breaker=breaker, log_callback=_quiet)
+        assert calls == []
+
+    def test_breaker_half_open_after_cooldown(self):
+        """Test an open key gets a trial retry once the cooldown has passed and resets on success."""
+        breaker = CircuitBreaker(self.state_file, failure_threshold=1, cooldown_seconds=0, log_callback=_quiet)
+        breaker.record_failure("FLAKY")
+        assert breaker.allow("FLAKY")
+
+        retry_batched(lambda keys: {"FLAKY": 1.0}, ["FLAKY"], breaker=breaker, log_callback=_quiet)
+        assert "FLAKY" not in breaker.state
@@ -0,0 +1,93 @@
+"""
+Unit tests for provider record/replay cassettes.
+
+Tests:
+- Disabled cassette leaves functions untouched
+- Recorded calls replay without invoking the provider
+- Loose keys tolerate moving keyword windows
+- Missing recordings raise CassetteMiss
+- API keys are stripped from recorded URLs
+- Active cassettes redirect output/cache paths into a fresh per-run sandbox
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.cassette import REPO_ROOT, Cassette, CassetteMiss, _strip_secrets
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestCassette:
+    """Test suite for Cassette."""
+
+    def setup_method(self):
+        self.cassette_dir = tempfile.mkdtemp()
+        self.calls = []
+
+    def teardown_method(self):
+        if os.path.exists(self.cassette_dir):
+            shutil.rmtree(self.cassette_dir)
+
+    def _provider(self, series_id, observation_start=None):
+        self.calls.append((series_id, observation_start))
+        return {"series": series_id, "values": [1.0, 2.0]}
+
+    def _cassette(self, mode):
+        return Cassette(mode, self.cassette_dir, log_callback=_quiet)
+
+    def test_disabled_returns_function(self):
+        """Test a disabled cassette does not wrap anything."""
+        assert Cassette(None, self.cassette_dir).wrap_call("fred", self._provider) == self._provider
+
+    def test_record_then_replay(self):
+        """Test replay serves the recorded result without calling the provider."""
+        recorded = self._cassette("record").wrap_call("fred", self._provider)("VIXCLS", observation_start="2026-01-01")
+        replay = self._cassette("replay")
+        result = replay.wrap_call("fred", self._provider)("VIXCLS", observation_start="2026-01-01")
+
+        assert result == recorded
+        assert len(self.calls) == 1
+        assert replay.stats["replayed"] == 1
+
+    def test_loose_key_ignores_keyword_window(self):
+        """Test a replay with a newer start date still finds the recording."""
+        self._cassette("record").wrap_call("fred", self._provider)("VIXCLS", observation_start="2026-01-01")
+        result = self._cassette("replay").wrap_call("fred", self._provider)("VIXCLS", observation_start="2026-02-01")
+        assert result["series"] == "VIXCLS"
+
+    def test_replay_miss_raises(self):
+        """Test an unrecorded call raises CassetteMiss instead of going live."""
+        replay = self._cassette("replay")
+        with pytest.raises(CassetteMiss):
+            replay.wrap_call("fred", self._provider)("WALCL")
+        assert self.calls == []
+        assert replay.stats["misses"] == 1
+
+    def test_strip_secrets(self):
+        """Test credential query parameters never reach keys or stored URLs."""
+        url = "https://api.example.com/v1/calendar?from=2026-01-01&apikey=SECRET&token=T"
+        assert _strip_secrets(url) == "https://api.example.com/v1/calendar?from=2026-01-01"
+
+    def test_sandbox_redirects_paths(self):
+        """Test disabled cassettes keep paths and active ones map them into a fresh sandbox."""
+        cache_dir = os.path.join(REPO_ROOT, "backend", "cache", "fred")
+        assert Cassette(None, self.cassette_dir).sandboxed(cache_dir) == cache_dir
+
+        parent = os.path.join(self.cassette_dir, "sandboxes")
+        first = Cassette("replay", self.cassette_dir, log_callback=_quiet, sandbox_parent=parent)
+        second = Cassette("replay", self.cassette_dir, log_callback=_quiet, sandbox_parent=parent)
+        mapped = first.sandboxed(cache_dir)
+        assert mapped == os.path.join(first.sandbox_dir, "backend", "cache", "fred")
+        assert first.sandbox_dir != second.sandbox_dir
+        assert os.listdir(first.sandbox_dir) == []
+        assert first.sandboxed("/elsewhere/ai_metrics.prom").startswith(first.sandbox_dir)
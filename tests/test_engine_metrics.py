@@ -0,0 +1,81 @@
+"""
+Integration tests for AI metrics persistence in the engine.
+
+Tests:
+- update_signal merges the run's AI metrics into the rolling state file and exports
+- Failed runs persist too, and samples are merged only once per process
+"""
+
+import json
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+pytest.importorskip("pandas_ta")
+pytest.importorskip("fredapi")
+
+# The engine uses script-style imports (utils.x), so backend/ must be importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import gms_engine  # noqa: E402
+
+
+class TestEngineMetrics:
+    """Test suite for AI metrics persistence across update_signal calls."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "ai_metrics.json")
+        self.json_export = os.path.join(self.temp_dir, "logs", "ai_metrics.json")
+        self.prom_export = os.path.join(self.temp_dir, "logs", "ai_metrics.prom")
+
+    def teardown_method(self):
+        gms_engine.ai_metrics.methods = {}
+        shutil.rmtree(self.temp_dir)
+
+    def _patch_engine(self, monkeypatch, fetch):
+        monkeypatch.setattr(gms_engine, "AI_METRICS_FILE", self.state_file)
+        monkeypatch.setattr(gms_engine, "AI_METRICS_JSON_EXPORT", self.json_export)
+        monkeypatch.setattr(gms_engine, "AI_METRICS_PROM_EXPORT", self.prom_export)
+        monkeypatch.setattr(gms_engine, "DATA_FILE", os.path.join(self.temp_dir, "current_signal.json"))
+        monkeypatch.setattr(gms_engine, "validate_api_keys", lambda: None)
+        monkeypatch.setattr(gms_engine, "get_next_event_dates", lambda: [])
+        monkeypatch.setattr(gms_engine, "get_last_valid_analysis", lambda: None)
+        monkeypatch.setattr(gms_engine, "fetch_market_data", fetch)
+
+    def _attempts(self, method):
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return sum(slot[method]["attempts"] for slot in state["slots"].values() if method in slot)
+
+    def test_update_signal_persists_metrics(self, monkeypatch):
+        """Test an in-process run (as scheduler.py does) writes the state file and both exports."""
+        def fetch():
+            gms_engine.ai_metrics.record("node_bridge", True, 1200, 4000, 1000)
+            return None, "FAILED", []
+
+        self._patch_engine(monkeypatch, fetch)
+        gms_engine.update_signal()
+
+        assert self._attempts("node_bridge") == 1
+        assert os.path.exists(self.json_export)
+        assert os.path.exists(self.prom_export)
+        assert gms_engine.ai_metrics.methods == {}
+
+    def test_failed_runs_persist_once(self, monkeypatch):
+        """Test a raising run still saves its samples and a later run does not merge them again."""
+        def fetch():
+            gms_engine.ai_metrics.record("gateway_flash", False, 30000)
+            raise RuntimeError("provider outage")
+
+        self._patch_engine(monkeypatch, fetch)
+        with pytest.raises(RuntimeError):
+            gms_engine.update_signal()
+        assert self._attempts("gateway_flash") == 1
+
+        monkeypatch.setattr(gms_engine, "fetch_market_data", lambda: (None, "FAILED", []))
+        gms_engine.update_signal()
+        assert self._attempts("gateway_flash") == 1
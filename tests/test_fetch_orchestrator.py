@@ -0,0 +1,220 @@
+"""
+Unit tests for the concurrent fetch orchestrator.
+
+Tests:
+- Results returned per source
+- Slow sources degrade to fallback
+- Failing sources degrade to fallback (value or callable)
+- Sources run concurrently
+- Provider race returns the first acceptable answer
+- Hedged alternates start only when the running attempt is slow or fails
+- Grouped fan-out keeps successes and retries only failed items
+- Partial group answers are kept and the fan-out deadline bounds a running round
+- Grouped retry re-requests all missing items in one call
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.fetch_orchestrator import FetchOrchestrator, FetchSource, fan_out_partial, hedged_first, race_first
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestFetchOrchestrator:
+    """Test suite for FetchOrchestrator."""
+
+    def test_results_by_name(self):
+        """Test every source result is keyed by its name."""
+        orch = FetchOrchestrator(deadline=5, log_callback=_quiet)
+        results = orch.run([
+            FetchSource("a", lambda: 1, timeout=2),
+            FetchSource("b", lambda: {"x": 2}, timeout=2),
+        ])
+        assert results == {"a": 1, "b": {"x": 2}}
+        assert orch.report["a"]["status"] == "ok"
+
+    def test_slow_source_uses_fallback(self):
+        """Test a source exceeding its timeout returns its fallback."""
+        orch = FetchOrchestrator(deadline=5, log_callback=_quiet)
+        results = orch.run([
+            FetchSource("fast", lambda: "done", timeout=2),
+            FetchSource("slow", lambda: time.sleep(1) or "late", timeout=0.1, fallback="fallback"),
+        ])
+        assert results["fast"] == "done"
+        assert results["slow"] == "fallback"
+        assert orch.report["slow"]["status"] == "timeout"
+
+    def test_error_uses_callable_fallback(self):
+        """Test exceptions degrade to a lazily built fallback."""
+        def boom():
+            raise ValueError("provider down")
+
+        orch = FetchOrchestrator(deadline=5, log_callback=_quiet)
+        results = orch.run([FetchSource("fred", boom, timeout=2, fallback=lambda: {"VIX": 15})])
+        assert results["fred"] == {"VIX": 15}
+        assert orch.report["fred"]["status"] == "error"
+
+    def test_global_deadline_caps_source_timeout(self):
+        """Test the global deadline overrides a longer per-source timeout."""
+        orch = FetchOrchestrator(deadline=0.1, log_callback=_quiet)
+        start = time.time()
+        results = orch.run([FetchSource("slow", lambda: time.sleep(1) or "late", timeout=10, fallback=None)])
+        assert results["slow"] is None
+        assert time.time() - start < 0.8
+
+    def test_sources_run_concurrently(self):
+        """Test total wall time is bounded by the slowest source, not the sum."""
+        orch = FetchOrchestrator(deadline=5, log_callback=_quiet)
+        start = time.time()
+        orch.run([FetchSource(f"s{i}", lambda: time.sleep(0.2), timeout=2) for i in range(4)])
+        assert time.time() - start < 0.6
+
+
+class TestRaceFirst:
+    """Test suite for race_first."""
+
+    def test_fastest_acceptable_answer_wins(self):
+        """Test empty answers are skipped and the first non-empty one wins."""
+        name, result = race_first({
+            "empty": lambda: [],
+            "slow": lambda: time.sleep(0.5) or ["slow"],
+            "fast": lambda: time.sleep(0.05) or ["fast"],
+        }, timeout=2, log_callback=_quiet)
+        assert (name, result) == ("fast", ["fast"])
+
+    def test_no_winner_within_timeout(self):
+        """Test (None, None) when every provider fails or is too slow."""
+        def boom():
+            raise ValueError("down")
+        start = time.time()
+        name, result = race_first({"boom": boom, "slow": lambda: time.sleep(1) or ["late"]},
+                                  timeout=0.1, log_callback=_quiet)
+        assert (name, result) == (None, None)
+        assert time.time() - start < 0.8
+
+
+class TestHedgedFirst:
+    """Test suite for hedged_first."""
+
+    def test_fast_primary_never_hedges(self):
+        """Test alternates are not started when the primary answers within the budget."""
+        started = []
+
+        def make(name, delay):
+            def run(cancel):
+                started.append(name)
+                time.sleep(delay)
+                return name
+            return run
+
+        name, result = hedged_first([("primary", make("primary", 0.05)), ("alternate", make("alternate", 0))],
+                                    hedge_after=0.5, deadline=2, log_callback=_quiet)
+        assert (name, result) == ("primary", "primary")
+        assert started == ["primary"]
+
+    def test_slow_primary_is_hedged(self):
+        """Test a slow primary triggers the alternate, and the loser sees the cancel event."""
+        seen = {}
+
+        def slow(cancel):
+            seen["cancelled"] = cancel.wait(2)
+            return "slow"
+
+        start = time.time()
+        name, result = hedged_first([("primary", slow), ("alternate", lambda cancel: "fast")],
+                                    hedge_after=0.1, deadline=2, log_callback=_quiet)
+        assert (name, result) == ("alternate", "fast")
+        assert time.time() - start < 0.5
+        time.sleep(0.05)
+        assert seen["cancelled"] is True
+
+    def test_failure_launches_next_immediately(self):
+        """Test failed or unacceptable answers move on without waiting for the hedge budget."""
+        def boom(cancel):
+            raise RuntimeError("429")
+
+        start = time.time()
+        name, result = hedged_first([("boom", boom), ("empty", lambda cancel: {}), ("ok", lambda cancel: {"EN": "x"})],
+                                    hedge_after=5, deadline=2, log_callback=_quiet)
+        assert name == "ok"
+        assert time.time() - start < 0.5
+
+    def test_deadline_bounds_total_time(self):
+        """Test (None, None) once the end-to-end deadline passes."""
+        start = time.time()
+        name, result = hedged_first([("a", lambda cancel: cancel.wait(2) and None), ("b", lambda cancel: cancel.wait(2) and None)],
+                                    hedge_after=0.05, deadline=0.3, log_callback=_quiet)
+        assert (name, result) == (None, None)
+        assert time.time() - start < 0.8
+
+
+class TestFanOutPartial:
+    """Test suite for fan_out_partial."""
+
+    def test_retries_only_failed_items(self):
+        """Test a failed group is re-run item by item while successful groups are kept."""
+        calls = []
+
+        def run(group):
+            calls.append(tuple(group))
+            if group == ["DE", "FR"]:
+                return None
+            return {item: item.lower() for item in group}
+
+        result = fan_out_partial([["EN", "JP"], ["DE", "FR"]], run, retries=1, log_callback=_quiet)
+        assert result == {"EN": "en", "JP": "jp", "DE": "de", "FR": "fr"}
+        assert sorted(calls) == [("DE",), ("DE", "FR"), ("EN", "JP"), ("FR",)]
+
+    def test_partial_group_keeps_successes(self):
+        """Test items a group did return are kept and only the missing ones are retried."""
+        calls = []
+
+        def run(group):
+            calls.append(tuple(group))
+            return {"EN": "en"} if "EN" in group else {"JP": "jp"} if group == ["JP"] else None
+
+        result = fan_out_partial([["EN", "JP"], ["DE"]], run, retries=1, log_callback=_quiet)
+        assert result == {"EN": "en", "JP": "jp"}
+        assert sorted(calls) == [("DE",), ("DE",), ("EN", "JP"), ("JP",)]
+
+    def test_retry_as_group(self):
+        """Test missing items are retried together in a single call when requested."""
+        calls = []
+
+        def run(group):
+            calls.append(tuple(group))
+            return {"EN": "en"} if len(calls) == 1 else {item: item.lower() for item in group}
+
+        result = fan_out_partial([["EN", "JP", "DE"]], run, retries=1, log_callback=_quiet, retry_as_group=True)
+        assert result == {"EN": "en", "JP": "jp", "DE": "de"}
+        assert calls == [("EN", "JP", "DE"), ("JP", "DE")]
+
+    def test_deadline_bounds_a_running_round(self):
+        """Test a slow group is abandoned at the deadline while finished groups are kept."""
+        def run(group):
+            if group == ["SLOW"]:
+                time.sleep(2)
+            return {item: True for item in group}
+
+        start = time.time()
+        result = fan_out_partial([["FAST"], ["SLOW"]], run, retries=3, deadline=0.3, log_callback=_quiet)
+        assert result == {"FAST": True}
+        assert time.time() - start < 1
+
+    def test_groups_run_concurrently(self):
+        """Test a round costs about as much as its slowest group."""
+        def run(group):
+            time.sleep(0.2)
+            return {item: True for item in group}
+
+        start = time.time()
+        result = fan_out_partial([["A"], ["B"], ["C"], ["D"]], run, log_callback=_quiet)
+        assert len(result) == 4
+        assert time.time() - start < 0.6
@@ -0,0 +1,101 @@
+"""
+Unit tests for the incremental FRED series cache.
+
+Tests:
+- First call performs a full fetch and writes one file per series
+- Fresh cache is served without calling FRED
+- Expired cache only requests observations from the last cached date
+- Stale cache is served when FRED fails
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.fred_cache import FredSeriesCache
+
+
+class FakeFred:
+    """Records get_series calls and serves a fixed daily series."""
+
+    def __init__(self, series):
+        self.series = series
+        self.calls = []
+        self.fail = False
+
+    def get_series(self, series_id, observation_start=None):
+        self.calls.append((series_id, observation_start))
+        if self.fail:
+            raise ConnectionError("FRED unavailable")
+        s = self.series
+        if observation_start is not None:
+            s = s[s.index >= pd.Timestamp(observation_start)]
+        return s
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestFredSeriesCache:
+    """Test suite for FredSeriesCache."""
+
+    def setup_method(self):
+        self.cache_dir = tempfile.mkdtemp()
+        idx = pd.date_range(end=pd.Timestamp.now().normalize(), periods=10, freq="D")
+        self.fred = FakeFred(pd.Series(range(10), index=idx, dtype="float64"))
+        self.start = idx[0].strftime('%Y-%m-%d')
+
+    def teardown_method(self):
+        if os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+    def test_full_fetch_writes_series_file(self):
+        """Test first access fetches the whole window and persists it."""
+        cache = FredSeriesCache(self.fred, self.cache_dir, log_callback=_quiet)
+        series = cache.get_series("VIXCLS", observation_start=self.start)
+
+        assert len(series) == 10
+        assert self.fred.calls == [("VIXCLS", self.start)]
+        with open(os.path.join(self.cache_dir, "VIXCLS.json"), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        assert entry["last_observation"] == series.index[-1].strftime('%Y-%m-%d')
+
+    def test_fresh_cache_skips_network(self):
+        """Test a cache hit within the refresh interval issues no FRED call."""
+        cache = FredSeriesCache(self.fred, self.cache_dir, log_callback=_quiet)
+        cache.get_series("VIXCLS", observation_start=self.start)
+        series = cache.get_series("VIXCLS", observation_start=self.start)
+
+        assert len(self.fred.calls) == 1
+        assert cache.stats["hits"] == 1
+        assert float(series.iloc[-1]) == 9.0
+
+    def test_expired_cache_fetches_incrementally(self):
+        """Test an expired entry only asks for observations since the last cached date."""
+        cache = FredSeriesCache(self.fred, self.cache_dir, refresh_seconds=0, log_callback=_quiet)
+        first = cache.get_series("VIXCLS", observation_start=self.start)
+        cache.get_series("VIXCLS", observation_start=self.start)
+
+        last_date = first.index[-1].strftime('%Y-%m-%d')
+        assert self.fred.calls[-1] == ("VIXCLS", last_date)
+        assert cache.stats["incremental"] == 1
+
+    def test_stale_cache_on_failure(self):
+        """Test cached data is returned when FRED raises."""
+        cache = FredSeriesCache(self.fred, self.cache_dir, refresh_seconds=0, log_callback=_quiet)
+        cache.get_series("VIXCLS", observation_start=self.start)
+        self.fred.fail = True
+        series = cache.get_series("VIXCLS", observation_start=self.start)
+
+        assert len(series) == 10
+        assert cache.stats["stale"] == 1
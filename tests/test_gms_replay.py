@@ -0,0 +1,108 @@
+"""
+Unit tests for the GMS replay / backtest engine.
+
+Tests:
+- Archive snapshots and summary rows merge into one date-indexed table
+- Replaying live weights reproduces the composite formula
+- Sweeps give identical results inline and across a process pool
+- The optional Net Liquidity term ranks each reading against earlier days only
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+# Backend modules import their helpers as top-level packages (utils.*)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import numpy as np
+
+from gms_replay import liquidity_adjustments, load_table, replay, sweep
+from utils.sector_scoring import SectorScorer
+
+SECTORS = {
+    "STOCKS": {"weights": {"VIX": 0.2, "SPY": 0.8}, "invert": ["VIX"]},
+    "CRYPTO": {"weights": {"BTC": 1.0}, "invert": []},
+}
+GMS_WEIGHTS = {"LEGACY": 0.4, "STOCKS": 0.4, "CRYPTO": 0.2}
+
+
+def _item(price, change):
+    return {"price": price, "change_percent": change, "sparkline": [price] * 30}
+
+
+def reference_gms(market_data, sector_scores):
+    """Composite formula of calculate_total_gms (without the liquidity block)."""
+    legacy = 50 + (20 - market_data.get("VIX", {}).get("price", 20)) * 1.5
+    hy = market_data.get("HY_SPREAD", {}).get("price", 3.5)
+    legacy += -20 if hy > 5.0 else 10 if hy < 3.5 else 0
+    legacy = max(0, min(100, legacy))
+    final = legacy * GMS_WEIGHTS["LEGACY"]
+    for sector, weight in GMS_WEIGHTS.items():
+        if sector != "LEGACY":
+            final += sector_scores.get(sector, 50) * weight
+    return int(max(0, min(100, final)))
+
+
+class TestGmsReplay:
+    """Test suite for gms_replay."""
+
+    def setup_method(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.snapshots = {
+            "2026-01-02": {"VIX": _item(14.0, -2.0), "SPY": _item(600.0, 1.0), "BTC": _item(90000.0, -3.0), "HY_SPREAD": _item(3.1, 0.0)},
+            "2026-01-03": {"VIX": _item(24.0, 8.0), "SPY": _item(590.0, -1.5), "BTC": _item(88000.0, 2.0), "HY_SPREAD": _item(5.4, 0.0)},
+        }
+        for date, market_data in self.snapshots.items():
+            with open(os.path.join(self.archive_dir, f"{date}.json"), 'w', encoding='utf-8') as f:
+                json.dump({"gms_score": 50, "market_data": market_data}, f)
+        with open(os.path.join(self.archive_dir, "summary.json"), 'w', encoding='utf-8') as f:
+            json.dump([{"date": "2026-01-01", "gms_score": 61, "vix_price": 12.0, "hy_spread": 3.0, "spy_price": 605.0}], f)
+        self.scorer = SectorScorer(SECTORS)
+
+    def teardown_method(self):
+        shutil.rmtree(self.archive_dir)
+
+    def test_load_table_merges_sources(self):
+        """Test summary-only days appear alongside archived snapshots."""
+        table = load_table(self.scorer, self.archive_dir)
+        assert list(table.frame["source"]) == ["summary", "archive", "archive"]
+        assert table.arrays.change.shape == (3, len(self.scorer.keys))
+        assert not table.arrays.present[0].any()
+
+    def test_replay_matches_composite_formula(self):
+        """Test replayed GMS equals the live formula for each snapshot."""
+        result = replay(load_table(self.scorer, self.archive_dir), self.scorer, GMS_WEIGHTS)
+        for date, market_data in self.snapshots.items():
+            expected = reference_gms(market_data, self.scorer.score(market_data))
+            assert result.loc[date, "gms"] == expected
+        summary_only = {"VIX": {"price": 12.0}, "HY_SPREAD": {"price": 3.0}}
+        assert result.loc["2026-01-01", "gms"] == reference_gms(summary_only, {})
+
+    def test_sweep_inline_and_pool_agree(self):
+        """Test process-pool sweeps return the same metrics as inline scoring."""
+        table = load_table(self.scorer, self.archive_dir)
+        configs = [{"name": f"w{i}", "gms": {"LEGACY": i / 10, "STOCKS": 1 - i / 10}} for i in range(6)]
+        configs.append({"name": "spy_only", "sectors": {"STOCKS": {"SPY": 1.0}}})
+        inline = sweep(table, self.scorer, configs, GMS_WEIGHTS, workers=1)
+        pooled = sweep(table, self.scorer, configs, GMS_WEIGHTS, workers=2, chunk_size=2)
+        assert list(inline.index) == [c["name"] for c in configs]
+        assert inline.equals(pooled)
+
+    def test_liquidity_adjustment_is_opt_in(self):
+        """Test the Net Liquidity term is off by default and ranks readings against prior days."""
+        table = load_table(self.scorer, self.archive_dir)
+        base = replay(table, self.scorer, GMS_WEIGHTS)
+        assert base["gms"].equals(replay(table, self.scorer, GMS_WEIGHTS, liquidity_adjustment=True)["gms"])
+
+        adj = liquidity_adjustments(np.array([6000.0, np.nan, 6400.0, 5900.0]), np.array([20.0, 20.0, 40.0, np.nan]),
+                                    min_samples=1)
+        # 6400 beats the single earlier reading (100th pct, VIX 40); 5900 is below both (0th pct, VIX default)
+        assert adj.tolist() == [0.0, 0.0, 10.0, -5.0]
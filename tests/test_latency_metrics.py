@@ -0,0 +1,145 @@
+"""
+Unit tests for the fixed-memory AI latency metrics.
+
+Tests:
+- Histogram percentiles land in the right bucket and merge additively
+- Runs merge into persisted slots; windows only include recent slots
+- Expired slots are pruned and unreadable state is reset
+- JSON and Prometheus exports carry counts, success rates, quantiles and prompt sizes
+"""
+
+import json
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.latency_metrics import LatencyHistogram, RollingMetrics
+
+HOUR = 3600
+NOW = 1_700_000_000
+
+
+def _quiet(msg):
+    pass
+
+
+def _run(latencies, failures=0, prompt_chars=0):
+    hist = LatencyHistogram()
+    for ms in latencies:
+        hist.observe(ms)
+    stats = {"attempts": len(latencies), "successes": len(latencies) - failures, "latency": hist}
+    if prompt_chars:
+        stats.update(prompt_samples=len(latencies), prompt_chars=prompt_chars * len(latencies),
+                     prompt_tokens=prompt_chars // 4 * len(latencies))
+    return stats
+
+
+class TestLatencyHistogram:
+    """Test suite for LatencyHistogram."""
+
+    def test_percentiles(self):
+        """Test quantiles fall inside the bucket holding the requested rank."""
+        hist = LatencyHistogram()
+        for _ in range(95):
+            hist.observe(800)
+        for _ in range(5):
+            hist.observe(20000)
+        assert 500 < hist.percentile(0.5) <= 1000
+        assert 500 < hist.percentile(0.95) <= 1000
+        assert 15000 < hist.percentile(0.99) <= 20000
+        assert hist.mean() == pytest.approx((95 * 800 + 5 * 20000) / 100)
+
+    def test_overflow_bucket_capped_at_max(self):
+        """Test samples past the last bound are reported up to the observed max."""
+        hist = LatencyHistogram(bounds=(100, 200))
+        hist.observe(5000)
+        assert hist.counts == [0, 0, 1]
+        assert hist.percentile(0.99) <= 5000
+
+    def test_memory_is_fixed_and_merge_adds(self):
+        """Test observing many samples keeps the bucket count and merge sums counts."""
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for i in range(10000):
+            a.observe(i % 300)
+        b.observe(40)
+        a.merge(b)
+        assert len(a.counts) == len(LatencyHistogram().counts)
+        assert a.count == 10001
+        assert LatencyHistogram().percentile(0.5) is None
+        with pytest.raises(ValueError):
+            a.merge(LatencyHistogram(bounds=(1, 2)))
+
+
+class TestRollingMetrics:
+    """Test suite for RollingMetrics."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "ai_metrics.json")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_runs_persist_and_windows_filter(self):
+        """Test merged runs survive a reload and the 1h window excludes older slots."""
+        store = RollingMetrics(self.state_file, log_callback=_quiet)
+        store.merge_run({"node_bridge": _run([900, 1100], failures=1)}, now=NOW - 5 * HOUR)
+        store.save()
+        store = RollingMetrics(self.state_file, log_callback=_quiet)
+        store.merge_run({"node_bridge": _run([2000], prompt_chars=3000), "smart_cache": _run([3])}, now=NOW)
+        store.save()
+
+        reloaded = RollingMetrics(self.state_file, log_callback=_quiet)
+        day = reloaded.summary(86400, now=NOW)
+        hour = reloaded.summary(HOUR, now=NOW)
+        assert day["node_bridge"]["attempts"] == 3
+        assert day["node_bridge"]["success_rate"] == pytest.approx(2 / 3)
+        assert hour["node_bridge"]["attempts"] == 1
+        assert hour["smart_cache"]["p99_ms"] <= 3
+        assert hour["node_bridge"]["avg_prompt_chars"] == 3000
+        assert hour["smart_cache"]["avg_prompt_chars"] is None
+
+    def test_retention_prunes_old_slots(self):
+        """Test slots older than the retention period are dropped on merge."""
+        store = RollingMetrics(None, retention_seconds=2 * HOUR, log_callback=_quiet)
+        store.merge_run({"gateway_flash": _run([500])}, now=NOW - 10 * HOUR)
+        store.merge_run({"gateway_flash": _run([500])}, now=NOW)
+        assert len(store.slots) == 1
+
+    def test_unreadable_or_rebucketed_state_resets(self):
+        """Test corrupt files and changed bucket bounds start a fresh history."""
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            f.write("{")
+        assert RollingMetrics(self.state_file, log_callback=_quiet).slots == {}
+
+        store = RollingMetrics(self.state_file, log_callback=_quiet)
+        store.merge_run({"node_bridge": _run([100])}, now=NOW)
+        store.save()
+        assert RollingMetrics(self.state_file, bounds=(10, 20), log_callback=_quiet).slots == {}
+
+    def test_exports(self):
+        """Test the JSON and Prometheus exports expose windows, rates, quantiles and prompt sizes."""
+        store = RollingMetrics(None, log_callback=_quiet)
+        store.merge_run({"gateway_flash": _run([700, 900, 1200], failures=1, prompt_chars=4000)}, now=NOW)
+        json_path = os.path.join(self.temp_dir, "out", "ai_metrics.json")
+        prom_path = os.path.join(self.temp_dir, "out", "ai_metrics.prom")
+        store.export_json(json_path, {"1h": HOUR}, now=NOW)
+        store.export_prometheus(prom_path, {"1h": HOUR}, now=NOW)
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        assert report["windows"]["1h"]["gateway_flash"]["attempts"] == 3
+        assert report["windows"]["1h"]["gateway_flash"]["avg_prompt_chars"] == 4000
+        with open(prom_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        assert 'gms_ai_attempts{method="gateway_flash",window="1h"} 3' in text
+        assert 'gms_ai_success_ratio{method="gateway_flash",window="1h"} 0.6667' in text
+        assert 'quantile="0.95"' in text
+        assert "# TYPE gms_ai_latency_ms gauge" in text
+        assert 'gms_ai_prompt_tokens_avg{method="gateway_flash",window="1h"} 1000' in text
@@ -0,0 +1,98 @@
+"""
+Unit tests for the schema-driven market data validator.
+
+Tests:
+- Valid snapshots pass untouched (atypical values only warn)
+- Out-of-bounds, stale and missing indicators are substituted from the previous snapshot
+- Unusable previous values leave the key unresolved; non-numeric prices are dropped
+- A frozen value repeated from a stale previous snapshot stays flagged as stale
+- Keys without a schema entry are reported
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.market_validator import MarketDataValidator
+
+SCHEMA = {
+    "VIX": {"min": 5, "max": 150, "typical": (9, 60)},
+    "SPY": {"min": 1e-9, "max_age_days": 10},
+    "BTC": {"min": 1e-9, "max_age_days": 3},
+}
+NOW = datetime(2026, 3, 10, 12, tzinfo=timezone.utc).timestamp()
+
+
+def _quiet(msg):
+    pass
+
+
+def _snapshot(**overrides):
+    data = {
+        "VIX": {"price": 18.0},
+        "SPY": {"price": 600.0, "as_of": "2026-03-09"},
+        "BTC": {"price": 90000.0, "as_of": "2026-03-10"},
+    }
+    data.update(overrides)
+    return data
+
+
+class TestMarketDataValidator:
+    """Test suite for MarketDataValidator."""
+
+    def setup_method(self):
+        self.validator = MarketDataValidator(SCHEMA, log_callback=_quiet)
+
+    def test_valid_snapshot_passes(self):
+        """Test a clean snapshot is left as-is; atypical values only warn."""
+        data = _snapshot(VIX={"price": 75.0})
+        report = self.validator.validate(data, _snapshot(), now=NOW)
+        assert report["substituted"] == [] and report["unresolved"] == []
+        assert report["warnings"] == [{"key": "VIX", "reason": "atypical", "value": 75.0}]
+        assert data["VIX"]["price"] == 75.0
+
+    def test_substitutes_invalid_from_previous(self):
+        """Test out-of-bounds, stale and missing keys fall back to the previous snapshot."""
+        previous = _snapshot()
+        data = _snapshot(VIX={"price": 0.0}, BTC={"price": 91000.0, "as_of": "2026-03-01"})
+        del data["SPY"]
+        report = self.validator.validate(data, previous, now=NOW)
+        reasons = {e["key"]: e["reason"] for e in report["substituted"]}
+        assert reasons == {"VIX": "out_of_bounds", "SPY": "missing", "BTC": "stale"}
+        assert data == previous
+
+    def test_unusable_previous_leaves_unresolved(self):
+        """Test invalid keys stay unresolved without a valid substitute; NaN prices are dropped."""
+        data = _snapshot(VIX={"price": 500.0}, SPY={"price": float("nan")})
+        report = self.validator.validate(data, {"VIX": {"price": 900.0}}, now=NOW)
+        assert {e["key"]: e["reason"] for e in report["unresolved"]} == {"VIX": "out_of_bounds", "SPY": "not_numeric"}
+        assert data["VIX"]["price"] == 500.0
+        assert "SPY" not in data
+
+    def test_frozen_value_is_not_accepted_from_previous(self):
+        """Test a stale print matching an equally stale previous value is not substituted."""
+        frozen = {"price": 90000.0, "as_of": "2026-03-01"}
+        data = _snapshot(BTC=dict(frozen))
+        report = self.validator.validate(data, _snapshot(BTC=dict(frozen)), now=NOW)
+        assert report["substituted"] == []
+        assert report["unresolved"] == [{"key": "BTC", "reason": "stale", "value": 90000.0}]
+
+        del data["BTC"]
+        report = self.validator.validate(data, _snapshot(BTC=dict(frozen)), now=NOW)
+        assert report["missing"] == ["BTC"] and "BTC" not in data
+
+    def test_reports_missing_and_unschematized(self):
+        """Test keys missing everywhere and keys outside the schema are listed."""
+        data = _snapshot(NEW_TICKER={"price": 1.0})
+        del data["BTC"]
+        report = self.validator.validate(data, None, now=NOW, stage="publish")
+        assert report["stage"] == "publish"
+        assert report["missing"] == ["BTC"]
+        assert report["unschematized"] == ["NEW_TICKER"]
@@ -0,0 +1,153 @@
+"""
+Unit tests for the persistent AI bridge worker client.
+
+Tests:
+- Prompts round-trip through one long-lived worker process
+- Concurrent requests are matched to out-of-order responses by id
+- Worker-side errors surface as BridgeError
+- Reported model calls and token usage reach the caller, failed requests included
+- A crashed worker fails in-flight requests and is restarted on the next call
+- Closing the bridge lets in-flight requests finish before the worker exits
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import textwrap
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from backend.utils.node_bridge import BridgeError, NodeBridge
+
+# Stand-in for `generate_insight.ts --worker` speaking the same JSON-lines protocol
+FAKE_WORKER = textwrap.dedent('''
+    import json, os, sys, threading, time
+
+    lock = threading.Lock()
+
+    def send(msg):
+        with lock:
+            sys.stdout.write(json.dumps(msg) + "\\n")
+            sys.stdout.flush()
+
+    def handle(req):
+        prompt = req.get("prompt", "")
+        if prompt == "crash":
+            os._exit(3)
+        if prompt == "fail":
+            send({"id": req["id"], "error": "All candidates failed.", "calls": 6})
+            return
+        if prompt.startswith("sleep:"):
+            time.sleep(float(prompt.split(":")[1]))
+        send({"id": req["id"], "text": prompt.upper() + ":" + str(os.getpid()), "calls": 2, "tokens": 40})
+
+    print("[dotenv] noise before the protocol starts")
+    sys.stdout.flush()
+    workers = []
+    for line in sys.stdin:
+        req = json.loads(line)
+        if req.get("op") == "ping":
+            send({"id": req["id"], "ok": True})
+        else:
+            workers.append(threading.Thread(target=handle, args=(req,)))
+            workers[-1].start()
+    # stdin closed: answer in-flight requests before exiting, like the real worker
+    for worker in workers:
+        worker.join()
+''')
+
+
+def _quiet(msg):
+    pass
+
+
+class TestNodeBridge:
+    """Test suite for NodeBridge."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        script = os.path.join(self.temp_dir, "worker.py")
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(FAKE_WORKER)
+        self.bridge = NodeBridge([sys.executable, script], startup_timeout=10, log_callback=_quiet)
+
+    def teardown_method(self):
+        self.bridge.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_requests_reuse_one_worker(self):
+        """Test consecutive prompts are served by the same process."""
+        first = self.bridge.request("hello", timeout=10)
+        second = self.bridge.request("world", timeout=10)
+        assert first.split(":")[0] == "HELLO"
+        assert second.split(":")[0] == "WORLD"
+        assert first.split(":")[1] == second.split(":")[1]
+        assert self.bridge.restarts == 0
+
+    def test_concurrent_requests_matched_by_id(self):
+        """Test a slow request does not block or swap a fast one's response."""
+        results = {}
+
+        def run(prompt):
+            results[prompt] = self.bridge.request(prompt, timeout=10)
+
+        threads = [threading.Thread(target=run, args=(p,)) for p in ("sleep:0.5", "fast")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results["sleep:0.5"].startswith("SLEEP:0.5")
+        assert results["fast"].startswith("FAST")
+
+    def test_worker_error_raises(self):
+        """Test an error response raises BridgeError without killing the worker."""
+        with pytest.raises(BridgeError, match="All candidates failed"):
+            self.bridge.request("fail", timeout=10)
+        assert self.bridge.alive
+
+    def test_usage_reported(self):
+        """Test the usage dict receives the worker's call and token counts on success and failure."""
+        usage = {}
+        self.bridge.request("hello", timeout=10, usage=usage)
+        assert usage == {"calls": 2, "tokens": 40}
+        usage = {}
+        with pytest.raises(BridgeError):
+            self.bridge.request("fail", timeout=10, usage=usage)
+        assert usage == {"calls": 6}
+
+    def test_crash_restarts_worker(self):
+        """Test in-flight requests fail on a crash and the next call restarts the worker."""
+        pid = self.bridge.request("before", timeout=10).split(":")[1]
+        with pytest.raises(BridgeError, match="exited"):
+            self.bridge.request("crash", timeout=10)
+        after = self.bridge.request("after", timeout=10)
+        assert after.split(":")[1] != pid
+        assert self.bridge.restarts == 1
+
+    def test_close_drains_in_flight_requests(self):
+        """Test a request running when the bridge closes still gets its response."""
+        self.bridge.ping()
+        results = {}
+
+        def run():
+            results["slow"] = self.bridge.request("sleep:1", timeout=10)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        time.sleep(0.3)
+        self.bridge.close(timeout=0.1, drain_timeout=10)
+        thread.join()
+        assert results["slow"].startswith("SLEEP:1")
+        assert not self.bridge.alive
+
+    def test_missing_command_raises(self):
+        """Test an unstartable worker reports a BridgeError."""
+        bridge = NodeBridge([os.path.join(self.temp_dir, "missing-binary")], startup_timeout=2, log_callback=_quiet)
+        with pytest.raises(BridgeError):
+            bridge.request("hello", timeout=2)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the incremental percentile index.
+
+Tests:
+- Quantiles and percentile ranks match a full sort
+- Re-observing a key replaces its value
+- Size cap evicts the oldest keys
+- State persists across instances
+- Saves append only new observations; compaction stores the sorted array
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.percentile_index import PercentileIndex
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestPercentileIndex:
+    """Test suite for PercentileIndex."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "index.json")
+
+    def teardown_method(self):
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_matches_full_sort(self):
+        """Test thresholds and ranks equal the rebuild-and-sort results."""
+        rng = random.Random(3)
+        values = [rng.uniform(5000, 7000) for _ in range(500)]
+        index = PercentileIndex(log_callback=_quiet)
+        index.extend((f"d{i}", v) for i, v in enumerate(values))
+
+        ordered = sorted(values)
+        assert index.quantile(0.75) == ordered[int(len(ordered) * 0.75)]
+        assert index.quantile(0.25) == ordered[int(len(ordered) * 0.25)]
+        probe = 6100.0
+        assert index.percentile(probe) == sum(1 for x in values if x < probe) / len(values) * 100
+
+    def test_same_key_replaces_value(self):
+        """Test a revised observation does not double count."""
+        index = PercentileIndex(log_callback=_quiet)
+        assert index.add("2026-01-01", 100)
+        assert not index.add("2026-01-01", 100)
+        index.add("2026-01-01", 300)
+        index.add("2026-01-02", 200)
+        assert len(index) == 2
+        assert index.percentile(250) == 50.0
+
+    def test_max_size_evicts_oldest(self):
+        """Test the oldest keys are dropped beyond max_size."""
+        index = PercentileIndex(max_size=3, log_callback=_quiet)
+        index.extend([("a", 1), ("b", 2), ("c", 3), ("d", 4)])
+        assert len(index) == 3
+        assert index.quantile(0.0) == 2
+
+    def test_persistence(self):
+        """Test observations survive a reload."""
+        index = PercentileIndex(self.state_file, log_callback=_quiet)
+        index.extend([("a", 5), ("b", 1)])
+        index.save()
+        reloaded = PercentileIndex(self.state_file, log_callback=_quiet)
+        assert len(reloaded) == 2
+        assert reloaded.quantile(0.0) == 1
+        assert reloaded.percentile(5) == 50.0
+
+    def test_journal_appends_and_compacts(self):
+        """Test saves journal only new readings and compaction persists the sorted array."""
+        index = PercentileIndex(self.state_file, log_callback=_quiet)
+        index.extend((f"d{i:03d}", float(100 - i)) for i in range(100))
+        index.save()
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        assert state["sorted"] == sorted(state["sorted"]) and len(state["sorted"]) == 100
+        assert not os.path.exists(index.journal_file)
+
+        index.add("d100", 50.5)
+        index.save()
+        index.save()
+        with open(index.journal_file, 'r', encoding='utf-8') as f:
+            assert f.read().splitlines() == ['["d100", 50.5]']
+
+        reloaded = PercentileIndex(self.state_file, log_callback=_quiet)
+        assert len(reloaded) == 101
+        assert reloaded.percentile(50.5) == index.percentile(50.5)
+        assert reloaded.quantile(0.5) == index.quantile(0.5)
@@ -0,0 +1,135 @@
+"""
+Unit tests for the shared incremental OHLCV store.
+
+Tests:
+- First request downloads the full period in one batched call
+- Fresh tickers are served without a download
+- Stale tickers only request bars since their last stored bar
+- A split in the refetched overlap re-downloads the full history; a moving last bar does not
+- Batch frame / close matrix shapes
+- Per-ticker metadata survives concurrent stores; download options reach the downloader
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.price_store import PriceStore
+
+
+class FakeDownloader:
+    """Serves synthetic daily bars shaped like yf.download(group_by='ticker')."""
+
+    def __init__(self):
+        self.calls = []
+        self.index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=120, freq="D")
+        self.scale = 1.0       # Adjustment factor applied to every bar (a 2:1 split rescales history by 0.5)
+        self.last_bump = 0.0   # Change of the latest bar only (an unfinished session)
+
+    def __call__(self, tickers, interval="1d", period=None, start=None, **options):
+        self.calls.append({"tickers": list(tickers), "period": period, "start": start, "options": options})
+        index = self.index if start is None else self.index[self.index >= pd.Timestamp(start)]
+        frames = {}
+        for i, t in enumerate(tickers):
+            base = 100.0 * (i + 1)
+            closes = [(base + k) * self.scale for k in range(len(self.index))][-len(index):] if len(index) else []
+            if closes:
+                closes[-1] += self.last_bump
+            frames[t] = pd.DataFrame({
+                "Open": base, "High": base + 1, "Low": base - 1,
+                "Close": closes, "Volume": 1000
+            }, index=index)
+        return pd.concat(frames, axis=1)
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestPriceStore:
+    """Test suite for PriceStore."""
+
+    def setup_method(self):
+        self.store_dir = tempfile.mkdtemp()
+        self.fake = FakeDownloader()
+
+    def teardown_method(self):
+        if os.path.exists(self.store_dir):
+            shutil.rmtree(self.store_dir)
+
+    def _store(self, refresh_seconds=300):
+        return PriceStore(self.store_dir, refresh_seconds=refresh_seconds, log_callback=_quiet, downloader=self.fake)
+
+    def test_full_download_is_batched(self):
+        """Test missing tickers are fetched together in a single call."""
+        hist = self._store().history(["SPY", "HYG"], period="3mo")
+        assert set(hist) == {"SPY", "HYG"}
+        assert len(self.fake.calls) == 1
+        assert self.fake.calls[0]["period"] == "3mo"
+
+    def test_fresh_store_skips_download(self):
+        """Test a second process reuses recently stored bars."""
+        self._store().history(["SPY"], period="3mo")
+        hist = self._store().history(["SPY"], period="1mo")
+        assert len(self.fake.calls) == 1
+        assert len(hist["SPY"]) <= 32
+
+    def test_stale_store_fetches_incrementally(self):
+        """Test stale tickers only request bars from the last stored date."""
+        self._store(refresh_seconds=0).history(["SPY"], period="3mo")
+        self._store(refresh_seconds=0).history(["SPY"], period="3mo")
+        assert self.fake.calls[-1]["start"] == self.fake.index[-2].strftime('%Y-%m-%d')
+        assert len(self.fake.calls) == 2
+
+    def test_split_in_overlap_refetches_full_history(self):
+        """Test a rescaled overlap bar replaces the stored history instead of leaving a seam."""
+        self._store(refresh_seconds=0).history(["SPY"], period="3mo")
+        self.fake.scale = 0.5
+        store = self._store(refresh_seconds=0)
+        closes = store.closes(["SPY"], period="3mo")["SPY"]
+        assert self.fake.calls[-1]["period"] is not None
+        assert store.stats["full"] == 1
+        assert closes.iloc[-1] == pytest.approx((100.0 + 119) * 0.5)
+        assert closes.pct_change().dropna().abs().max() < 0.02
+
+    def test_moving_last_bar_stays_incremental(self):
+        """Test an unfinished last bar changing between refreshes is not taken for a split."""
+        self._store(refresh_seconds=0).history(["SPY"], period="3mo")
+        self.fake.last_bump = 3.0
+        store = self._store(refresh_seconds=0)
+        closes = store.closes(["SPY"], period="3mo")["SPY"]
+        assert len(self.fake.calls) == 2
+        assert closes.iloc[-1] == pytest.approx(100.0 + 119 + 3.0)
+
+    def test_download_and_closes_shapes(self):
+        """Test batch frame is (ticker, field) and closes is one column per ticker."""
+        store = self._store()
+        batch = store.download(["SPY", "RSP"], period="3mo")
+        assert "Close" in batch["SPY"].columns
+        closes = store.closes(["SPY", "RSP"], period="3mo")
+        assert list(closes.columns) == ["SPY", "RSP"]
+
+    def test_concurrent_stores_keep_each_others_metadata(self):
+        """Test two stores refreshing different tickers do not overwrite each other's freshness."""
+        first, second = self._store(), self._store()
+        first.history(["SPY"], period="3mo")
+        second.history(["HYG"], period="3mo")
+        self._store().history(["SPY", "HYG"], period="3mo")
+        assert len(self.fake.calls) == 2
+        assert not os.path.exists(os.path.join(self.store_dir, "index.json"))
+
+    def test_download_options_are_forwarded(self):
+        """Test constructor download options (e.g. threads=False) reach every download."""
+        store = PriceStore(self.store_dir, log_callback=_quiet, downloader=self.fake,
+                           download_options={"threads": False})
+        store.history(["SPY"], period="3mo")
+        assert self.fake.calls[0]["options"] == {"threads": False}
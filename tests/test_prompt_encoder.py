@@ -0,0 +1,68 @@
+"""
+Unit tests for the compact prompt encoder.
+
+Tests:
+- Indicators become one header plus one row each, with non-narrative fields dropped
+- Levels keep 4 significant digits without scientific notation
+- Aliased keys and non-numeric entries are skipped; distinct indicators with equal values are kept
+- The table is much smaller than the legacy labelled lines
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.prompt_encoder import TABLE_HEADER, encode_market_lines, encode_market_table, format_level
+
+SPARK = [600.0 + i for i in range(22)]
+DATA = {
+    "SPY": {"price": 689.43, "prev_price": 684.48, "daily_chg": 0.72, "change_percent": 1.13, "trend": "UP",
+            "sparkline": SPARK, "as_of": "2026-10-16"},
+    "HYG": {"price": 81.0, "prev_price": 80.94, "daily_chg": 0.07, "trend": "UP", "sparkline": SPARK},
+    "HY_BOND": {"price": 81.0, "prev_price": 80.94, "daily_chg": 0.07, "trend": "UP", "sparkline": SPARK},
+    "NFCI": {"price": -0.57, "change_percent": 0.0, "trend": "CALM"},
+    "BOVESPA": {"price": 190534.0, "daily_chg": -1.064, "trend": "DOWN"},
+    "BROKEN": {"price": float("nan")},
+    "updated": "2026-10-16T12:00:00Z",
+}
+
+
+def test_table_rows():
+    """Test the table keeps level, daily change and trend only."""
+    assert encode_market_table(DATA).splitlines() == [
+        TABLE_HEADER,
+        "SPY|689.4|+0.72|UP",
+        "HYG|81|+0.07|UP",
+        "NFCI|-0.57||CALM",
+        "BOVESPA|190500|-1.06|DOWN",
+    ]
+
+
+def test_equal_values_are_not_aliases():
+    """Test distinct indicators sharing level, change and trend both keep their rows."""
+    data = {"FED_RATE": {"price": 4.33, "daily_chg": 0.0, "trend": "FLAT"},
+            "ECB_RATE": {"price": 4.33, "daily_chg": 0.0, "trend": "FLAT"}}
+    assert encode_market_table(data).splitlines()[1:] == ["FED_RATE|4.33|+0.00|FLAT", "ECB_RATE|4.33|+0.00|FLAT"]
+
+
+def test_alias_kept_without_canonical():
+    """Test an alias still gets a row when its canonical indicator is missing."""
+    data = {"HY_BOND": DATA["HY_BOND"], "HYG": {"price": float("nan")}}
+    assert encode_market_table(data).splitlines()[1:] == ["HY_BOND|81|+0.07|UP"]
+
+
+def test_format_level():
+    """Test significant-digit rounding never switches to exponent notation."""
+    assert format_level(67954.68) == "67950"
+    assert format_level(1.1794) == "1.179"
+    assert format_level(0.000123456) == "0.0001235"
+    assert format_level(5700.17) == "5700"
+
+
+def test_table_is_smaller_than_legacy():
+    """Test a realistic matrix shrinks by more than a third."""
+    data = {f"T{i}": dict(DATA["SPY"], price=100.0 + i * 7.31) for i in range(60)}
+    assert len(encode_market_table(data)) < len(encode_market_lines(data)) * 2 / 3
+    assert "- SPY: 689.43 (Prev: 684.48, DailyChg: 0.72%)" in encode_market_lines(DATA)
@@ -0,0 +1,123 @@
+"""
+Unit tests for the input-addressed report cache.
+
+Tests:
+- Canonical keys ignore dict ordering; rounding collapses sub-threshold ticks
+- Fresh entries are served, expired ones are not
+- Entries persist across instances and are capped in number
+- The last-valid index round-trips, skips unchanged rewrites and rejects tampered files
+"""
+
+import json
+import os
+import sys
+import shutil
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.report_cache import LastValidReport, ReportCache, canonical_key, round_sig
+
+REPORTS = {"EN": "Risk appetite holds. [MARKET STATUS: ACCUMULATE]", "JP": "リスク選好は継続。"}
+
+
+def _quiet(msg):
+    pass
+
+
+class TestReportCache:
+    """Test suite for ReportCache."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "report_cache.json")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_canonical_key_is_order_independent(self):
+        """Test the same inputs hash identically regardless of ordering and tiny moves."""
+        a = canonical_key({"score": 55, "indicators": {"VIX": round_sig(18.42), "SPY": round_sig(601.2)}})
+        b = canonical_key({"indicators": {"SPY": round_sig(601.4), "VIX": round_sig(18.39)}, "score": 55})
+        c = canonical_key({"score": 56, "indicators": {"VIX": round_sig(18.42), "SPY": round_sig(601.2)}})
+        assert a == b
+        assert a != c
+
+    def test_hit_and_expiry(self):
+        """Test entries are served within the TTL only."""
+        cache = ReportCache(self.state_file, ttl_seconds=600, log_callback=_quiet)
+        cache.put("k", REPORTS, now=1000)
+        assert cache.get("k", now=1500) == REPORTS
+        assert cache.get("k", now=1601) is None
+        assert cache.get("other", now=1500) is None
+
+    def test_returned_reports_are_copies(self):
+        """Test callers mutating a hit cannot corrupt the cache."""
+        cache = ReportCache(None, ttl_seconds=600, log_callback=_quiet)
+        cache.put("k", REPORTS, now=1000)
+        cache.get("k", now=1001)["EN"] = "mutated"
+        assert cache.get("k", now=1002)["EN"] == REPORTS["EN"]
+
+    def test_persistence_and_cap(self):
+        """Test entries survive a reload and the oldest are evicted beyond max_entries."""
+        cache = ReportCache(self.state_file, ttl_seconds=600, max_entries=2, log_callback=_quiet)
+        for i in range(3):
+            cache.put(f"k{i}", REPORTS, now=1000 + i)
+        reloaded = ReportCache(self.state_file, ttl_seconds=600, max_entries=2, log_callback=_quiet)
+        assert list(reloaded.entries) == ["k1", "k2"]
+        assert reloaded.get("k2", now=1100) == REPORTS
+
+    def test_zero_ttl_disables_cache(self):
+        """Test a TTL of 0 never stores or serves entries."""
+        cache = ReportCache(self.state_file, ttl_seconds=0, log_callback=_quiet)
+        cache.put("k", REPORTS, now=1000)
+        assert cache.get("k", now=1000) is None
+        assert not os.path.exists(self.state_file)
+
+
+class TestLastValidReport:
+    """Test suite for LastValidReport."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "cache", "last_valid_report.json")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_missing_index_loads_none(self):
+        """Test a fresh install reports no entry so the caller can fall back to a scan."""
+        assert LastValidReport(self.state_file, log_callback=_quiet).load() is None
+
+    def test_record_and_load(self):
+        """Test the recorded set, its hash and source come back from one read."""
+        index = LastValidReport(self.state_file, log_callback=_quiet)
+        digest = index.record(REPORTS, "gateway_flash", now=1000)
+        entry = LastValidReport(self.state_file, log_callback=_quiet).load()
+        assert entry["reports"] == REPORTS
+        assert entry["hash"] == digest == canonical_key(REPORTS)
+        assert entry["source"] == "gateway_flash"
+
+    def test_unchanged_set_not_rewritten(self):
+        """Test recording the same reports again keeps the original entry."""
+        index = LastValidReport(self.state_file, log_callback=_quiet)
+        index.record(REPORTS, "node_bridge", now=1000)
+        index.record(dict(REPORTS), "cache", now=2000)
+        assert index.load()["recorded_at"] == 1000
+        index.record(dict(REPORTS, EN="New wording."), "direct_flash", now=3000)
+        assert index.load()["source"] == "direct_flash"
+
+    def test_tampered_or_corrupt_index_ignored(self):
+        """Test a hash mismatch or broken JSON yields None instead of bad reports."""
+        index = LastValidReport(self.state_file, log_callback=_quiet)
+        index.record(REPORTS, "node_bridge")
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        entry["reports"]["EN"] = "edited"
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        assert index.load() is None
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            f.write("{")
+        assert index.load() is None
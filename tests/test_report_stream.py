@@ -0,0 +1,99 @@
+"""
+Unit tests for the streaming report parser.
+
+Tests:
+- Reports parse identically regardless of chunk boundaries (fences and escapes included)
+- Extra non-language keys are skipped
+- Invalid entries are rejected as soon as they close, before the stream ends
+- Missing languages and truncated streams are rejected
+- SSE events yield their text deltas and usage metadata
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.report_stream import IncrementalReportParser, ReportStreamRejected, iter_sse_text
+
+LANGS = ["JP", "EN", "DE"]
+REPORTS = {
+    "JP": "流動性は安定。" * 20,
+    "EN": 'Credit spreads "compressed" as liquidity\nexpanded. ' * 4,
+    "DE": "Liquidität stabil, Spreads eng. " * 5,
+}
+
+
+def _parser(**kwargs):
+    return IncrementalReportParser(LANGS, min_chars=kwargs.pop("min_chars", 100), **kwargs)
+
+
+class TestIncrementalReportParser:
+    """Test suite for IncrementalReportParser."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+    def test_chunking_does_not_matter(self, chunk_size):
+        """Test any chunking of a fenced report yields the same validated dict."""
+        text = "```json\n" + json.dumps(REPORTS, ensure_ascii=False, indent=2) + "\n```"
+        parser = _parser()
+        completed = []
+        for i in range(0, len(text), chunk_size):
+            completed += parser.feed(text[i:i + chunk_size])
+        assert completed == LANGS
+        assert parser.close() == REPORTS
+
+    def test_extra_keys_are_skipped(self):
+        """Test nested or literal values of non-language keys do not break parsing."""
+        payload = dict(REPORTS, council_debate={"macro": "view [a]", "quant": ["x", {"y": "}"}]}, version=2, ok=True)
+        text = json.dumps(payload, ensure_ascii=False)
+        parser = _parser()
+        for ch in text:
+            parser.feed(ch)
+        assert parser.close() == REPORTS
+
+    def test_short_entry_rejected_before_stream_ends(self):
+        """Test a too-short language aborts as soon as its string closes."""
+        parser = _parser()
+        parser.feed('{"JP": "' + REPORTS["JP"] + '", "EN": "Too short')
+        with pytest.raises(ReportStreamRejected, match="EN report too short"):
+            parser.feed('."')
+
+    def test_sanitize_applies_before_length_check(self):
+        """Test the sanitizer runs on each value before it is measured."""
+        parser = _parser(min_chars=5, sanitize=lambda t: t.replace("(249 chars)", "").strip())
+        parser.feed('{"JP": "abcdef (249 chars)"')
+        assert parser.reports["JP"] == "abcdef"
+        with pytest.raises(ReportStreamRejected, match="EN report too short"):
+            parser.feed(', "EN": "abc (249 chars)"')
+
+    def test_structural_errors_rejected(self):
+        """Test non-JSON output, non-string values and missing languages are rejected."""
+        with pytest.raises(ReportStreamRejected, match="does not start"):
+            _parser().feed("I am sorry, but I cannot produce that analysis.")
+        with pytest.raises(ReportStreamRejected, match="not a string"):
+            _parser().feed('{"JP": 42')
+        with pytest.raises(ReportStreamRejected, match="missing languages"):
+            _parser(min_chars=0).feed('{"JP": "a", "EN": "b"}')
+
+    def test_truncated_stream_rejected(self):
+        """Test close() fails when the object never closed."""
+        parser = _parser(min_chars=0)
+        parser.feed('{"JP": "a", "EN": "b", "DE": "c"')
+        with pytest.raises(ReportStreamRejected, match="ended inside"):
+            parser.close()
+
+
+def test_iter_sse_text():
+    """Test text deltas are extracted from data: lines only."""
+    def event(text):
+        return "data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+    lines = [event('{"JP": '), "", ": keep-alive", event('"x"}'), "data: not-json",
+             "data: " + json.dumps({"usageMetadata": {"totalTokenCount": 42}})]
+    usage = {}
+    assert list(iter_sse_text(lines, usage)) == ['{"JP": ', '"x"}']
+    assert usage == {"totalTokenCount": 42}
@@ -0,0 +1,88 @@
+"""
+Unit tests for the multi-resolution score series store.
+
+Tests:
+- Appends roll up into hourly / daily / weekly buckets
+- Retention caps bound every resolution
+- Daily seeding back-fills weekly buckets
+- Horizon summaries and persistence
+- Horizons cover a time span, so sparse appends do not stretch them
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.score_series import ScoreSeriesStore
+
+
+def _quiet(_msg):
+    pass
+
+
+class TestScoreSeriesStore:
+    """Test suite for ScoreSeriesStore."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "series.json")
+        self.t0 = datetime(2026, 3, 2, 0, 0, tzinfo=timezone.utc)  # Monday
+
+    def teardown_method(self):
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _fill(self, store, points):
+        for i, score in enumerate(points):
+            store.append(self.t0 + timedelta(minutes=10 * i), score)
+
+    def test_rollups(self):
+        """Test 10-minute points aggregate into hourly and daily buckets."""
+        store = ScoreSeriesStore(log_callback=_quiet)
+        self._fill(store, [50, 52, 54, 56, 58, 60, 40])  # Last point opens hour 2
+        hourly = store.window("hourly", 10)
+        assert len(hourly) == 2
+        assert hourly[0] == {"start": "2026-03-02T00:00:00Z", "min": 50, "max": 60, "sum": 330, "count": 6, "first": 50, "last": 60}
+        daily = store.window("daily", 1)[0]
+        assert (daily["min"], daily["max"], daily["count"], daily["last"]) == (40, 60, 7, 40)
+
+    def test_retention(self):
+        """Test each resolution is capped."""
+        store = ScoreSeriesStore(retention={"raw": 5, "hourly": 2}, log_callback=_quiet)
+        self._fill(store, list(range(30)))
+        assert len(store.window("raw", 100)) == 5
+        assert len(store.window("hourly", 100)) == 2
+
+    def test_seed_daily_builds_weeks(self):
+        """Test archived daily scores back-fill daily and weekly buckets."""
+        store = ScoreSeriesStore(log_callback=_quiet)
+        days = [((self.t0 - timedelta(days=d)).strftime("%Y-%m-%d"), 40 + d) for d in range(1, 15)]
+        assert store.seed_daily(days) == 14
+        assert store.seed_daily(days) == 0
+        assert len(store.window("daily", 100)) == 14
+        assert len(store.window("weekly", 100)) == 2
+
+    def test_horizons_and_persistence(self):
+        """Test horizon summaries survive a reload."""
+        store = ScoreSeriesStore(self.state_file, log_callback=_quiet)
+        self._fill(store, [50, 55, 45])
+        store.save()
+        reloaded = ScoreSeriesStore(self.state_file, log_callback=_quiet)
+        day = reloaded.horizons(now=self.t0 + timedelta(minutes=20))["1D"]
+        assert (day["from"], day["to"], day["delta"], day["min"], day["max"], day["mean"]) == (50, 45, -5, 45, 55, 50)
+
+    def test_horizons_cover_time_not_bucket_count(self):
+        """Test sparse appends (weekend cadence, outages) only count inside each horizon's span."""
+        store = ScoreSeriesStore(log_callback=_quiet)
+        for days_ago, score in [(20, 30), (9, 40), (3, 50), (0.5, 60), (0, 62)]:
+            store.append(self.t0 - timedelta(days=days_ago), score)
+        trends = store.horizons(now=self.t0)
+        assert (trends["1D"]["from"], trends["1D"]["buckets"]) == (60, 2)
+        assert (trends["1W"]["from"], trends["1W"]["buckets"]) == (50, 3)
+        assert trends["1M"]["from"] == 30
+        assert store.horizons(now=self.t0 + timedelta(days=40)).keys() == {"1Y"}
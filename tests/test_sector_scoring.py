@@ -0,0 +1,85 @@
+"""
+Unit tests for the vectorized sector scorer.
+
+Tests:
+- Matches the reference per-ticker loop on random snapshots
+- Sectors without weights stay neutral at 50
+- Snapshot stacks and weight stacks broadcast to the expected shapes
+"""
+
+import os
+import sys
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils.sector_scoring import SectorScorer
+
+SECTORS = {
+    "STOCKS": {"weights": {"VIX": 0.2, "SPY": 0.5, "QQQ": 0.3}, "invert": ["VIX"]},
+    "CRYPTO": {"weights": {"BTC": 0.6, "ETH": 0.4}, "invert": []},
+    "REAL_ESTATE": {"weights": {}, "invert": []},
+}
+
+
+def reference_score(config, data):
+    """Original per-ticker loop from gms_engine."""
+    score = 50.0
+    for key, weight in config["weights"].items():
+        if key not in data: continue
+        item = data[key]
+        change = item["change_percent"]
+        sparkline = item.get("sparkline", [])
+        sign = -1 if key in config["invert"] else 1
+        daily_impact = sign * (5 if change > 0 else -5)
+        trend_impact = 0
+        if len(sparkline) >= 30:
+            ma_30 = sum(sparkline[-30:]) / 30
+            trend_pct = ((sparkline[-1] - ma_30) / ma_30) * 100 if ma_30 != 0 else 0
+            trend_impact = sign * trend_pct * 0.5
+        score += ((daily_impact * 0.6) + (trend_impact * 0.4)) * (weight * 5)
+    return int(max(0, min(100, score)))
+
+
+def random_snapshot(rng):
+    data = {}
+    for key in ("VIX", "SPY", "QQQ", "BTC", "ETH"):
+        if rng.random() < 0.1:
+            continue
+        length = rng.choice([22, 30, 45])
+        data[key] = {
+            "price": 100.0,
+            "change_percent": rng.uniform(-3, 3),
+            "sparkline": [100 + rng.uniform(-20, 20) for _ in range(length)]
+        }
+    return data
+
+
+class TestSectorScorer:
+    """Test suite for SectorScorer."""
+
+    def test_matches_reference_loop(self):
+        """Test vectorized scores equal the original loop for every sector."""
+        rng = random.Random(7)
+        snapshots = [random_snapshot(rng) for _ in range(200)]
+        scorer = SectorScorer(SECTORS)
+        scores = scorer.score_many(snapshots)
+        for i, data in enumerate(snapshots):
+            for s, name in enumerate(scorer.sector_names):
+                assert scores[i, s] == reference_score(SECTORS[name], data)
+
+    def test_unweighted_sector_is_neutral(self):
+        """Test sectors without weights score 50."""
+        assert SectorScorer(SECTORS).score({})["REAL_ESTATE"] == 50
+
+    def test_weight_stack_shape(self):
+        """Test a stack of weight matrices scores every snapshot per configuration."""
+        scorer = SectorScorer(SECTORS)
+        arrays = scorer.pack([random_snapshot(random.Random(i)) for i in range(5)])
+        stack = np.stack([scorer.weights, scorer.weight_matrix({"CRYPTO": {"BTC": 1.0}})])
+        assert scorer.score_arrays(arrays, stack).shape == (2, 5, 3)
@@ -0,0 +1,146 @@
+"""
+Unit tests for the local stand-in provider server and base-URL overrides.
+
+Tests:
+- Provider routes serve parseable payloads (including the Gemini SSE stream)
+- 429 bursts and injected errors follow the profile
+- Stats endpoint counts requests per route
+- Base URLs honour shared and per-provider overrides
+- Under a shared override, the AI worker's environment and calls stay on localhost
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import textwrap
+import threading
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.stub_provider_server import LANGS, RouteProfile, StubConfig, make_server
+from backend.utils.endpoints import DEFAULT_BASE_URLS, base_url, worker_env
+from backend.utils.node_bridge import NodeBridge
+from backend.utils.report_stream import IncrementalReportParser, iter_sse_text
+
+
+class TestStubProviderServer:
+    """Test suite for the stand-in server."""
+
+    def _start(self, config=None):
+        self.server = make_server(config, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _get(self, path, data=None):
+        req = urllib.request.Request(self.base + path, data=data, method="POST" if data is not None else "GET")
+        try:
+            with urllib.request.urlopen(req, timeout=5) as res:
+                return res.status, res.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def test_provider_payloads(self):
+        """Test FRED XML, fng JSON, calendar CSV, RSS and Gemini candidates."""
+        self._start()
+        status, body = self._get("/fred/series/observations?series_id=VIXCLS&observation_start=2026-01-01&api_key=x")
+        assert status == 200 and len(ET.fromstring(body)) > 0
+
+        status, body = self._get("/fng/?limit=30")
+        assert len(json.loads(body)["data"]) == 30
+
+        status, body = self._get("/query?function=ECONOMIC_CALENDAR&apikey=x")
+        assert body.decode().startswith("date,currency,event")
+
+        status, body = self._get("/rs/search/combinedcms/view.xml?partnerId=wrss01")
+        assert len(ET.fromstring(body).findall(".//item")) == 10
+
+        status, body = self._get("/v1/google/v1beta/models/gemini-2.5-flash:generateContent?key=x", data=b"{}")
+        text = json.loads(body)["candidates"][0]["content"]["parts"][0]["text"]
+        assert "EN" in json.loads(text)
+
+        status, body = self._get("/v1beta/models/gemini-2.5-flash:streamGenerateContent?alt=sse&key=x", data=b"{}")
+        parser = IncrementalReportParser(LANGS, min_chars=100)
+        for delta in iter_sse_text(body.decode("utf-8").splitlines()):
+            parser.feed(delta)
+        assert set(parser.close()) >= set(LANGS)
+
+    def test_429_burst_and_errors(self):
+        """Test bursts return 429 on schedule and error_rate=1 always fails."""
+        self._start(StubConfig(
+            routes={"fng": RouteProfile(burst_every=4, burst_length=2), "cnbc_rss": RouteProfile(error_rate=1.0)},
+            seed=1
+        ))
+        statuses = [self._get("/fng/")[0] for _ in range(4)]
+        assert statuses == [200, 200, 429, 429]
+        assert self._get("/rs/search/combinedcms/view.xml")[0] >= 500
+
+    def test_stats_and_unknown_route(self):
+        """Test per-route counters and 404 for unmapped paths."""
+        self._start()
+        self._get("/fng/")
+        assert self._get("/nope")[0] == 404
+        stats = json.loads(self._get("/__stats")[1])
+        assert stats["fng"]["requests"] == 1
+
+
+    def test_worker_stays_on_localhost(self):
+        """Test a bridge worker started under GMS_PROVIDER_BASE_URL only reaches the stand-in."""
+        self._start()
+        temp_dir = tempfile.mkdtemp()
+        # Stand-in for generate_insight.ts --worker: calls Gemini at the base URL it was handed
+        script = os.path.join(temp_dir, "worker.py")
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(textwrap.dedent('''
+                import json, os, sys, urllib.request
+                for line in sys.stdin:
+                    req = json.loads(line)
+                    if req.get("op") == "ping":
+                        print(json.dumps({"id": req["id"], "ok": True}), flush=True)
+                        continue
+                    url = os.environ["GEMINI_BASE_URL"] + "/v1beta/models/gemini-2.5-flash:generateContent"
+                    with urllib.request.urlopen(urllib.request.Request(url, data=b"{}"), timeout=5) as res:
+                        body = json.loads(res.read())
+                    text = body["candidates"][0]["content"]["parts"][0]["text"]
+                    print(json.dumps({"id": req["id"], "text": text}), flush=True)
+            '''))
+        os.environ["GMS_PROVIDER_BASE_URL"] = self.base
+        try:
+            env = worker_env()
+            assert all(base_url(p).startswith(self.base) for p in DEFAULT_BASE_URLS)
+            assert env["GEMINI_BASE_URL"] == env["AI_GATEWAY_BASE_URL"] == self.base
+            bridge = NodeBridge([sys.executable, script], startup_timeout=10, log_callback=lambda m: None, env=env)
+            try:
+                assert "EN" in json.loads(bridge.request("report", timeout=10))
+            finally:
+                bridge.close()
+        finally:
+            os.environ.pop("GMS_PROVIDER_BASE_URL", None)
+            shutil.rmtree(temp_dir)
+        assert json.loads(self._get("/__stats")[1])["gemini"]["requests"] == 1
+
+
+class TestBaseUrl:
+    """Test suite for provider base-URL resolution."""
+
+    def teardown_method(self):
+        for key in ("GMS_PROVIDER_BASE_URL", "GEMINI_BASE_URL"):
+            os.environ.pop(key, None)
+
+    def test_overrides(self):
+        """Test defaults, the shared override and per-provider precedence."""
+        assert base_url("FRED") == "https://api.stlouisfed.org/fred"
+        os.environ["GMS_PROVIDER_BASE_URL"] = "http://127.0.0.1:8765/"
+        assert base_url("FRED") == "http://127.0.0.1:8765/fred"
+        assert base_url("FNG") == "http://127.0.0.1:8765"
+        os.environ["GEMINI_BASE_URL"] = "http://mirror"
+        assert base_url("GEMINI") == "http://mirror"